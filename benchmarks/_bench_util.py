@@ -0,0 +1,37 @@
+"""Small helpers shared by the benchmark scripts."""
+from __future__ import annotations
+
+import resource
+import sys
+from typing import Sequence
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB (Linux only)."""
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * resource.getpagesize() / 1e6
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kB on Linux
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def minor_faults() -> int:
+    """Number of minor page faults serviced so far by this process."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+
+
+def print_table(header: Sequence[str], rows: Sequence[Sequence]) -> None:
+    """Print `rows` as a simple aligned text table."""
+    cells = [[str(h) for h in header]]
+    for row in rows:
+        cells.append([f"{c:.2f}" if isinstance(c, float) else str(c) for c in row])
+    widths = [max(len(r[i]) for r in cells) for i in range(len(header))]
+    for n, row in enumerate(cells):
+        print("  ".join(c.rjust(w) for c, w in zip(row, widths)))
+        if n == 0:
+            print("  ".join("-" * w for w in widths))
@@ -0,0 +1,107 @@
+"""Cost of allocating a save path with `ensure_unique` in a crowded folder.
+
+Fills a folder with `--entries` files (and a few directories) named like saved
+acquisitions, then allocates `--calls` new file names and folder names with
+`micromanager_gui._util.ensure_unique`, and with the previous implementation
+that listed the whole folder on every call.  Reports the time of the first call
+(which lists the folder once), the mean time of the following calls and the
+speedup.
+
+Run it with `--dir` on the disk you want to measure (e.g. a network share), the
+default is the system temporary directory.
+
+    python benchmarks/bench_ensure_unique.py --entries 100000
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from _bench_util import print_table
+
+from micromanager_gui._util import ensure_unique
+
+
+def listing_ensure_unique(
+    path: Path, extension: str = ".tif", ndigits: int = 3
+) -> Path:
+    """`ensure_unique` as it was: list the folder on every call, reserve nothing."""
+    stem = path.stem
+    cur_num = stem.rsplit("_")[-1]
+    if cur_num.isdigit() and len(cur_num) == ndigits:
+        stem = stem[: -ndigits - 1]
+        current_max = int(cur_num) - 1
+    else:
+        current_max = -1
+    paths = (
+        path.parent.glob(f"*{extension}")
+        if extension
+        else (f for f in path.parent.iterdir() if f.is_dir())
+    )
+    for fn in paths:
+        name = fn.name[: -len(extension)] if extension else fn.stem
+        try:
+            current_max = max(current_max, int(name.rsplit("_")[-1]))
+        except ValueError:
+            continue
+    return path.parent / f"{stem}_{current_max + 1:0{ndigits}d}{extension}"
+
+
+def fill(folder: Path, entries: int) -> None:
+    """Create `entries` empty tif files and 1% as many folders in `folder`."""
+    for i in range(entries):
+        (folder / f"exp_{i:06d}.tif").touch()
+    for i in range(entries // 100):
+        (folder / f"exp_{i:06d}").mkdir()
+
+
+def time_calls(func, folder: Path, extension: str, calls: int) -> tuple:
+    """Return the time of the first call and the mean time of the others."""
+    times = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        new = func(folder / "exp", extension=extension, ndigits=6)
+        times.append(time.perf_counter() - t0)
+        if func is listing_ensure_unique:
+            # create it like a save would, so that the next call sees it
+            new.mkdir() if not extension else new.touch()
+    return times[0], sum(times[1:]) / max(len(times) - 1, 1)
+
+
+def main() -> None:
+    """Fill a folder and time both implementations on it."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--dir", default=None, help="where to write (default: tmp)")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for kind, extension in (("file", ".tif"), ("folder", "")):
+            base = {}
+            for func in (listing_ensure_unique, ensure_unique):
+                # a fresh folder for each, so that the cached counter isn't reused
+                folder = Path(tmp) / f"{kind}_{func.__name__}"
+                folder.mkdir()
+                fill(folder, args.entries)
+                first, mean = time_calls(func, folder, extension, args.calls)
+                base.setdefault(kind, mean)
+                rows.append(
+                    [
+                        kind,
+                        func.__name__,
+                        first * 1e3,
+                        mean * 1e3,
+                        base[kind] / mean,
+                    ]
+                )
+
+    print(f"{args.entries} entries, {args.calls} calls\n")
+    print_table(["kind", "implementation", "first ms", "next ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Steady-state memory of the live preview: fresh arrays vs. a `FrameRing`.
+
+Simulates a long live session by assigning frames to a napari `Image` layer, either
+a freshly allocated array per displayed frame (the previous behavior) or one of the
+preallocated `FrameRing` buffers.  Reports time per frame, newly allocated bytes per
+frame (tracemalloc peak), minor page faults per frame and RSS at the end of the run.
+
+    python benchmarks/bench_live_buffers.py --size 2048 --frames 500
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+from _bench_util import minor_faults, print_table, rss_mb
+from napari.layers import Image
+
+from micromanager_gui._live import FrameRing
+
+
+def run(mode: str, size: int, n_frames: int) -> list:
+    """Display `n_frames` frames in `mode` ("fresh" or "ring"), return a result row."""
+    rng = np.random.default_rng(0)
+    # a handful of distinct "camera" frames to cycle through
+    sources = [rng.integers(0, 4096, (size, size), dtype="uint16") for _ in range(4)]
+    ring = FrameRing()
+    layer = Image(sources[0].copy(), name="preview")
+
+    def next_frame(i: int) -> np.ndarray:
+        src = sources[i % len(sources)]
+        return src.copy() if mode == "fresh" else ring.write(src)
+
+    # warm up so the ring (and napari caches) are allocated before measuring
+    for i in range(10):
+        layer.data = next_frame(i)
+
+    tracemalloc.start()
+    allocated = 0
+    faults0 = minor_faults()
+    t0 = time.perf_counter()
+    for i in range(n_frames):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        layer.data = next_frame(i)
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    elapsed = time.perf_counter() - t0
+    faults = minor_faults() - faults0
+    tracemalloc.stop()
+
+    return [
+        mode,
+        elapsed / n_frames * 1000,
+        allocated / n_frames / 1e6,
+        faults / n_frames,
+        rss_mb(),
+    ]
+
+
+def main() -> None:
+    """Run both modes and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2048, help="frame edge (px)")
+    parser.add_argument("--frames", type=int, default=500, help="frames per mode")
+    args = parser.parse_args()
+
+    rows = [run(mode, args.size, args.frames) for mode in ("fresh", "ring")]
+    print(f"{args.size}x{args.size} uint16, {args.frames} displayed frames\n")
+    print_table(
+        ["mode", "ms/frame", "alloc MB/frame", "minor faults/frame", "RSS MB"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""GUI-thread cost of full-resolution vs. downsampled live preview frames.
+
+For each sensor size and preview mode, reports the time spent reducing a frame on
+the reader thread, the time spent on the GUI thread assigning it to a napari
+`Image` layer and computing its (min, max) as `_update_max_min` does, and the number
+of bytes that have to be uploaded as a texture.
+
+    python benchmarks/bench_live_preview.py --sizes 2048 4096 --canvas 800
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from _bench_util import print_table
+from napari.layers import Image
+
+from micromanager_gui._live import PreviewView, preview_view, reduce_frame
+
+
+def run(size: int, canvas: int, mode: str, n_frames: int) -> list:
+    """Time `n_frames` preview updates of a `size` x `size` frame in `mode`."""
+    frame = np.random.default_rng(0).integers(0, 4096, (size, size), dtype="uint16")
+    if mode == "full":
+        view = PreviewView()
+    else:
+        # zoomed to fit the frame in the canvas
+        zoom = canvas / size
+        view = preview_view((size, size), (canvas, canvas), zoom, (size / 2,) * 2)
+        view = view._replace(mode=mode)
+
+    layer = Image(frame, name="preview")
+    reduce_t = gui_t = 0.0
+    for _ in range(n_frames):
+        t0 = time.perf_counter()
+        data, scale, translate = reduce_frame(frame, view)
+        data = np.ascontiguousarray(data)
+        t1 = time.perf_counter()
+        layer.data = data
+        layer._calc_data_range(mode="slice")
+        t2 = time.perf_counter()
+        reduce_t += t1 - t0
+        gui_t += t2 - t1
+
+    return [
+        f"{size}x{size}",
+        mode,
+        view.factor,
+        reduce_t / n_frames * 1000,
+        gui_t / n_frames * 1000,
+        data.nbytes / 1e6,
+    ]
+
+
+def main() -> None:
+    """Run every size/mode combination and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2048, 4096])
+    parser.add_argument("--canvas", type=int, default=800, help="canvas edge (px)")
+    parser.add_argument("--frames", type=int, default=50, help="frames per run")
+    args = parser.parse_args()
+
+    rows = [
+        run(size, args.canvas, mode, args.frames)
+        for size in args.sizes
+        for mode in ("full", "stride", "bin")
+    ]
+    print(f"canvas {args.canvas}x{args.canvas}, {args.frames} frames per run\n")
+    print_table(["frame", "mode", "factor", "reduce ms", "GUI ms", "texture MB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""End-to-end MDA ingestion rate of `MainWindow` with a simulated fast camera.
+
+Runs `CMMCorePlus.run_mda` with an MDA engine that, instead of snapping real
+images, emits synthetic frames at a fixed rate.  Every frame goes through the
+whole acquisition path of the main window: `_on_mda_frame`, the zarr writes on
+the writer thread, the throttled `dims.set_point` updates on the GUI thread and,
+at the end, `save_sequence`.  Each configuration runs with and without the
+`SequenceMeta.multiscale` pyramid, whose levels are downsampled and written on
+the writer thread with every frame.  For each configuration reports:
+
+- fps: frames emitted per second while acquiring (the camera rate is the
+  upper bound, lower means the GUI made the camera wait).
+- sustained fps: frames per second including writing the last frames and
+  saving.
+- emit p50/p99/max: time `frameReady.emit` blocks the acquisition thread (ms).
+- lag max: how late the last frames were emitted compared to the camera
+  schedule (ms).
+- finish: time from the last frame to the end of `sequenceFinished` (flush,
+  trim and save), in ms.
+- dims: number of GUI updates of the current step.
+- peak RSS (MB): each configuration runs in its own process.
+
+Runs headless (offscreen Qt platform) and needs no camera or Micro-Manager
+adapters.
+
+    python benchmarks/bench_mda_throughput.py --sizes 512 2048 --fps 100 400
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+from _bench_util import peak_rss_mb, print_table  # noqa: E402
+from pymmcore_plus.mda import MDAEngine  # noqa: E402
+
+FORMATS = ("none", "tif", "zarr")
+
+
+class SyntheticCameraEngine(MDAEngine):
+    """MDA engine emitting pregenerated `size` x `size` frames at `fps`."""
+
+    def __init__(self, mmc, size: int, fps: float) -> None:
+        super().__init__(mmc)
+        rng = np.random.default_rng(0)
+        self._frames = [
+            rng.integers(0, 4096, (size, size), dtype="uint16") for _ in range(8)
+        ]
+        self._period = 1 / fps if fps else 0.0
+        # (due, emit start, emit end) of every frame, perf_counter seconds
+        self.times: list = []
+
+    def run(self, sequence) -> None:
+        """Emit one frame per event, on schedule (no hardware is touched)."""
+        self._prepare_to_run(sequence)
+        t0 = time.perf_counter()
+        for i, event in enumerate(sequence):
+            if self._check_canceled():
+                break
+            due = t0 + i * self._period
+            while time.perf_counter() < due:
+                time.sleep(max(0.0, min(due - time.perf_counter() - 5e-4, 1e-3)))
+            # a new array per frame, like `getImage()`
+            frame = self._frames[i % len(self._frames)].copy()
+            start = time.perf_counter()
+            self._events.frameReady.emit(frame, event)
+            self.times.append((due, start, time.perf_counter()))
+        self._finish_run(sequence)
+
+
+def run_one(size: int, fps: float, n_frames: int, fmt: str, pyramid: bool) -> dict:
+    """Acquire `n_frames` frames in this process, return the measurements."""
+    from pymmcore_plus._util import find_micromanager
+
+    if not find_micromanager():
+        # `MainWindow` insists on finding adapters, the benchmark doesn't use any
+        os.environ["MICROMANAGER_PATH"] = tempfile.mkdtemp()
+
+    import napari
+    from qtpy.QtWidgets import QApplication
+    from useq import MDASequence
+
+    from micromanager_gui import _mda
+    from micromanager_gui.main_window import MainWindow
+
+    viewer = napari.Viewer(show=False)
+    win = MainWindow(viewer)
+    mmc = win._mmc
+    # a synthetic camera: the core only has to report the frame geometry
+    mmc.getImageHeight = lambda: size
+    mmc.getImageWidth = lambda: size
+    mmc.getImageBitDepth = lambda: 16
+    mmc.getCameraChannelNames = lambda: ("Camera",)
+    engine = SyntheticCameraEngine(mmc, size, fps)
+    mmc.register_mda_engine(engine)
+
+    # connected after the main window: set once the last frames are written, the
+    # save is then submitted on the GUI thread and runs in the background
+    finished = threading.Event()
+    mmc.mda.events.sequenceFinished.connect(lambda _: finished.set())
+    saved: list = []
+    win._saver.jobFinished.connect(saved.append)
+    dims_updates = itertools.count()
+    viewer.dims.events.current_step.connect(lambda _: next(dims_updates))
+
+    save_dir = tempfile.TemporaryDirectory()
+    sequence = MDASequence(time_plan={"interval": 0, "loops": n_frames})
+    _mda.SEQUENCE_META[sequence] = _mda.SequenceMeta(
+        mode="mda",
+        should_save=fmt != "none",
+        file_format="zarr" if fmt == "zarr" else "tif",
+        file_name="bench",
+        save_dir=save_dir.name,
+        multiscale=pyramid,
+    )
+
+    app = QApplication.instance()
+    t_start = time.perf_counter()
+    mmc.run_mda(sequence)
+    while not finished.is_set() or (fmt != "none" and not saved):
+        app.processEvents()
+        time.sleep(0.001)
+    t_end = time.perf_counter()
+    save_dir.cleanup()
+    for result in saved:
+        assert result.ok, f"saving failed: {result.error}"
+
+    due, start, end = (np.array(x) for x in zip(*engine.times))
+    emit_ms = (end - start) * 1000
+    return {
+        "fps": len(start) / (end[-1] - start[0]),
+        "sustained": len(start) / (t_end - t_start),
+        "p50": float(np.percentile(emit_ms, 50)),
+        "p99": float(np.percentile(emit_ms, 99)),
+        "max": float(emit_ms.max()),
+        "lag": float((start - due).max() * 1000),
+        "finish": (t_end - end[-1]) * 1000,
+        "dims": next(dims_updates),
+        "rss": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    """Run every configuration in a subprocess and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 2048])
+    parser.add_argument("--fps", type=float, nargs="+", default=[100, 400])
+    parser.add_argument("--frames", type=int, default=200, help="frames per run")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument(
+        "--pyramid", nargs="+", choices=("off", "on"), default=("off", "on")
+    )
+    parser.add_argument("--one", nargs=5, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        size, fps, n_frames, fmt, pyramid = args.one
+        result = run_one(int(size), float(fps), int(n_frames), fmt, pyramid == "on")
+        print(json.dumps(result))
+        return
+
+    rows = []
+    configs = itertools.product(args.sizes, args.fps, args.formats, args.pyramid)
+    for size, fps, fmt, pyramid in configs:
+        cmd = [sys.executable, __file__, "--one", size, fps, args.frames, fmt, pyramid]
+        out = subprocess.run(
+            [str(c) for c in cmd], capture_output=True, text=True, check=True
+        ).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        rows.append(
+            [
+                f"{size}x{size}",
+                fps,
+                fmt,
+                pyramid,
+                r["fps"],
+                r["sustained"],
+                r["p50"],
+                r["p99"],
+                r["max"],
+                r["lag"],
+                r["finish"],
+                r["dims"],
+                r["rss"],
+            ]
+        )
+    print(f"uint16 frames, {args.frames} frames per run\n")
+    print_table(
+        [
+            "frame",
+            "camera fps",
+            "save",
+            "pyramid",
+            "fps",
+            "sustained fps",
+            "emit p50",
+            "emit p99",
+            "emit max",
+            "lag max",
+            "finish ms",
+            "dims",
+            "peak RSS MB",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
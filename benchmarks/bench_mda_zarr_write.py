@@ -0,0 +1,119 @@
+"""Write throughput of the MDA temp zarr stores for each chunking/compression.
+
+Writes a (t, c, z, y, x) uint16 acquisition frame by frame, in MDA order, into an
+on-disk zarr array like `MainWindow` does, for:
+
+- default: zarr's own chunk guess and compressor (the previous behavior), whose
+  chunks span several frames, so most writes read, decompress, modify and
+  recompress a chunk.
+- plane / tile: one chunk per 2D plane, or per (y, x) tile, for each of the
+  `SequenceMeta.store_compression` settings.
+
+Frames are synthetic camera images (offset + shot noise around a few blobs).
+Reports frames per second, MB/s of raw pixel data and the size on disk.
+
+    python benchmarks/bench_mda_zarr_write.py --size 1024 --frames 100 --tile 256
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+import zarr
+from _bench_util import print_table
+
+from micromanager_gui._mda import COMPRESSIONS, SequenceMeta
+
+
+def make_frames(size: int, n: int = 8) -> list:
+    """Return `n` synthetic uint16 camera frames of `size` x `size`."""
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[:size, :size]
+    frames = []
+    for _ in range(n):
+        signal = np.zeros((size, size))
+        for cy, cx in rng.uniform(0, size, (10, 2)):
+            signal += 2000 * np.exp(
+                -((yy - cy) ** 2 + (xx - cx) ** 2) / (size / 8) ** 2
+            )
+        frames.append((100 + rng.poisson(signal + 50)).astype("uint16"))
+    return frames
+
+
+def dir_size(path: str) -> int:
+    """Return the total size in bytes of the files below `path`."""
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path)
+        for f in files
+    )
+
+
+def run(
+    label: str,
+    shape: Tuple[int, ...],
+    frames: list,
+    meta: Optional[SequenceMeta],
+) -> list:
+    """Write one frame per plane of `shape`, return a result row."""
+    with tempfile.TemporaryDirectory() as tmp:
+        if meta is None:
+            z = zarr.open(tmp, shape=shape, dtype="uint16")
+        else:
+            z = zarr.open(
+                tmp,
+                shape=shape,
+                dtype="uint16",
+                chunks=meta.chunks(shape),
+                compressor=meta.store_compressor(),
+            )
+        indices = list(np.ndindex(shape[:-2]))
+        t0 = time.perf_counter()
+        for i, idx in enumerate(indices):
+            z[idx] = frames[i % len(frames)]
+        elapsed = time.perf_counter() - t0
+        raw = len(indices) * frames[0].nbytes
+        return [
+            label,
+            str(z.chunks),
+            len(indices) / elapsed,
+            raw / elapsed / 1e6,
+            dir_size(tmp) / 1e6,
+            raw / dir_size(tmp),
+        ]
+
+
+def main() -> None:
+    """Time every store setting and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1024, help="frame edge (px)")
+    parser.add_argument("--frames", type=int, default=100, help="frames per run")
+    parser.add_argument("--tile", type=int, default=256, help="tile edge (px)")
+    args = parser.parse_args()
+
+    # t, c, z like a typical MDA: 2 channels, 5 z planes
+    n_t = max(1, args.frames // 10)
+    shape = (n_t, 2, 5, args.size, args.size)
+    frames = make_frames(args.size)
+
+    rows = [run("default", shape, frames, None)]
+    for compression in COMPRESSIONS:
+        meta = SequenceMeta(store_compression=compression)
+        rows.append(run(f"plane {compression}", shape, frames, meta))
+    for compression in COMPRESSIONS:
+        meta = SequenceMeta(
+            store_compression=compression, chunk_tile=(args.tile, args.tile)
+        )
+        rows.append(run(f"tile {compression}", shape, frames, meta))
+
+    n = int(np.prod(shape[:-2]))
+    print(f"{args.size}x{args.size} uint16, {n} frames of shape {shape}\n")
+    print_table(["store", "chunks", "fps", "MB/s", "disk MB", "ratio"], rows)
+
+
+if __name__ == "__main__":
+    main()
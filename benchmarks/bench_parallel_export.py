@@ -0,0 +1,123 @@
+"""Scaling of the multi-file tif export of `save_sequence` with the worker count.
+
+Saves a split-channel, one-file-per-position MDA (like a well plate scan) from
+zarr stores on disk, as `MainWindow` does at the end of an acquisition, with
+``SequenceMeta.save_workers`` threads.  Each file is a (z, y, x) uint16 stack.
+The stores are compressed (blosc-lz4 by default) so that reading is not free
+either.  Reports the wall time, files per second, MB/s of pixel data written
+and the speedup over one worker.
+
+Run it with `--dir` on the disk you want to measure (e.g. a local SSD), the
+default is the system temporary directory.
+
+    python benchmarks/bench_parallel_export.py --positions 96 --channels 4
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import zarr
+from _bench_util import print_table
+from useq import MDASequence
+
+from micromanager_gui._mda import COMPRESSIONS, SequenceMeta
+from micromanager_gui._saving import save_sequence
+
+
+def make_layers(
+    sequence: MDASequence, root: Path, size: int, n_z: int, compression: str
+) -> list:
+    """Return one layer-like object per channel, backed by a (p, z, y, x) store."""
+    meta = SequenceMeta(store_compression=compression)
+    shape = (len(sequence.stage_positions), n_z, size, size)
+    rng = np.random.default_rng(0)
+    planes = [rng.integers(100, 4000, (size, size), dtype="uint16") for _ in range(4)]
+    layers = []
+    for c, channel in enumerate(sequence.channels):
+        z = zarr.open(
+            str(root / f"c{c}"),
+            mode="w",
+            shape=shape,
+            dtype="uint16",
+            chunks=meta.chunks(shape),
+            compressor=meta.store_compressor(),
+        )
+        for i, idx in enumerate(np.ndindex(shape[:-2])):
+            z[idx] = planes[i % len(planes)]
+        layers.append(
+            SimpleNamespace(
+                data=z,
+                multiscale=False,
+                metadata={"uid": sequence.uid, "ch_id": f"_{channel.config}_idx{c}"},
+            )
+        )
+    return layers
+
+
+def main() -> None:
+    """Save the same acquisition with each worker count and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--positions", type=int, default=96)
+    parser.add_argument("--channels", type=int, default=4)
+    parser.add_argument("--z", type=int, default=5, help="planes per file")
+    parser.add_argument("--size", type=int, default=512, help="frame edge (px)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--compression", choices=COMPRESSIONS, default="blosc-lz4")
+    parser.add_argument("--dir", default=None, help="where to write (default: tmp)")
+    args = parser.parse_args()
+
+    sequence = MDASequence(
+        channels=[f"ch{c}" for c in range(args.channels)],
+        stage_positions=[(p, p, 0) for p in range(args.positions)],
+        axis_order="tpcz",
+    )
+    rows = []
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        layers = make_layers(
+            sequence, Path(tmp) / "stores", args.size, args.z, args.compression
+        )
+        n_files = args.positions * args.channels
+        file_mb = args.z * args.size**2 * 2 / 1e6
+        baseline = 0.0
+        for workers in args.workers:
+            out = Path(tmp) / f"out{workers}"
+            out.mkdir()
+            meta = SequenceMeta(
+                mode="mda",
+                should_save=True,
+                split_channels=True,
+                save_pos=True,
+                file_name="bench",
+                save_dir=str(out),
+                save_workers=workers,
+            )
+            t0 = time.perf_counter()
+            save_sequence(sequence, layers, meta)
+            elapsed = time.perf_counter() - t0
+            baseline = baseline or elapsed
+            rows.append(
+                [
+                    workers,
+                    elapsed,
+                    n_files / elapsed,
+                    n_files * file_mb / elapsed,
+                    baseline / elapsed,
+                ]
+            )
+            shutil.rmtree(out)
+
+    print(
+        f"{n_files} files of ({args.z}, {args.size}, {args.size}) uint16, "
+        f"{args.compression} source stores\n"
+    )
+    print_table(["workers", "seconds", "files/s", "MB/s", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
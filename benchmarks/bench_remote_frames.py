@@ -0,0 +1,86 @@
+"""Frame transfer rate of local, remote and shared-memory remote MMCore sessions.
+
+For each frame size, snaps one image with the demo camera and times `getImage()`:
+
+- local: in-process `CMMCorePlus`.
+- remote: pymmcore-plus' `RemoteMMCore`, whose serializer creates, fills and
+  unlinks a new shared-memory segment for every frame.
+- shared: `SharedMemoryMMCore`, which copies frames out of a preallocated ring
+  and only sends a small descriptor over the RPC channel.
+
+Requires the Micro-Manager demo adapters (``python -m pymmcore_plus.install``).
+
+    python benchmarks/bench_remote_frames.py --sizes 512 1024 2048 4096
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from _bench_util import print_table
+from pymmcore_plus import CMMCorePlus, RemoteMMCore
+
+from micromanager_gui._remote import SharedMemoryMMCore
+
+# pymmcore-plus' server would use 54333, `SharedMemoryMMCore` 54334
+REMOTE_PORT = 54335
+
+
+def fps(core, size: int, n_frames: int) -> float:
+    """Return how many `size` x `size` frames per second `core.getImage()` gets."""
+    core.setProperty("Camera", "OnCameraCCDXSize", size)
+    core.setProperty("Camera", "OnCameraCCDYSize", size)
+    core.setProperty("Camera", "PixelType", "16bit")
+    core.setExposure(1)
+    core.snapImage()
+    core.getImage()  # warm up (e.g. map the shared memory)
+    t0 = time.perf_counter()
+    for _ in range(n_frames):
+        core.getImage()
+    return n_frames / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    """Time every core at every frame size and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 1024, 2048])
+    parser.add_argument("--frames", type=int, default=100, help="frames per run")
+    args = parser.parse_args()
+
+    cores = {
+        "local": CMMCorePlus(),
+        "remote": RemoteMMCore(port=REMOTE_PORT),
+        "shared": SharedMemoryMMCore(),
+    }
+    for core in cores.values():
+        core.loadSystemConfiguration("MMConfig_demo.cfg")
+
+    rows = []
+    for size in args.sizes:
+        rates = {name: fps(core, size, args.frames) for name, core in cores.items()}
+        rows.append(
+            [
+                f"{size}x{size}",
+                size * size * 2 / 1e6,
+                *rates.values(),
+                rates["remote"] / rates["local"] * 100,
+                rates["shared"] / rates["local"] * 100,
+            ]
+        )
+    print(f"uint16 frames, {args.frames} getImage() calls per run\n")
+    print_table(
+        [
+            "frame",
+            "MB",
+            "local fps",
+            "remote fps",
+            "shared fps",
+            "remote % local",
+            "shared % local",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
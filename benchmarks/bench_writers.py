@@ -0,0 +1,79 @@
+"""Write throughput and compression ratio of every registered writer and codec.
+
+Saves the same (t, c, z, y, x) uint16 acquisition, held in a zarr store on disk
+like a finished MDA, with each format of `micromanager_gui._writers.WRITERS` and
+each of its codecs (formats registered by plugins included).  Frames are
+synthetic camera images (offset + shot noise around a few blobs, see
+`bench_mda_zarr_write.make_frames`).  Reports the wall time, MB/s of raw pixel
+data and the compression ratio (raw size / size on disk).
+
+Run it with `--dir` on the disk you want to measure (e.g. a local SSD), the
+default is the system temporary directory.
+
+    python benchmarks/bench_writers.py --shape 10 2 5 1024 1024
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import zarr
+from _bench_util import print_table
+from bench_mda_zarr_write import dir_size, make_frames
+
+from micromanager_gui._writers import WRITERS
+
+
+def make_dataset(path: Path, shape: tuple) -> zarr.Array:
+    """Return an uncompressed on-disk store of `shape` (..., y, x), one chunk/plane."""
+    z = zarr.open(
+        str(path),
+        mode="w",
+        shape=shape,
+        dtype="uint16",
+        chunks=(1,) * (len(shape) - 2) + shape[-2:],
+        compressor=None,
+    )
+    frames = make_frames(shape[-1])
+    for i, index in enumerate(np.ndindex(*shape[:-2])):
+        z[index] = frames[i % len(frames)][: shape[-2]]
+    return z
+
+
+def main() -> None:
+    """Save the sample dataset with every writer/codec and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs="+", default=[10, 2, 5, 512, 512], help="(..., y, x)"
+    )
+    parser.add_argument("--formats", nargs="+", default=list(WRITERS))
+    parser.add_argument("--dir", default=None, help="where to write (default: tmp)")
+    args = parser.parse_args()
+
+    shape = tuple(args.shape)
+    raw_mb = int(np.prod(shape)) * 2 / 1e6
+    rows = []
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        data = make_dataset(Path(tmp) / "source.zarr", shape)
+        for name in args.formats:
+            writer = WRITERS[name]
+            for codec in writer.codecs:
+                dest = Path(tmp) / f"out_{name}_{codec}{writer.extension}"
+                t0 = time.perf_counter()
+                writer.write(dest, data, codec)
+                elapsed = time.perf_counter() - t0
+                size = dir_size(str(dest)) if dest.is_dir() else os.path.getsize(dest)
+                rows.append(
+                    [name, codec, elapsed, raw_mb / elapsed, raw_mb * 1e6 / size]
+                )
+
+    print(f"{shape} uint16, {raw_mb:.0f} MB\n")
+    print_table(["format", "codec", "seconds", "MB/s", "ratio"], rows)
+
+
+if __name__ == "__main__":
+    main()
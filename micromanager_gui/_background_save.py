@@ -0,0 +1,151 @@
+"""Save finished acquisitions on a background thread."""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, List, NamedTuple, Optional, Sequence
+
+from qtpy.QtCore import QObject, Signal
+
+from ._saving import SaveCancelled, save_sequence
+
+if TYPE_CHECKING:
+    from useq import MDASequence
+
+    from ._mda import SequenceMeta
+
+__all__ = ["BackgroundSaver", "SaveResult"]
+
+
+class SaveResult(NamedTuple):
+    """Outcome of saving one acquisition."""
+
+    name: str
+    cancelled: bool = False
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0  # seconds
+
+    @property
+    def ok(self) -> bool:
+        """Whether every file was written."""
+        return not self.cancelled and self.error is None
+
+
+class _Job(NamedTuple):
+    sequence: MDASequence
+    layers: Sequence[Any]
+    meta: SequenceMeta
+    name: str
+    cancel: threading.Event
+
+
+class BackgroundSaver(QObject):
+    """Run `save_sequence` for finished acquisitions on a saving thread.
+
+    `submit` only queues the acquisition, so the microscope can be used again as
+    soon as the last frame is acquired.  Acquisitions are saved one after the
+    other, in the order they were submitted.
+
+    `jobStarted` carries the name of the acquisition being saved,
+    `progressChanged` the number of files written and the total number of
+    files, and `jobFinished` a `SaveResult`.  `cancel` stops the acquisition
+    being saved at its next plane and drops those waiting.
+    """
+
+    jobStarted = Signal(str)
+    progressChanged = Signal(int, int)
+    jobFinished = Signal(object)
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._queue: queue.Queue = queue.Queue()
+        # the jobs being saved or waiting, for `cancel`
+        self._jobs: List[_Job] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of acquisitions being saved or waiting to be saved."""
+        with self._lock:
+            return len(self._jobs)
+
+    def is_busy(self) -> bool:
+        """Return whether an acquisition is being saved or waiting."""
+        return self.pending > 0
+
+    def submit(
+        self,
+        sequence: MDASequence,
+        layers: Sequence[Any],
+        meta: SequenceMeta,
+        name: str = "",
+    ) -> None:
+        """Queue saving `layers` of `sequence` (see `save_sequence`).
+
+        `layers` should be a snapshot (e.g. a list) of the layers, since the
+        layer list can change while the acquisition waits to be saved.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="BackgroundSaver", daemon=True
+            )
+            self._thread.start()
+        job = _Job(sequence, layers, meta, name or meta.file_name, threading.Event())
+        with self._lock:
+            self._jobs.append(job)
+        self._queue.put(job)
+
+    def cancel(self) -> None:
+        """Stop saving the current acquisition and drop the waiting ones."""
+        with self._lock:
+            for job in self._jobs:
+                job.cancel.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued acquisition is saved (or `timeout` seconds).
+
+        Returns False if saving didn't finish in time.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            job: _Job = self._queue.get()
+            try:
+                result = self._save(job)
+            finally:
+                with self._lock:
+                    self._jobs = [j for j in self._jobs if j is not job]
+                self._queue.task_done()
+            # after `pending` is updated, so that slots see the next state
+            self.jobFinished.emit(result)
+
+    def _save(self, job: _Job) -> SaveResult:
+        if job.cancel.is_set():
+            return SaveResult(job.name, cancelled=True)
+        self.jobStarted.emit(job.name)
+        t0 = time.perf_counter()
+        try:
+            save_sequence(
+                job.sequence,
+                job.layers,
+                job.meta,
+                progress=self.progressChanged.emit,
+                cancel=job.cancel,
+            )
+        except SaveCancelled:
+            return SaveResult(job.name, cancelled=True)
+        except Exception as e:
+            return SaveResult(job.name, error=e)
+        return SaveResult(job.name, elapsed=time.perf_counter() - t0)
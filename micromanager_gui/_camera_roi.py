@@ -50,6 +50,9 @@ class _CameraROI:
         try:
             preview_layer = self.viewer.layers["preview"]
             preview_layer.data = data
+            # undo any live-mode crop/downsampling of the preview
+            preview_layer.scale = (1, 1)
+            preview_layer.translate = (0, 0)
         except KeyError:
             preview_layer = self.viewer.add_image(data, name="preview")
 
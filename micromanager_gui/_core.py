@@ -15,14 +15,16 @@ def get_core_singleton(remote=False) -> CMMCorePlus:
     """Retrieve the MMCore singleton for this session.
 
     The first call to this function determines whether we're running remote or not.
+    Remote sessions receive frames through shared memory (see `_remote`).
     perhaps a temporary function for now...
     """
     global _SESSION_CORE
     if _SESSION_CORE is None:
         if remote:
-            from pymmcore_plus import RemoteMMCore
+            from ._remote import SharedMemoryMMCore
 
-            _SESSION_CORE = RemoteMMCore()  # type: ignore  # it has the same interface.
+            # it has the same interface.
+            _SESSION_CORE = SharedMemoryMMCore()  # type: ignore
         else:
             _SESSION_CORE = CMMCorePlus.instance()
     return _SESSION_CORE
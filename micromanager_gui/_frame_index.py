@@ -0,0 +1,181 @@
+"""Columnar record of the metadata of every frame of an MDA."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+import numpy as np
+import zarr
+
+from ._mda_engine import CAMERA_KEY
+
+if TYPE_CHECKING:
+    from useq import MDAEvent
+
+__all__ = ["COLUMNS", "FrameIndex"]
+
+# column name -> dtype.  Missing values are -1 for integers and NaN for floats.
+COLUMNS: Dict[str, str] = {
+    # event.index of the frame
+    "t": "int32",
+    "p": "int32",
+    "c": "int32",
+    "z": "int32",
+    # seconds since the start of the sequence, when the frame was received
+    "timestamp": "float64",
+    # requested stage position (um) and exposure (ms)
+    "x_um": "float64",
+    "y_um": "float64",
+    "z_um": "float64",
+    "exposure_ms": "float64",
+    # codes into `FrameIndex.channels` / `FrameIndex.cameras`
+    "channel": "int16",
+    "camera": "int16",
+}
+_CATEGORIES = {"channel": "channels", "camera": "cameras"}
+
+
+class FrameIndex:
+    """Columnar table with one row per acquired MDA frame.
+
+    Each column of `COLUMNS` is a 1D numpy array, so frames can be selected
+    without touching any image data, e.g. every frame at position 3 between
+    time points 100 and 200::
+
+        rows = index.select(p=3, t=(100, 200))
+        rows["timestamp"], rows["z_um"]
+
+    Channel and camera names are stored as integer codes into `channels` and
+    `cameras`.
+
+    If `group` is given, rows are appended to one zarr array per column in that
+    group every `block` frames and on `flush`, so the index is stored alongside
+    the images.  Otherwise it is kept in memory and can be written with `save`.
+
+    Parameters
+    ----------
+    group : Optional[zarr.Group]
+        Group to write the columns to, by default None.
+    block : int
+        Number of rows buffered in memory before they are written to `group`.
+    """
+
+    def __init__(self, group: Optional[zarr.Group] = None, block: int = 1024) -> None:
+        self._group = group
+        self._block = block
+        self._n = 0
+        self._written = 0  # rows already in `group`
+        self._columns = {k: np.empty(block, dtype=v) for k, v in COLUMNS.items()}
+        self.channels: List[str] = []
+        self.cameras: List[str] = []
+        if group is not None:
+            for name, dtype in COLUMNS.items():
+                group.zeros(name, shape=(0,), chunks=(block,), dtype=dtype)
+
+    def __len__(self) -> int:
+        """Return the number of frames."""
+        return self._n
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Return the values of `column` for every frame."""
+        return self._columns[column][: self._n]
+
+    def append(self, event: MDAEvent, timestamp: float) -> None:
+        """Add a row for the frame acquired by `event`, received at `timestamp`."""
+        if self._n == len(self._columns["t"]):
+            for k, v in self._columns.items():
+                self._columns[k] = np.resize(v, max(1, 2 * len(v)))
+        row = self._n
+        cols = self._columns
+        for axis in ("t", "p", "c", "z"):
+            cols[axis][row] = event.index.get(axis, -1)
+        cols["timestamp"][row] = timestamp
+        for col, value in (
+            ("x_um", event.x_pos),
+            ("y_um", event.y_pos),
+            ("z_um", event.z_pos),
+            ("exposure_ms", event.exposure),
+        ):
+            cols[col][row] = np.nan if value is None else value
+        channel = event.channel.config if event.channel else None
+        cols["channel"][row] = self._code(self.channels, channel)
+        cols["camera"][row] = self._code(self.cameras, event.metadata.get(CAMERA_KEY))
+        self._n += 1
+        if self._group is not None and self._n - self._written >= self._block:
+            self.flush()
+
+    @staticmethod
+    def _code(categories: List[str], value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        if value not in categories:
+            categories.append(value)
+        return categories.index(value)
+
+    def mask(self, **criteria: Any) -> np.ndarray:
+        """Return a boolean mask of the frames matching every criterion.
+
+        Each keyword is a column name.  A value selects the frames equal to it,
+        a ``(low, high)`` tuple the frames in that inclusive range.  "channel" and
+        "camera" also accept names.
+        """
+        mask = np.ones(self._n, dtype=bool)
+        for column, value in criteria.items():
+            if column not in COLUMNS:
+                raise ValueError(f"unknown column {column!r}")
+            data = self[column]
+            if isinstance(value, str) and column in _CATEGORIES:
+                names = getattr(self, _CATEGORIES[column])
+                value = names.index(value) if value in names else -2
+            if isinstance(value, tuple):
+                low, high = value
+                mask &= (data >= low) & (data <= high)
+            else:
+                mask &= data == value
+        return mask
+
+    def select(self, **criteria: Any) -> Dict[str, np.ndarray]:
+        """Return every column, for the frames matching `criteria` (see `mask`)."""
+        mask = self.mask(**criteria)
+        return {k: self[k][mask] for k in COLUMNS}
+
+    def flush(self) -> None:
+        """Append the rows not written yet to `group` (no-op without a group)."""
+        if self._group is None:
+            return
+        for name in COLUMNS:
+            self._group[name].append(self._columns[name][self._written : self._n])
+        self._group.attrs.update(channels=self.channels, cameras=self.cameras)
+        self._written = self._n
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the index to a numpy ``.npz`` file."""
+        np.savez(
+            path,
+            channels=np.array(self.channels, dtype=str),
+            cameras=np.array(self.cameras, dtype=str),
+            **{k: self[k] for k in COLUMNS},
+        )
+
+    @classmethod
+    def load(cls, source: Union[str, Path, zarr.Group]) -> FrameIndex:
+        """Read an index written by `save` (.npz) or to a zarr group."""
+        if isinstance(source, zarr.Group):
+            data: Any = source
+            categories = {
+                k: list(source.attrs.get(k, [])) for k in ("channels", "cameras")
+            }
+        elif str(source).endswith(".npz"):
+            data = np.load(source)
+            categories = {k: data[k].tolist() for k in ("channels", "cameras")}
+        else:
+            return cls.load(zarr.open_group(str(source), mode="r"))
+
+        index = cls(block=1)
+        index._columns = {
+            k: np.asarray(data[k][:], dtype=v) for k, v in COLUMNS.items()
+        }
+        index._n = len(index._columns["t"])
+        index.channels = categories["channels"]
+        index.cameras = categories["cameras"]
+        return index
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+from qtpy.QtCore import QRectF, Qt
+from qtpy.QtGui import QColor, QPainter
+from qtpy.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QDialog,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from .._live_latency import STAGES
+
+if TYPE_CHECKING:
+    from .._live import LiveFramePump, LiveStats
+    from .._live_latency import LatencyMonitor
+
+_STATS = ("n", "mean", "p50", "p95", "max", "jitter")
+_ROWS = (*STAGES, "interval")
+
+
+class _Histogram(QWidget):
+    """Minimal bar plot of a histogram."""
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self._counts = np.empty(0)
+        self._edges = np.empty(0)
+        self.setMinimumSize(320, 120)
+
+    def set_data(self, counts: np.ndarray, edges: np.ndarray) -> None:
+        self._counts, self._edges = counts, edges
+        if counts.size:
+            self.setToolTip(f"{edges[0]:.2f} - {edges[-1]:.2f} ms")
+        self.update()
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#262930"))
+        if not self._counts.size or not self._counts.max():
+            return
+        w = self.width() / self._counts.size
+        h = self.height() - 16
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#6fa8dc"))
+        for i, c in enumerate(self._counts):
+            bar = h * c / self._counts.max()
+            painter.drawRect(QRectF(i * w + 1, h - bar, w - 2, bar))
+        painter.setPen(QColor("white"))
+        painter.drawText(2, self.height() - 2, f"{self._edges[0]:.2f} ms")
+        right = f"{self._edges[-1]:.2f} ms"
+        painter.drawText(
+            self.width() - painter.fontMetrics().horizontalAdvance(right) - 2,
+            self.height() - 2,
+            right,
+        )
+
+
+class LatencyPanel(QDialog):
+    """Dialog showing the per-stage latency of the live preview.
+
+    While "measure" is checked, `monitor` is attached to `pump` and every
+    displayed live frame is timed (see `LatencyMonitor`).  The table shows the
+    statistics of each stage in ms, the plot the histogram of the selected stage.
+
+    Parameters
+    ----------
+    pump : LiveFramePump
+        The live frame pump to instrument.
+    monitor : LatencyMonitor
+        Where the timings are collected.
+    parent : Optional[QWidget]
+        Optional parent widget, by default None.
+    """
+
+    def __init__(
+        self,
+        pump: LiveFramePump,
+        monitor: LatencyMonitor,
+        parent: Optional[QWidget] = None,
+    ):
+        super().__init__(parent)
+        self.setWindowTitle("Live Latency")
+        self._pump = pump
+        self._monitor = monitor
+
+        self.measure_checkBox = QCheckBox(text="measure")
+        self.measure_checkBox.toggled.connect(self._toggle_measure)
+        self.reset_Button = QPushButton(text="Reset")
+        self.reset_Button.clicked.connect(self._reset)
+        self.export_Button = QPushButton(text="Export CSV...")
+        self.export_Button.clicked.connect(self._export)
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.measure_checkBox)
+        buttons.addStretch()
+        buttons.addWidget(self.reset_Button)
+        buttons.addWidget(self.export_Button)
+
+        self.table = QTableWidget(len(_ROWS), len(_STATS))
+        self.table.setHorizontalHeaderLabels(_STATS)
+        self.table.setVerticalHeaderLabels(_ROWS)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        for r, stage in enumerate(_ROWS):
+            self.table.verticalHeaderItem(r).setToolTip(
+                STAGES.get(stage, "time between two drawn frames")
+            )
+        self.table.setMinimumHeight(
+            self.table.verticalHeader().length()
+            + self.table.horizontalHeader().height()
+            + 4
+        )
+
+        self.stage_comboBox = QComboBox()
+        self.stage_comboBox.addItems(_ROWS)
+        self.stage_comboBox.setCurrentText("total")
+        self.stage_comboBox.currentTextChanged.connect(self._update_histogram)
+        self.histogram = _Histogram()
+
+        self.stats_label = QLabel()
+
+        layout = QVBoxLayout()
+        layout.addLayout(buttons)
+        layout.addWidget(self.table)
+        layout.addWidget(self.stage_comboBox)
+        layout.addWidget(self.histogram)
+        layout.addWidget(self.stats_label)
+        self.setLayout(layout)
+
+        self.measure_checkBox.setChecked(True)
+
+    def _toggle_measure(self, checked: bool) -> None:
+        self._pump.latency = self._monitor if checked else None
+
+    def _reset(self) -> None:
+        self._monitor.reset()
+        self.refresh()
+
+    def _export(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export latencies", "live_latency.csv", "CSV (*.csv)"
+        )
+        if path:
+            self._monitor.to_csv(path)
+
+    def _update_histogram(self) -> None:
+        stage = self.stage_comboBox.currentText()
+        self.histogram.set_data(*self._monitor.histogram(stage))
+
+    def refresh(self, stats: Optional[LiveStats] = None) -> None:
+        """Update the table and histogram (and the frame counters, if `stats`)."""
+        summary = self._monitor.summary()
+        for r, stage in enumerate(_ROWS):
+            for c, key in enumerate(_STATS):
+                value = summary[stage][key]
+                if key == "n":
+                    txt = str(value)
+                else:
+                    txt = "-" if math.isnan(value) else f"{value:.2f}"
+                self.table.setItem(r, c, QTableWidgetItem(txt))
+        self._update_histogram()
+        if stats is not None:
+            self.stats_label.setText(
+                f"camera frames: {stats.camera_frames} | displayed: "
+                f"{stats.displayed_frames} | dropped: {stats.dropped_frames}"
+            )
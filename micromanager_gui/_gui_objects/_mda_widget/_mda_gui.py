@@ -13,6 +13,7 @@ from qtpy.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QLineEdit,
+    QProgressBar,
     QPushButton,
     QScrollArea,
     QSizePolicy,
@@ -25,6 +26,9 @@ from qtpy.QtWidgets import (
 )
 from superqt.fonticon import icon
 
+from ..._mda import OVERFLOW_POLICIES
+from ..._writers import WRITERS
+
 
 class MultiDWidgetGui(QWidget):
     """Just the UI portion of the MDA widget. Runtime logic in MMMultiDWidget."""
@@ -44,6 +48,10 @@ class MultiDWidgetGui(QWidget):
         self._scroll.setWidget(self.explorer_wdg)
         self.layout().addWidget(self._scroll)
 
+        # frame buffer settings and fill level
+        self.buffer_wdg = self._create_buffer_wdg()
+        self.layout().addWidget(self.buffer_wdg)
+
         # acq order and buttons wdg
         self.bottom_wdg = self._create_bottom_wdg()
         self.layout().addWidget(self.bottom_wdg)
@@ -115,6 +123,31 @@ class MultiDWidgetGui(QWidget):
         fname_group_layout.addWidget(fname_lbl)
         fname_group_layout.addWidget(self.fname_lineEdit)
 
+        # file format
+        format_group = QWidget()
+        format_group_layout = QHBoxLayout()
+        format_group_layout.setSpacing(5)
+        format_group_layout.setContentsMargins(0, 0, 0, 10)
+        format_group.setLayout(format_group_layout)
+        format_lbl = QLabel(text="Format: ")
+        format_lbl.setMinimumWidth(min_lbl_size)
+        format_lbl.setSizePolicy(lbl_sizepolicy)
+        self.file_format_comboBox = QComboBox()
+        self.file_format_comboBox.addItems(list(WRITERS))
+        self.file_format_comboBox.setToolTip(
+            "zarr formats are written while acquiring, other files at the end."
+        )
+        compression_lbl = QLabel(text="Compression: ")
+        compression_lbl.setSizePolicy(lbl_sizepolicy)
+        self.compression_comboBox = QComboBox()
+        self.compression_comboBox.addItems(
+            WRITERS[self.file_format_comboBox.currentText()].codecs
+        )
+        format_group_layout.addWidget(format_lbl)
+        format_group_layout.addWidget(self.file_format_comboBox)
+        format_group_layout.addWidget(compression_lbl)
+        format_group_layout.addWidget(self.compression_comboBox)
+
         # checkbox
         self.checkBox_save_pos = QCheckBox(
             text="Save XY Positions in separate files (ImageJ compatibility)"
@@ -122,6 +155,7 @@ class MultiDWidgetGui(QWidget):
 
         group_layout.addWidget(dir_group)
         group_layout.addWidget(fname_group)
+        group_layout.addWidget(format_group)
         group_layout.addWidget(self.checkBox_save_pos)
 
         return group
@@ -224,6 +258,12 @@ class MultiDWidgetGui(QWidget):
         self.time_comboBox.addItems(["ms", "sec", "min"])
         group_layout.addWidget(self.time_comboBox)
 
+        self.until_stopped_checkBox = QCheckBox(text="Until stopped")
+        self.until_stopped_checkBox.setToolTip(
+            "Keep acquiring time points until the acquisition is canceled."
+        )
+        group_layout.addWidget(self.until_stopped_checkBox)
+
         return group
 
     def _create_stack_groupBox(self):
@@ -429,6 +469,37 @@ class MultiDWidgetGui(QWidget):
 
         return group
 
+    def _create_buffer_wdg(self):
+
+        wdg = QWidget()
+        wdg.setSizePolicy(QSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed))
+        wdg_layout = QHBoxLayout()
+        wdg_layout.setSpacing(10)
+        wdg_layout.setContentsMargins(10, 15, 10, 0)
+        wdg.setLayout(wdg_layout)
+
+        overflow_lbl = QLabel(text="When the buffer is full:")
+        overflow_lbl.setSizePolicy(QSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed))
+        self.overflow_comboBox = QComboBox()
+        self.overflow_comboBox.addItems(OVERFLOW_POLICIES)
+        self.overflow_comboBox.setToolTip(
+            "What to do with new frames when they arrive faster than they can be "
+            "written:\nblock: slow the acquisition down.\n"
+            "drop: skip frames that are not saved.\n"
+            "spill: buffer them in temporary files."
+        )
+        self.buffer_progressBar = QProgressBar()
+        self.buffer_progressBar.setRange(0, 100)
+        self.buffer_progressBar.setFormat("buffer %p%")
+        self.dropped_label = QLabel()
+
+        wdg_layout.addWidget(overflow_lbl)
+        wdg_layout.addWidget(self.overflow_comboBox)
+        wdg_layout.addWidget(self.buffer_progressBar)
+        wdg_layout.addWidget(self.dropped_label)
+
+        return wdg
+
     def _create_bottom_wdg(self):
 
         wdg = QWidget()
@@ -10,11 +10,15 @@ from useq import MDASequence
 
 from ..._core import get_core_singleton
 from ..._mda import SEQUENCE_META, SequenceMeta
+from ..._mda_engine import UNTIL_STOPPED_KEY, is_until_stopped
+from ..._writers import WRITERS
 from ._mda_gui import MultiDWidgetGui
 
 if TYPE_CHECKING:
     from pymmcore_plus.mda import PMDAEngine
 
+    from ..._mda_writer import WriterStats
+
 
 class MMMultiDWidget(MultiDWidgetGui):
     """Multi-dimensional acquisition Widget."""
@@ -24,6 +28,7 @@ class MMMultiDWidget(MultiDWidgetGui):
 
         self.pause_Button.hide()
         self.cancel_Button.hide()
+        self.buffer_progressBar.hide()
 
         self._mmc = get_core_singleton()
 
@@ -61,9 +66,17 @@ class MMMultiDWidget(MultiDWidgetGui):
         self.z_tabWidget.currentChanged.connect(self._update_n_images)
         self.stack_groupBox.toggled.connect(self._update_n_images)
 
+        self.until_stopped_checkBox.toggled.connect(
+            lambda checked: self.timepoints_spinBox.setEnabled(not checked)
+        )
+
         # toggle connect
         self.save_groupBox.toggled.connect(self.toggle_checkbox_save_pos)
         self.stage_pos_groupBox.toggled.connect(self.toggle_checkbox_save_pos)
+        self.file_format_comboBox.currentTextChanged.connect(
+            self.toggle_checkbox_save_pos
+        )
+        self.file_format_comboBox.currentTextChanged.connect(self._update_codecs)
 
         # connect position table double click
         self.stage_tableWidget.cellDoubleClicked.connect(self.move_to_position)
@@ -87,6 +100,7 @@ class MMMultiDWidget(MultiDWidgetGui):
         self.save_groupBox.setEnabled(enabled)
         self.time_groupBox.setEnabled(enabled)
         self.acquisition_order_comboBox.setEnabled(enabled)
+        self.overflow_comboBox.setEnabled(enabled)
         self.channel_groupBox.setEnabled(enabled)
 
         if not self._mmc.getXYStageDevice():
@@ -144,6 +158,17 @@ class MMMultiDWidget(MultiDWidgetGui):
         self.cancel_Button.hide()
         self.run_Button.show()
 
+    def show_buffer_stats(self, stats: WriterStats):
+        """Show the fill level of the MDA frame buffer and the lost frames."""
+        self.buffer_progressBar.show()
+        self.buffer_progressBar.setValue(round(stats.fill * 100))
+        text = f"dropped: {stats.dropped}"
+        if stats.spilled:
+            text = f"on disk: {stats.spilled}  {text}"
+        if stats.failed:
+            text = f"{text}  failed: {stats.failed}"
+        self.dropped_label.setText(text)
+
     def _on_mda_paused(self, paused):
         self.pause_Button.setText("GO" if paused else "PAUSE")
 
@@ -185,9 +210,11 @@ class MMMultiDWidget(MultiDWidgetGui):
         self.channel_tableWidget.setRowCount(0)
 
     def toggle_checkbox_save_pos(self):
+        # positions can't be saved separately when acquiring into a single store
         if (
             self.stage_pos_groupBox.isChecked()
             and self.stage_tableWidget.rowCount() > 0
+            and not WRITERS[self.file_format_comboBox.currentText()].in_place
         ):
             self.checkBox_save_pos.setEnabled(True)
 
@@ -195,6 +222,14 @@ class MMMultiDWidget(MultiDWidgetGui):
             self.checkBox_save_pos.setCheckState(Qt.CheckState.Unchecked)
             self.checkBox_save_pos.setEnabled(False)
 
+    def _update_codecs(self, file_format: str):
+        """Offer the compressions supported by `file_format`."""
+        current = self.compression_comboBox.currentText()
+        self.compression_comboBox.clear()
+        self.compression_comboBox.addItems(WRITERS[file_format].codecs)
+        if current in WRITERS[file_format].codecs:
+            self.compression_comboBox.setCurrentText(current)
+
     # add, remove, clear, move_to positions table
     def add_position(self):
 
@@ -311,6 +346,7 @@ class MMMultiDWidget(MultiDWidgetGui):
         if hasattr(state.time_plan, "interval") and hasattr(state.time_plan, "loops"):
             self.time_groupBox.setChecked(True)
             self.timepoints_spinBox.setValue(state.time_plan.loops)
+            self.until_stopped_checkBox.setChecked(is_until_stopped(state))
 
             sec = state.time_plan.interval.total_seconds()
             if sec >= 60:
@@ -384,6 +420,10 @@ class MMMultiDWidget(MultiDWidgetGui):
                 "interval": {unit: self.interval_spinBox.value()},
                 "loops": self.timepoints_spinBox.value(),
             }
+            if self.until_stopped_checkBox.isChecked():
+                # one time point, repeated until the MDA is canceled
+                state["time_plan"]["loops"] = 1
+                state["metadata"] = {UNTIL_STOPPED_KEY: True}
         # position settings
         if self._mmc.getXYStageDevice():
             if (
@@ -438,6 +478,9 @@ class MMMultiDWidget(MultiDWidgetGui):
             file_name=self.fname_lineEdit.text(),
             save_dir=self.dir_lineEdit.text(),
             save_pos=self.checkBox_save_pos.isChecked(),
+            file_format=self.file_format_comboBox.currentText(),
+            compression=self.compression_comboBox.currentText(),
+            overflow=self.overflow_comboBox.currentText(),
         )
         self._mmc.run_mda(experiment)  # run the MDA experiment asynchronously
         return
@@ -92,6 +92,10 @@ class MicroManagerWidget(QtW.QWidget):
         self.tab_wdg.tabWidget.addTab(self.explorer, "Sample Explorer")
         self.tab_wdg.tabWidget.addTab(self.group_preset_table_wdg, "Groups and Presets")
 
+        # progress of the acquisitions being saved in the background
+        self.save_wdg = self.add_save_progress_widget()
+        self.main_layout.addWidget(self.save_wdg)
+
         # set main_layout layout
         self.setLayout(self.main_layout)
 
@@ -123,6 +127,25 @@ class MicroManagerWidget(QtW.QWidget):
         shutter_wdg.setLayout(shutter_wdg_layout)
         return shutter_wdg
 
+    def add_save_progress_widget(self):
+        save_wdg = QtW.QWidget()
+        save_wdg_layout = QtW.QHBoxLayout()
+        save_wdg_layout.setContentsMargins(5, 5, 5, 5)
+        save_wdg_layout.setSpacing(7)
+        self.save_status_label = QtW.QLabel()
+        self.save_progressBar = QtW.QProgressBar()
+        self.save_progressBar.setFormat("%v/%m files")
+        self.save_cancel_Button = QtW.QPushButton("Cancel")
+        self.save_cancel_Button.setToolTip(
+            "Stop saving. Files already written are kept."
+        )
+        save_wdg_layout.addWidget(self.save_status_label)
+        save_wdg_layout.addWidget(self.save_progressBar)
+        save_wdg_layout.addWidget(self.save_cancel_Button)
+        save_wdg.setLayout(save_wdg_layout)
+        save_wdg.hide()
+        return save_wdg
+
     def _show_illum_dialog(self):
         if not hasattr(self, "_illumination"):
             self._illumination = SliderDialog("(Intensity|Power|test)s?", self)
@@ -4,6 +4,7 @@ from fonticon_mdi6 import MDI6
 from qtpy import QtCore
 from qtpy.QtCore import QSize, Qt
 from qtpy.QtWidgets import (
+    QCheckBox,
     QGridLayout,
     QGroupBox,
     QHBoxLayout,
@@ -207,8 +208,14 @@ class ExplorerGui(QWidget):
         fname_group_layout.addWidget(fname_lbl)
         fname_group_layout.addWidget(self.fname_explorer_lineEdit)
 
+        # stitched mosaic
+        self.save_mosaic_checkBox = QCheckBox(
+            text="Also save the stitched mosaic (OME-Zarr)"
+        )
+
         group_layout.addWidget(dir_group)
         group_layout.addWidget(fname_group)
+        group_layout.addWidget(self.save_mosaic_checkBox)
 
         return group
 
@@ -267,6 +267,7 @@ class MMExploreSample(ExplorerGui):
             should_save=self.save_explorer_groupBox.isChecked(),
             file_name=self.fname_explorer_lineEdit.text(),
             save_dir=self.dir_explorer_lineEdit.text(),
+            mosaic=self.save_mosaic_checkBox.isChecked(),
         )
 
         self._mmc.run_mda(explore_sample)  # run the MDA experiment asynchronously
@@ -6,6 +6,7 @@ from qtpy import QtWidgets as QtW
 from .._core_widgets import DefaultCameraExposureWidget
 from .._core_widgets._live_button_widget import LiveButton
 from .._core_widgets._snap_button_widget import SnapButton
+from .._live_filters import FILTERS
 from ._channel_widget import ChannelWidget
 
 ICONS = Path(__file__).parent.parent / "icons"
@@ -96,11 +97,74 @@ class MMTabWidget(QtW.QWidget):
         self.max_min_wdg.setLayout(self.max_min_wdg_layout)
         self.snap_live_tab_layout.addWidget(self.max_min_wdg, 2, 0, 1, 2)
 
+        # live frame rates in snap_live_tab
+        self.live_fps_wdg = QtW.QWidget()
+        self.live_fps_wdg_layout = QtW.QHBoxLayout()
+        self.live_fps_label = QtW.QLabel()
+        self.max_fps_label = QtW.QLabel()
+        self.max_fps_label.setText("max display fps:")
+        self.max_fps_spinBox = QtW.QSpinBox()
+        self.max_fps_spinBox.setRange(1, 240)
+        self.max_fps_spinBox.setValue(30)
+        self.preview_mode_label = QtW.QLabel()
+        self.preview_mode_label.setText("preview:")
+        self.preview_mode_comboBox = QtW.QComboBox()
+        self.preview_mode_comboBox.addItems(["full resolution", "stride", "bin"])
+        self.preview_mode_comboBox.setToolTip(
+            "Downsample live frames to the canvas resolution"
+        )
+        self.live_fps_wdg_layout.addWidget(self.live_fps_label)
+        self.live_fps_wdg_layout.addWidget(self.max_fps_label)
+        self.live_fps_wdg_layout.addWidget(self.max_fps_spinBox)
+        self.live_fps_wdg_layout.addWidget(self.preview_mode_label)
+        self.live_fps_wdg_layout.addWidget(self.preview_mode_comboBox)
+        self.live_fps_wdg.setLayout(self.live_fps_wdg_layout)
+        self.snap_live_tab_layout.addWidget(self.live_fps_wdg, 3, 0, 1, 2)
+
+        # temporal filter in snap_live_tab
+        self.live_filter_wdg = QtW.QWidget()
+        self.live_filter_wdg_layout = QtW.QHBoxLayout()
+        self.live_filter_label = QtW.QLabel()
+        self.live_filter_label.setText("live filter:")
+        self.live_filter_comboBox = QtW.QComboBox()
+        self.live_filter_comboBox.addItems(["none", *FILTERS])
+        self.live_filter_frames_label = QtW.QLabel()
+        self.live_filter_frames_label.setText("frames:")
+        self.live_filter_frames_spinBox = QtW.QSpinBox()
+        self.live_filter_frames_spinBox.setRange(1, 1000)
+        self.live_filter_frames_spinBox.setValue(10)
+        self.live_filter_wdg_layout.addWidget(self.live_filter_label)
+        self.live_filter_wdg_layout.addWidget(self.live_filter_comboBox)
+        self.live_filter_wdg_layout.addWidget(self.live_filter_frames_label)
+        self.live_filter_wdg_layout.addWidget(self.live_filter_frames_spinBox)
+        self.live_filter_wdg.setLayout(self.live_filter_wdg_layout)
+        self.snap_live_tab_layout.addWidget(self.live_filter_wdg, 4, 0, 1, 2)
+
+        # record live in snap_live_tab
+        self.record_groupBox = QtW.QGroupBox()
+        self.record_groupBox.setSizePolicy(wdg_sizepolicy)
+        self.record_groupBox.setTitle("Record Live")
+        self.record_groupBox_layout = QtW.QGridLayout()
+        self.record_dir_label = QtW.QLabel()
+        self.record_dir_label.setText("directory:")
+        self.record_dir_lineEdit = QtW.QLineEdit()
+        self.record_browse_Button = QtW.QPushButton(text="...")
+        self.record_Button = QtW.QPushButton(text="Record")
+        self.record_Button.setCheckable(True)
+        self.record_status_label = QtW.QLabel()
+        self.record_groupBox_layout.addWidget(self.record_dir_label, 0, 0)
+        self.record_groupBox_layout.addWidget(self.record_dir_lineEdit, 0, 1)
+        self.record_groupBox_layout.addWidget(self.record_browse_Button, 0, 2)
+        self.record_groupBox_layout.addWidget(self.record_Button, 1, 0)
+        self.record_groupBox_layout.addWidget(self.record_status_label, 1, 1, 1, 2)
+        self.record_groupBox.setLayout(self.record_groupBox_layout)
+        self.snap_live_tab_layout.addWidget(self.record_groupBox, 5, 0, 1, 2)
+
         # spacer
         spacer = QtW.QSpacerItem(
             20, 40, QtW.QSizePolicy.Minimum, QtW.QSizePolicy.Expanding
         )
-        self.snap_live_tab_layout.addItem(spacer, 3, 0)
+        self.snap_live_tab_layout.addItem(spacer, 6, 0)
 
         # set snap_live_tab layout
         self.snap_live_tab.setLayout(self.snap_live_tab_layout)
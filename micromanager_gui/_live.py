@@ -0,0 +1,445 @@
+"""Background frame pump feeding the live preview."""
+from __future__ import annotations
+
+import copy
+import math
+import threading
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from qtpy.QtCore import QObject, Signal
+
+from ._live_latency import frame_timestamp
+
+if TYPE_CHECKING:
+    from pymmcore_plus import CMMCorePlus, Metadata, RemoteMMCore
+
+    from ._live_filters import TemporalFilter
+    from ._live_latency import LatencyMonitor
+    from ._recording import LiveRecorder
+
+__all__ = [
+    "FrameRing",
+    "LiveFramePump",
+    "LiveStats",
+    "PreviewView",
+    "preview_view",
+    "reduce_frame",
+]
+
+# how long the reader thread sleeps when the circular buffer is empty (s)
+_IDLE_WAIT = 0.001
+# how often camera/display frame rates are updated (s)
+_STATS_INTERVAL = 1.0
+
+
+class PreviewView(NamedTuple):
+    """The part of each live frame sent to the preview layer, and how it's reduced.
+
+    `region` is `(y0, y1, x0, x1)` in full-resolution pixels (None for the whole
+    frame), `factor` the number of full-resolution pixels per preview pixel along
+    each axis, and `mode` either "stride" (take every `factor`-th pixel) or "bin"
+    (average `factor` x `factor` blocks).
+    """
+
+    factor: int = 1
+    region: Optional[Tuple[int, int, int, int]] = None
+    mode: str = "stride"
+
+
+def preview_view(
+    frame_shape: Sequence[int],
+    canvas_size: Sequence[int],
+    zoom: float,
+    center: Sequence[float],
+    mode: str = "stride",
+    margin: float = 0.25,
+) -> PreviewView:
+    """Return the `PreviewView` matching what the canvas can actually show.
+
+    Parameters
+    ----------
+    frame_shape : Sequence[int]
+        (height, width) of the full-resolution camera frame.
+    canvas_size : Sequence[int]
+        (height, width) of the canvas in screen pixels.
+    zoom : float
+        Camera zoom, in screen pixels per full-resolution frame pixel.
+    center : Sequence[float]
+        (y, x) camera center, in full-resolution frame pixels.
+    mode : str
+        "stride" or "bin", by default "stride".
+    margin : float
+        Fraction of the visible region added on each side so that small pans
+        don't immediately show the edge of the crop, by default 0.25.
+    """
+    height, width = frame_shape[-2:]
+    factor = max(1, int(1 / zoom)) if zoom > 0 else 1
+    half_h = canvas_size[0] / zoom / 2 * (1 + margin)
+    half_w = canvas_size[1] / zoom / 2 * (1 + margin)
+    y0 = min(max(math.floor(center[0] - half_h), 0), height)
+    y1 = min(max(math.ceil(center[0] + half_h), 0), height)
+    x0 = min(max(math.floor(center[1] - half_w), 0), width)
+    x1 = min(max(math.ceil(center[1] + half_w), 0), width)
+    if y1 - y0 < factor or x1 - x0 < factor:
+        # nothing of the frame is visible
+        return PreviewView(factor, None, mode)
+    region = None if (y0, y1, x0, x1) == (0, height, 0, width) else (y0, y1, x0, x1)
+    return PreviewView(factor, region, mode)
+
+
+def reduce_frame(
+    frame: np.ndarray, view: PreviewView
+) -> Tuple[np.ndarray, Tuple[float, float], Tuple[float, float]]:
+    """Crop and downsample `frame` according to `view`.
+
+    Returns the reduced data along with the `scale` and `translate` that place it
+    on top of the full-resolution frame in the viewer.  With "stride" the data is
+    a view into `frame`, with "bin" it is a new array of the same dtype.
+    """
+    height, width = frame.shape[:2]
+    y0, y1, x0, x1 = view.region or (0, height, 0, width)
+    f = view.factor
+    if f == 1:
+        return frame[y0:y1, x0:x1], (1.0, 1.0), (float(y0), float(x0))
+
+    if view.mode == "bin":
+        ny, nx = (y1 - y0) // f, (x1 - x0) // f
+        window = frame[y0 : y0 + ny * f, x0 : x0 + nx * f]
+        if frame.dtype.kind == "f":
+            acc_dtype: np.dtype = np.dtype(np.float64)
+        else:
+            acc_dtype = np.dtype(np.uint32 if frame.itemsize <= 2 else np.uint64)
+        # summing the f*f strided sub-images is much faster than reducing over a
+        # (ny, f, nx, f) reshaped view, which numpy can't vectorize well.
+        acc = np.zeros((ny, nx) + frame.shape[2:], dtype=acc_dtype)
+        for i in range(f):
+            for j in range(f):
+                acc += window[i::f, j::f]
+        data = (acc / (f * f)).astype(frame.dtype)
+        # each binned pixel sits at the center of its block
+        offset = (f - 1) / 2
+        return data, (float(f), float(f)), (y0 + offset, x0 + offset)
+
+    return frame[y0:y1:f, x0:x1:f], (float(f), float(f)), (float(y0), float(x0))
+
+
+class LiveStats:
+    """Frame counters and rates for a live session.
+
+    `camera_frames` counts every frame drained from the circular buffer,
+    `displayed_frames` every frame handed to (and consumed by) the GUI.
+    `filter_ms` is the time spent in the temporal filter per camera frame.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.camera_frames = 0
+        self.displayed_frames = 0
+        self.camera_fps = 0.0
+        self.display_fps = 0.0
+        self.filter_ms = 0.0
+        self.filter_time = 0.0  # seconds spent filtering since the last update
+        self._last_t = time.perf_counter()
+        self._last_camera = 0
+        self._last_displayed = 0
+
+    @property
+    def dropped_frames(self) -> int:
+        """Number of camera frames that were never displayed."""
+        return max(self.camera_frames - self.displayed_frames, 0)
+
+    def update_rates(self, now: float) -> bool:
+        """Recompute fps if `_STATS_INTERVAL` has elapsed. Return True if updated."""
+        elapsed = now - self._last_t
+        if elapsed < _STATS_INTERVAL:
+            return False
+        self.camera_fps = (self.camera_frames - self._last_camera) / elapsed
+        self.display_fps = (self.displayed_frames - self._last_displayed) / elapsed
+        frames = self.camera_frames - self._last_camera
+        self.filter_ms = self.filter_time / frames * 1000 if frames else 0.0
+        self.filter_time = 0.0
+        self._last_t = now
+        self._last_camera = self.camera_frames
+        self._last_displayed = self.displayed_frames
+        return True
+
+    def __str__(self) -> str:
+        """Return a one-line summary of the frame rates."""
+        txt = (
+            f"camera: {self.camera_fps:.1f} fps | display: {self.display_fps:.1f} fps"
+            f" | dropped: {self.dropped_frames}"
+        )
+        if self.filter_ms:
+            txt += f" | filter: {self.filter_ms:.2f} ms/frame"
+        return txt
+
+
+class FrameRing:
+    """A fixed ring of preallocated frame buffers.
+
+    `write` copies a frame into the next buffer of the ring and returns it, so the
+    arrays handed to the preview layer are always the same few, allocated once
+    per live session (or whenever the frame shape/dtype changes).  The buffer
+    returned by `write` is not written to again for `n_buffers - 1` calls, which
+    leaves it untouched while it is displayed and while the previous one may
+    still be referenced by the renderer.
+
+    Parameters
+    ----------
+    n_buffers : int
+        Number of buffers in the ring, by default 3 (back, front, and one spare).
+    """
+
+    def __init__(self, n_buffers: int = 3) -> None:
+        if n_buffers < 2:
+            raise ValueError("n_buffers must be at least 2")
+        self._n_buffers = n_buffers
+        self._buffers: List[np.ndarray] = []
+        self._idx = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Total number of bytes held by the ring."""
+        return sum(b.nbytes for b in self._buffers)
+
+    def clear(self) -> None:
+        """Release all buffers."""
+        self._buffers = []
+        self._idx = 0
+
+    def write(self, frame: np.ndarray) -> np.ndarray:
+        """Copy `frame` into the next buffer and return that buffer."""
+        if (
+            not self._buffers
+            or self._buffers[0].shape != frame.shape
+            or self._buffers[0].dtype != frame.dtype
+        ):
+            self._buffers = [np.empty_like(frame) for _ in range(self._n_buffers)]
+            self._idx = 0
+        buf = self._buffers[self._idx]
+        np.copyto(buf, frame)
+        self._idx = (self._idx + 1) % self._n_buffers
+        return buf
+
+
+class _Drained(NamedTuple):
+    """A frame popped from the circular buffer, and when it was popped."""
+
+    frame: np.ndarray
+    md: Optional[Metadata]
+    time: float
+
+
+class LiveFramePump(QObject):
+    """Drain the circular buffer on a reader thread and emit the newest frame.
+
+    Every frame produced by the camera is popped from the circular buffer, but
+    only the most recent one is kept.  `frameReady` is emitted at most
+    `max_fps` times per second, and never while the previous frame is still
+    waiting to be consumed (see `frame_consumed`), so a slow GUI can't build up
+    a backlog of queued frames regardless of the camera exposure.
+
+    Emitted frames are copied into a `FrameRing`, so the arrays handed to the
+    GUI are preallocated and reused for the whole session.  Before that, they are
+    cropped and downsampled on the reader thread according to `view` (see
+    `PreviewView`), and `frameReady` carries the `scale` and `translate` needed to
+    display the reduced frame on top of the full-resolution one.
+
+    If `recorder` is set, every frame drained from the circular buffer (not only
+    the displayed ones) is also handed to it.  If `filter` is set, every drained
+    frame is added to it and the displayed frame is the filter's result instead
+    of the newest raw frame.  The filter runs on the reader thread, never on the
+    GUI thread; its cost is reported in `LiveStats.filter_ms`.
+
+    With a multi-channel camera (e.g. the Utilities "Multi Camera" device), frames
+    are sorted by the "CameraChannelIndex" tag of their metadata and every camera
+    channel is handled independently: it has its own newest frame, buffers and
+    filter, and `frameReady` is emitted separately for each channel, with the
+    channel index as last argument.  `channel_names` holds the names of the camera
+    channels of the current session.
+
+    If `latency` is set, frames are popped with their metadata and the monitor is
+    told when each displayed frame was received by the core, drained and emitted.
+
+    Parameters
+    ----------
+    mmcore : CMMCorePlus | RemoteMMCore
+        The core whose circular buffer should be drained.
+    max_fps : float
+        Maximum rate at which frames are handed to the GUI, by default 30.
+    """
+
+    frameReady = Signal(object, object, object, int)
+    statsUpdated = Signal(object)
+
+    def __init__(
+        self,
+        mmcore: CMMCorePlus | RemoteMMCore,
+        max_fps: float = 30.0,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._mmc = mmcore
+        # the core used on the reader thread (see `_run`)
+        self._reader_core: CMMCorePlus | RemoteMMCore = mmcore
+        self.max_fps = max_fps
+        self.stats = LiveStats()
+        self.view = PreviewView()
+        self.recorder: Optional[LiveRecorder] = None
+        self.filter: Optional[TemporalFilter] = None
+        self.latency: Optional[LatencyMonitor] = None
+        self.channel_names: Tuple[str, ...] = ()
+
+        self._buffers: Dict[int, FrameRing] = defaultdict(FrameRing)
+        # filters of camera channels > 0, cloned from `self.filter`
+        self._filter_template: Optional[TemporalFilter] = None
+        self._channel_filters: Dict[int, TemporalFilter] = {}
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        # camera channels with a frame emitted but not yet consumed
+        self._pending: Set[int] = set()
+
+    @property
+    def max_fps(self) -> float:
+        """Maximum display rate in frames per second."""
+        return self._max_fps
+
+    @max_fps.setter
+    def max_fps(self, value: float) -> None:
+        if value <= 0:
+            raise ValueError("max_fps must be greater than 0")
+        self._max_fps = float(value)
+
+    def is_running(self) -> bool:
+        """Return whether the reader thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start draining the circular buffer (no-op if already running)."""
+        if self.is_running():
+            return
+        self.stats.reset()
+        self.channel_names = tuple(self._mmc.getCameraChannelNames())
+        self._pending.clear()
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="LiveFramePump", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the reader thread and wait for it to finish."""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self._buffers.clear()
+        self._channel_filters.clear()
+
+    def frame_consumed(self, channel: int = 0) -> None:
+        """Notify the pump that the last frame of `channel` has been displayed."""
+        with self._lock:
+            if channel in self._pending:
+                self._pending.discard(channel)
+                self.stats.displayed_frames += 1
+
+    def _channel_filter(self, channel: int) -> Optional[TemporalFilter]:
+        """Return the filter of camera `channel`, or None if filtering is off."""
+        filt = self.filter
+        if filt is None or channel == 0:
+            return filt
+        if self._filter_template is not filt:
+            self._filter_template = filt
+            self._channel_filters = {}
+        if channel not in self._channel_filters:
+            self._channel_filters[channel] = type(filt)(filt.n_frames)
+        return self._channel_filters[channel]
+
+    def _pop(self, with_md: bool) -> Tuple[np.ndarray, int, Optional[Metadata]]:
+        """Pop the next frame, its camera channel index and (optionally) metadata."""
+        if not with_md:
+            return self._reader_core.popNextImage(), 0, None
+        frame, md = self._reader_core.popNextImageMD()
+        return frame, int(md.get("CameraChannelIndex", 0)), md
+
+    def _drain(self) -> Dict[int, _Drained]:
+        """Pop every frame in the circular buffer, return the newest per channel."""
+        newest: Dict[int, _Drained] = {}
+        recorder = self.recorder
+        with_md = len(self.channel_names) > 1 or self.latency is not None
+        try:
+            n = self._reader_core.getRemainingImageCount()
+            for _ in range(n):
+                frame, channel, md = self._pop(with_md)
+                newest[channel] = _Drained(frame, md, time.perf_counter())
+                self.stats.camera_frames += 1
+                if recorder is not None:
+                    recorder.put(frame, channel=channel)
+                filt = self._channel_filter(channel)
+                if filt is not None:
+                    t0 = time.perf_counter()
+                    filt.update(frame)
+                    self.stats.filter_time += time.perf_counter() - t0
+        except (RuntimeError, IndexError):
+            # circular buffer was emptied/reset under us (e.g. sequence stopped)
+            pass
+        return newest
+
+    def _source(self, latest: np.ndarray, channel: int) -> np.ndarray:
+        """Return the frame to display: the filtered one if a filter is set."""
+        filt = self._channel_filter(channel)
+        if filt is None:
+            return latest
+        t0 = time.perf_counter()
+        result = filt.result()
+        self.stats.filter_time += time.perf_counter() - t0
+        # the filter may have just been replaced and not have seen a frame yet
+        return latest if result is None else result
+
+    def _run(self) -> None:
+        # Pyro proxies (remote cores) may only be used by the thread that created
+        # them: give the reader thread its own connection.
+        if hasattr(self._mmc, "_pyroUri"):
+            self._reader_core = copy.copy(self._mmc)
+        latest: Dict[int, _Drained] = {}
+        last_emit: Dict[int, float] = defaultdict(float)
+        while not self._stop_event.is_set():
+            frames = self._drain()
+            latest.update(frames)
+
+            now = time.perf_counter()
+            for channel in list(latest):
+                if now - last_emit[channel] < 1 / self._max_fps:
+                    continue
+                with self._lock:
+                    if channel in self._pending:
+                        continue
+                    self._pending.add(channel)
+                drained = latest.pop(channel)
+                data, scale, translate = reduce_frame(
+                    self._source(drained.frame, channel), self.view
+                )
+                buf = self._buffers[channel].write(data)
+                latency = self.latency
+                if latency is not None and drained.md is not None:
+                    camera_t = frame_timestamp(drained.md)
+                    latency.frame_emitted(channel, drained.time, camera_t)
+                self.frameReady.emit(buf, scale, translate, channel)
+                last_emit[channel] = now
+
+            if self.stats.update_rates(now):
+                self.statsUpdated.emit(self.stats)
+
+            if not frames:
+                self._stop_event.wait(_IDLE_WAIT)
+
+        if self._reader_core is not self._mmc:
+            self._reader_core._pyroRelease()  # type: ignore
+            self._reader_core = self._mmc
@@ -0,0 +1,150 @@
+"""Temporal filters applied to live frames before they reach the preview layer."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Type
+
+import numpy as np
+
+__all__ = [
+    "ExponentialMovingAverage",
+    "FILTERS",
+    "RollingMax",
+    "RunningMean",
+    "TemporalFilter",
+]
+
+
+class TemporalFilter(ABC):
+    """Base class for filters combining the last `n_frames` live frames.
+
+    `update` is called on the reader thread for every frame drained from the
+    circular buffer and must be cheap; `result` is only called when a frame is
+    about to be displayed.  All accumulators are allocated on the first frame (or
+    when the frame shape/dtype changes) and updated in place afterwards.  The
+    array returned by `result` is owned by the filter and is overwritten by the
+    next call, so callers must copy it if they need to keep it.
+
+    Parameters
+    ----------
+    n_frames : int
+        Number of frames the filter spans.
+    """
+
+    def __init__(self, n_frames: int) -> None:
+        if n_frames < 1:
+            raise ValueError("n_frames must be at least 1")
+        self.n_frames = n_frames
+        self._shape: Optional[tuple] = None
+        self._dtype: Optional[np.dtype] = None
+        self.count = 0  # frames seen since the last reset
+
+    def update(self, frame: np.ndarray) -> None:
+        """Add `frame` to the filter."""
+        if frame.shape != self._shape or frame.dtype != self._dtype:
+            self._shape, self._dtype = frame.shape, frame.dtype
+            self.count = 0
+            self._allocate(frame)
+        self._update(frame)
+        self.count += 1
+
+    def result(self) -> Optional[np.ndarray]:
+        """Return the filtered frame, or None if no frame has been added yet."""
+        return self._result() if self.count else None
+
+    @abstractmethod
+    def _allocate(self, frame: np.ndarray) -> None:
+        """Preallocate the accumulators for frames like `frame`."""
+
+    @abstractmethod
+    def _update(self, frame: np.ndarray) -> None:
+        """Update the accumulators in place with `frame`."""
+
+    @abstractmethod
+    def _result(self) -> np.ndarray:
+        """Compute the filtered frame from the accumulators."""
+
+
+class RunningMean(TemporalFilter):
+    """Mean of the last `n_frames` frames, returned as float32.
+
+    Keeps a ring of the last `n_frames` frames and a running sum, so each update
+    is one addition and one subtraction regardless of `n_frames`.
+    """
+
+    def _allocate(self, frame: np.ndarray) -> None:
+        acc_dtype = np.float64 if frame.dtype.kind == "f" else np.int64
+        self._ring = np.zeros((self.n_frames,) + frame.shape, dtype=frame.dtype)
+        self._sum = np.zeros(frame.shape, dtype=acc_dtype)
+        self._out = np.empty(frame.shape, dtype=np.float32)
+
+    def _update(self, frame: np.ndarray) -> None:
+        slot = self._ring[self.count % self.n_frames]
+        if self.count >= self.n_frames:
+            np.subtract(self._sum, slot, out=self._sum, casting="unsafe")
+        np.add(self._sum, frame, out=self._sum, casting="unsafe")
+        slot[...] = frame
+
+    def _result(self) -> np.ndarray:
+        np.divide(
+            self._sum,
+            min(self.count, self.n_frames),
+            out=self._out,
+            casting="unsafe",
+        )
+        return self._out
+
+
+class ExponentialMovingAverage(TemporalFilter):
+    """Exponential moving average with the same center of mass as an n-frame mean.
+
+    The smoothing factor is ``alpha = 2 / (n_frames + 1)``.  Returned as float32.
+    """
+
+    def __init__(self, n_frames: int) -> None:
+        super().__init__(n_frames)
+        self.alpha = 2 / (n_frames + 1)
+
+    def _allocate(self, frame: np.ndarray) -> None:
+        self._avg = np.empty(frame.shape, dtype=np.float32)
+        self._tmp = np.empty(frame.shape, dtype=np.float32)
+
+    def _update(self, frame: np.ndarray) -> None:
+        if self.count == 0:
+            self._avg[...] = frame
+            return
+        # avg += alpha * (frame - avg)
+        np.subtract(frame, self._avg, out=self._tmp, casting="unsafe")
+        self._tmp *= self.alpha
+        self._avg += self._tmp
+
+    def _result(self) -> np.ndarray:
+        return self._avg
+
+
+class RollingMax(TemporalFilter):
+    """Maximum projection of the last `n_frames` frames, in the frame dtype.
+
+    Updates only store the frame in a ring; the projection is computed when a
+    frame is displayed.
+    """
+
+    def _allocate(self, frame: np.ndarray) -> None:
+        self._ring = np.empty((self.n_frames,) + frame.shape, dtype=frame.dtype)
+        self._out = np.empty(frame.shape, dtype=frame.dtype)
+
+    def _update(self, frame: np.ndarray) -> None:
+        self._ring[self.count % self.n_frames] = frame
+
+    def _result(self) -> np.ndarray:
+        n = min(self.count, self.n_frames)
+        np.maximum.reduce(self._ring[:n], axis=0, out=self._out)
+        return self._out
+
+
+# name shown in the GUI -> filter class
+FILTERS: Dict[str, Type[TemporalFilter]] = {
+    "running mean": RunningMean,
+    "exponential moving average": ExponentialMovingAverage,
+    "rolling max": RollingMax,
+}
@@ -0,0 +1,199 @@
+"""Per-stage latency of the live preview, from the camera to the screen."""
+from __future__ import annotations
+
+import csv
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pymmcore_plus import Metadata
+
+__all__ = ["COLUMNS", "LatencyMonitor", "STAGES", "frame_timestamp"]
+
+# stage name -> what it measures (all in ms)
+STAGES: Dict[str, str] = {
+    "camera": "core received the frame -> frame drained from the circular buffer",
+    "hold": "drained -> handed to the GUI (display rate cap, previous frame pending)",
+    "signal": "handed to the GUI -> `update_viewer` started (Qt event queue)",
+    "layer": "preview layer data/scale/translate update",
+    "max_min": "`_update_max_min`",
+    "draw": "`update_viewer` returned -> canvas drawn",
+    "total": "camera (or drain, if the camera time is unknown) -> canvas drawn",
+}
+# columns of each row of `LatencyMonitor.rows` (and of the exported CSV)
+COLUMNS: Tuple[str, ...] = ("time", "channel", *STAGES, "interval")
+
+
+def frame_timestamp(md: Metadata) -> Optional[float]:
+    """Return when the core received the frame, on the `time.perf_counter` clock.
+
+    Uses the "TimeReceivedByCore" tag that the circular buffer adds to every
+    frame. Returns None if the tag is missing or can't be parsed.
+    """
+    value = md.get("TimeReceivedByCore", "")
+    try:
+        received = datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+    return received - (time.time() - time.perf_counter())
+
+
+class _FrameTiming:
+    """`time.perf_counter` times of one displayed frame, filled in stage by stage."""
+
+    __slots__ = (
+        "channel",
+        "camera",
+        "drained",
+        "emitted",
+        "update_start",
+        "layer_end",
+        "update_end",
+    )
+
+    def __init__(
+        self, channel: int, camera: Optional[float], drained: float, emitted: float
+    ) -> None:
+        self.channel = channel
+        self.camera = camera
+        self.drained = drained
+        self.emitted = emitted
+        self.update_start = self.layer_end = self.update_end = math.nan
+
+    def row(self, drawn: float, interval: float) -> Tuple[float, ...]:
+        camera = (self.drained - self.camera) if self.camera is not None else math.nan
+        first = self.drained if self.camera is None else self.camera
+        stages = (
+            camera,
+            self.emitted - self.drained,
+            self.update_start - self.emitted,
+            self.layer_end - self.update_start,
+            self.update_end - self.layer_end,
+            drawn - self.update_end,
+            drawn - first,
+        )
+        return (time.time(), self.channel, *(s * 1000 for s in stages), interval)
+
+
+class LatencyMonitor:
+    """Collect the latency of every stage of each displayed live frame.
+
+    The frame pump calls `frame_emitted` on its reader thread when it hands a
+    frame to the GUI.  On the main thread, `begin_update`, `mark_layer` and
+    `end_update` bracket `update_viewer`, and `frame_drawn` is connected to the
+    canvas draw event.  Each frame that made it to the screen becomes one row of
+    `rows`, with the columns in `COLUMNS`: the wall time at which it was drawn,
+    its camera channel, the duration of each of the `STAGES` and the time since
+    the previous drawn frame (`interval`), all in ms.  Calls made when no frame is
+    in flight (e.g. snaps, or the monitor isn't attached to the pump) are no-ops.
+
+    Parameters
+    ----------
+    max_frames : int
+        Number of most recent frames kept, by default 10000.
+    """
+
+    def __init__(self, max_frames: int = 10_000) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: Dict[int, _FrameTiming] = {}
+        self._current: Optional[_FrameTiming] = None
+        self._awaiting_draw: List[_FrameTiming] = []
+        self._last_drawn = math.nan
+        self.rows: Deque[Tuple[float, ...]] = deque(maxlen=max_frames)
+
+    def reset(self) -> None:
+        """Forget every collected frame."""
+        with self._lock:
+            self._in_flight.clear()
+        self._current = None
+        self._awaiting_draw.clear()
+        self._last_drawn = math.nan
+        self.rows.clear()
+
+    def frame_emitted(
+        self, channel: int, drained: float, camera: Optional[float] = None
+    ) -> None:
+        """Start timing a frame of `channel` handed to the GUI (reader thread)."""
+        timing = _FrameTiming(channel, camera, drained, time.perf_counter())
+        with self._lock:
+            self._in_flight[channel] = timing
+
+    def begin_update(self, channel: int) -> None:
+        """Mark the start of `update_viewer` for the frame of `channel`."""
+        with self._lock:
+            self._current = self._in_flight.pop(channel, None)
+        if self._current is not None:
+            self._current.update_start = time.perf_counter()
+
+    def mark_layer(self) -> None:
+        """Mark the end of the preview layer update of the current frame."""
+        if self._current is not None:
+            self._current.layer_end = time.perf_counter()
+
+    def end_update(self) -> None:
+        """Mark the end of `update_viewer` for the current frame."""
+        if self._current is not None:
+            self._current.update_end = time.perf_counter()
+            self._awaiting_draw.append(self._current)
+            self._current = None
+
+    def frame_drawn(self, event=None) -> None:
+        """Record every updated frame as drawn (connect to the canvas draw event)."""
+        if not self._awaiting_draw:
+            return
+        now = time.perf_counter()
+        interval = (now - self._last_drawn) * 1000
+        self._last_drawn = now
+        for timing in self._awaiting_draw:
+            self.rows.append(timing.row(now, interval))
+        self._awaiting_draw.clear()
+
+    def values(self, column: str) -> np.ndarray:
+        """Return the finite values of `column` (one of `COLUMNS`)."""
+        if not self.rows:
+            return np.empty(0)
+        values = np.asarray(self.rows, dtype=float)[:, COLUMNS.index(column)]
+        return values[np.isfinite(values)]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return count, mean, p50, p95, max and jitter (std) of each stage.
+
+        The "interval" entry describes the time between two drawn frames, its
+        jitter is the display jitter.
+        """
+        out: Dict[str, Dict[str, float]] = {}
+        for column in (*STAGES, "interval"):
+            v = self.values(column)
+            if not v.size:
+                nan = dict.fromkeys(("mean", "p50", "p95", "max", "jitter"), math.nan)
+                out[column] = {"n": 0, **nan}
+                continue
+            p50, p95 = np.percentile(v, (50, 95))
+            out[column] = {
+                "n": v.size,
+                "mean": float(v.mean()),
+                "p50": float(p50),
+                "p95": float(p95),
+                "max": float(v.max()),
+                "jitter": float(v.std()),
+            }
+        return out
+
+    def histogram(self, column: str, bins: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the `np.histogram` (counts, bin edges) of `column`."""
+        return np.histogram(self.values(column), bins=bins)
+
+    def to_csv(self, path: Union[str, Path]) -> None:
+        """Write every collected frame to `path`, one row per frame."""
+        rows = list(self.rows)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            writer.writerows(rows)
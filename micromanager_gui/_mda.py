@@ -2,22 +2,75 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Union
+from typing import TYPE_CHECKING, Optional, Tuple, Union
 
 from typing_extensions import Literal
 from useq import MDASequence
 
+if TYPE_CHECKING:
+    from numcodecs.abc import Codec
+
 __all__ = [
     "SequenceMeta",
     "SEQUENCE_META",
+    "COMPRESSIONS",
+    "FILE_FORMATS",
+    "OVERFLOW_POLICIES",
+    "get_compressor",
 ]
 
+Compression = Literal["none", "blosc-lz4", "zstd", "deflate"]
+COMPRESSIONS: Tuple[str, ...] = ("none", "blosc-lz4", "zstd", "deflate")
+# the built-in formats of `micromanager_gui._writers.WRITERS`
+FileFormat = Literal["tif", "ome-tif", "bigtiff", "zarr", "ome-zarr", "raw"]
+FILE_FORMATS: Tuple[str, ...] = ("tif", "ome-tif", "bigtiff", "zarr", "ome-zarr", "raw")
+OverflowPolicy = Literal["block", "drop", "spill"]
+OVERFLOW_POLICIES: Tuple[str, ...] = ("block", "drop", "spill")
+
 
 @dataclass
 class SequenceMeta:
     """Metadata associated with an MDA sequence.
 
     TODO: much of this may well move to useq-schema.
+
+    `chunk_tile` and `store_compression` configure the temporary zarr stores the
+    MDA is written to.  By default every chunk holds exactly one (uncompressed)
+    2D plane, so that writing a frame never has to read back and rewrite a chunk
+    shared with other frames.  `chunk_tile` splits each plane into (y, x) tiles
+    instead.
+
+    `file_format` is the name of a writer of `micromanager_gui._writers.WRITERS`
+    and `compression` one of its codecs, used for the saved files.  With a
+    "zarr" or "ome-zarr" `file_format`, a saved MDA is written directly into
+    ``<save_dir>/<file_name>_NNN.zarr`` while it is acquired (compressed with
+    `compression`), instead of into a temporary store that is copied to files of
+    that format at the end.
+
+    With `multiscale` (off by default), big images are also stored as 2x
+    downsampled levels that are displayed when zooming out (see
+    `micromanager_gui._pyramid`).  The levels are computed and written with
+    each frame on the writer thread, which slows writing down (see
+    benchmarks/bench_mda_throughput.py).
+
+    The time axis of the stores grows `t_block` time points at a time as frames
+    arrive (see `micromanager_gui._mda_store.GrowingStore`).
+
+    At most `buffer_size` frames wait in memory to be written; `overflow` sets
+    what happens to frames arriving when the buffer is full: "block" the
+    acquisition, "drop" them if they are only displayed (not saved), or "spill"
+    them to temporary files (see `micromanager_gui._mda_writer.FrameWriter`).
+
+    With `incremental` (off by default), an MDA saved to uncompressed files of
+    a format that supports it (e.g. "tif") is written to them frame by frame
+    while it's acquired (see `micromanager_gui._saving.open_mda_files`).  The
+    files are full size from the start: if the MDA is aborted, the frames that
+    were not acquired stay empty.  Otherwise, or for
+    MDAs that run until stopped, the files are saved once the MDA is done; up to
+    `save_workers` of them are written in parallel.
+
+    With `mosaic`, a saved explorer scan is also stitched into one OME-Zarr
+    canvas per channel (see `micromanager_gui._saving.save_mosaic`).
     """
 
     mode: Union[Literal["mda"], Literal["explorer"], Literal[""]] = ""
@@ -26,6 +79,77 @@ class SequenceMeta:
     file_name: str = ""
     save_dir: str = ""
     save_pos: bool = False
+    file_format: FileFormat = "tif"
+    multiscale: bool = False
+    t_block: int = 64
+    chunk_tile: Optional[Tuple[int, int]] = None
+    compression: Compression = "none"
+    store_compression: Compression = "none"
+    buffer_size: int = 64
+    overflow: OverflowPolicy = "block"
+    save_workers: int = 4
+    mosaic: bool = False
+    incremental: bool = False
+
+    @property
+    def saves_in_place(self) -> bool:
+        """Whether the MDA is acquired directly into its destination zarr."""
+        from ._writers import get_writer
+
+        return (
+            self.should_save
+            and self.mode == "mda"
+            and get_writer(self.file_format).in_place
+        )
+
+    @property
+    def saves_incrementally(self) -> bool:
+        """Whether the MDA is written to its (uncompressed) files as it's acquired."""
+        from ._writers import get_writer
+
+        return (
+            self.incremental
+            and self.should_save
+            and self.mode == "mda"
+            and self.compression == "none"
+            and get_writer(self.file_format).create is not None
+        )
+
+    def chunks(self, shape: Tuple[int, ...]) -> Tuple[int, ...]:
+        """Return the zarr chunk shape for an array of `shape` (..., y, x)."""
+        *lead, y, x = shape
+        if self.chunk_tile is not None:
+            ty, tx = self.chunk_tile
+            if ty <= 0 or tx <= 0:
+                raise ValueError(f"invalid chunk tile: {self.chunk_tile}")
+            y, x = min(ty, y), min(tx, x)
+        return (1,) * len(lead) + (y, x)
+
+    def compressor(self) -> Optional[Codec]:
+        """Return the zarr compressor for `compression` (None if uncompressed)."""
+        return get_compressor(self.compression)
+
+    def store_compressor(self) -> Optional[Codec]:
+        """Return the zarr compressor for `store_compression` (None if uncompressed)."""
+        return get_compressor(self.store_compression)
+
+
+def get_compressor(compression: str) -> Optional[Codec]:
+    """Return the zarr compressor named `compression` (None for "none")."""
+    if compression == "none":
+        return None
+
+    from numcodecs import Blosc, Zlib, Zstd
+
+    if compression == "blosc-lz4":
+        return Blosc(cname="lz4", clevel=5, shuffle=Blosc.BITSHUFFLE)
+    if compression == "zstd":
+        return Zstd(level=1)
+    if compression == "deflate":
+        return Zlib(level=1)
+    raise ValueError(
+        f"unknown compression {compression!r}, must be one of {COMPRESSIONS}"
+    )
 
 
 SEQUENCE_META: dict[MDASequence, SequenceMeta] = {}
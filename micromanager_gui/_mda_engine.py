@@ -0,0 +1,114 @@
+"""MDA engine emitting one frame per camera channel."""
+from __future__ import annotations
+
+import itertools
+from typing import TYPE_CHECKING, Iterator
+
+from loguru import logger
+from pymmcore_plus.mda import MDAEngine
+
+if TYPE_CHECKING:
+    from useq import MDAEvent, MDASequence
+
+__all__ = [
+    "CAMERA_INDEX_KEY",
+    "CAMERA_KEY",
+    "UNTIL_STOPPED_KEY",
+    "MultiCameraMDAEngine",
+    "camera_event",
+    "is_until_stopped",
+    "iter_events",
+]
+
+# keys added to `MDAEvent.metadata` of frames coming from a multi-channel camera
+CAMERA_KEY = "camera"
+CAMERA_INDEX_KEY = "camera_index"
+# `MDASequence.metadata` key: repeat the time plan until the MDA is canceled
+UNTIL_STOPPED_KEY = "until_stopped"
+
+
+class MultiCameraMDAEngine(MDAEngine):
+    """`MDAEngine` that doesn't discard the extra channels of multi-channel cameras.
+
+    The default engine only emits `getImage()` (camera channel 0) after each snap.
+    With a multi-channel camera (e.g. the Utilities "Multi Camera" device), this
+    engine reads every camera channel right after the snap and emits `frameReady`
+    once per channel, with the channel name and index stored in the event metadata
+    under `CAMERA_KEY` and `CAMERA_INDEX_KEY`.  With a single camera it behaves
+    exactly like `MDAEngine`.
+
+    Sequences flagged with `UNTIL_STOPPED_KEY` run until canceled (see
+    `iter_events`).
+    """
+
+    def run(self, sequence: MDASequence) -> None:
+        """Run the multi-dimensional acquistion defined by `sequence`.
+
+        Same as `MDAEngine.run` (which has no per-frame hook to override), except
+        for the events iterated and the frames emitted after each snap.
+        """
+        self._prepare_to_run(sequence)
+
+        for event in iter_events(sequence):
+            cancelled = self._wait_until_event(event, sequence)
+            if cancelled:
+                break
+
+            logger.info(event)
+            self._prep_hardware(event)
+            self._mmc.snapImage()
+
+            n_channels = self._mmc.getNumberOfCameraChannels()
+            if n_channels <= 1:
+                self._events.frameReady.emit(self._mmc.getImage(), event)
+                continue
+
+            # pull every channel out of the core before emitting anything
+            images = [self._mmc.getImage(i) for i in range(n_channels)]
+            names = self._mmc.getCameraChannelNames()
+            for i, (name, img) in enumerate(zip(names, images)):
+                self._events.frameReady.emit(img, camera_event(event, name, i))
+
+        self._finish_run(sequence)
+
+
+def camera_event(event: MDAEvent, camera: str, index: int) -> MDAEvent:
+    """Return a copy of `event` tagged with the camera channel it was acquired on."""
+    metadata = {**event.metadata, CAMERA_KEY: camera, CAMERA_INDEX_KEY: index}
+    return event.copy(update={"metadata": metadata})
+
+
+def is_until_stopped(sequence: MDASequence) -> bool:
+    """Return whether `sequence` runs until it is canceled."""
+    return bool(sequence.metadata.get(UNTIL_STOPPED_KEY)) and bool(sequence.time_plan)
+
+
+def iter_events(sequence: MDASequence) -> Iterator[MDAEvent]:
+    """Iterate over the events of `sequence`, endlessly if it runs until stopped.
+
+    A sequence with ``metadata[UNTIL_STOPPED_KEY]`` set repeats its time plan
+    until the MDA is canceled: each repetition continues the time index and the
+    start times where the previous one ended, one interval after its last time
+    point.
+    """
+    if not is_until_stopped(sequence):
+        yield from sequence
+        return
+
+    deltas = [td.total_seconds() for td in sequence.time_plan.deltas()]
+    n_t = len(deltas)
+    interval = getattr(sequence.time_plan, "interval", None)
+    if interval is not None:
+        step = interval.total_seconds()
+    else:
+        step = deltas[-1] - deltas[-2] if n_t > 1 else 0
+    period = deltas[-1] + step
+
+    for rep in itertools.count():
+        for event in sequence:
+            if rep == 0:
+                yield event
+                continue
+            index = {**event.index, "t": event.index["t"] + rep * n_t}
+            start = (event.min_start_time or 0) + rep * period
+            yield event.copy(update={"index": index, "min_start_time": start})
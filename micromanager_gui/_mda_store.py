@@ -0,0 +1,133 @@
+"""MDA stores whose time axis grows while acquiring."""
+from __future__ import annotations
+
+import threading
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+__all__ = ["GrowingStore", "LockedArray"]
+
+
+class LockedArray:
+    """Read-only view of `array` that reads while holding `lock`.
+
+    Used to display the levels of a `GrowingStore` while they are resized on
+    another thread: a read never sees the array halfway through a resize.
+    Other attributes (e.g. ``chunks``) are those of `array`.
+    """
+
+    def __init__(self, array: Any, lock: threading.RLock) -> None:
+        self.array = array
+        self.lock = lock
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Shape of `array`."""
+        return tuple(self.array.shape)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Data type of `array`."""
+        return self.array.dtype
+
+    @property
+    def ndim(self) -> int:
+        """Number of dimensions of `array`."""
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        """Number of elements of `array`."""
+        return int(np.prod(self.shape))
+
+    def __getattr__(self, name: str) -> Any:
+        """Return the attribute `name` of `array`."""
+        if name == "array" or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.array, name)
+
+    def __len__(self) -> int:
+        """Length of the first axis of `array`."""
+        return self.shape[0]
+
+    def __getitem__(self, key: Any) -> Any:
+        """Return ``array[key]``."""
+        with self.lock:
+            return self.array[key]
+
+    def __array__(self, dtype: Any = None) -> np.ndarray:
+        """Return the whole array."""
+        return np.asarray(self[...], dtype=dtype)
+
+
+class GrowingStore:
+    """Store of an MDA layer whose time axis grows in blocks as frames arrive.
+
+    Instead of allocating every time point of the sequence up front, the arrays
+    start with `block` time points and grow by `block` whenever a frame beyond
+    the current end is written (resizing a zarr array only rewrites its
+    metadata).  `trim` shrinks them to the time points actually acquired, e.g.
+    after an open-ended or canceled acquisition.
+
+    Frames are written (and the arrays resized) on the writer thread while the
+    viewer reads them on the main thread: resizing holds `lock`, and `views`
+    are the levels to display, which read under the same lock.
+
+    Parameters
+    ----------
+    store : Any
+        Where the frames are written: a zarr array or a `Pyramid` of them.
+    axis : int
+        Index of the time axis.
+    block : int
+        Number of time points added at once.
+    max_size : Optional[int]
+        Final size of the time axis, or None for open-ended acquisitions.
+    """
+
+    def __init__(
+        self, store: Any, axis: int, block: int, max_size: Optional[int] = None
+    ) -> None:
+        if block < 1:
+            raise ValueError("block must be at least 1")
+        self.store = store
+        self.levels: List[Any] = list(getattr(store, "levels", [store]))
+        self.lock = threading.RLock()
+        self.views = [LockedArray(level, self.lock) for level in self.levels]
+        self.axis = axis
+        self.block = block
+        self.max_size = max_size
+        # number of time points written so far
+        self.size = 0
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Current shape of the full resolution array."""
+        return tuple(self.levels[0].shape)
+
+    def __setitem__(self, index: tuple, image: np.ndarray) -> None:
+        """Write `image` at `index`, growing the time axis if needed."""
+        if not isinstance(index, tuple):
+            index = (index,)
+        t = index[self.axis]
+        if t >= self.shape[self.axis]:
+            if self.max_size is not None and t >= self.max_size:
+                raise IndexError(f"time point {t} beyond the end ({self.max_size})")
+            n = (t // self.block + 1) * self.block
+            self.resize(n if self.max_size is None else min(n, self.max_size))
+        self.store[index] = image
+        self.size = max(self.size, t + 1)
+
+    def resize(self, n: int) -> None:
+        """Set the length of the time axis of every level to `n`."""
+        with self.lock:
+            for level in self.levels:
+                shape = list(level.shape)
+                shape[self.axis] = n
+                level.resize(*shape)
+
+    def trim(self) -> None:
+        """Drop the time points allocated after the last written one."""
+        if 0 < self.size < self.shape[self.axis]:
+            self.resize(self.size)
@@ -0,0 +1,274 @@
+"""Write MDA frames to their stores off the GUI thread."""
+from __future__ import annotations
+
+import contextlib
+import os
+import queue
+import tempfile
+import threading
+import time
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+from qtpy.QtCore import QObject, Signal
+
+from ._mda import OVERFLOW_POLICIES, OverflowPolicy
+
+__all__ = ["FrameWriter", "WriterStats"]
+
+
+class WriterStats(NamedTuple):
+    """Snapshot of the state of a `FrameWriter`."""
+
+    buffered: int  # frames held in memory, waiting to be written
+    capacity: int  # maximum number of frames held in memory
+    spilled: int  # frames waiting on disk (spill policy)
+    written: int
+    dropped: int
+    failed: int = 0  # frames that couldn't be written to their store
+
+    @property
+    def fill(self) -> float:
+        """Fraction of the memory buffer in use (0 to 1)."""
+        return min(1.0, self.buffered / self.capacity) if self.capacity else 0.0
+
+
+class _Spilled(NamedTuple):
+    path: str
+
+
+class FrameWriter(QObject):
+    """Write frames into array-like stores (e.g. zarr) on a writer thread.
+
+    `put` is called on the thread producing the frames (the MDA thread) and only
+    queues the frame; a single writer thread performs ``array[index] = image``.
+
+    At most `max_queue` frames are held in memory.  When the writer can't keep
+    up and the buffer is full, `policy` decides what happens to a new frame:
+
+    - "block": `put` waits for a free slot, slowing the acquisition down.
+    - "drop": the frame is discarded (and counted in `frames_dropped`), if it
+      was put with ``droppable=True``; other frames block.
+    - "spill": the frame is saved to a temporary file and queued from there, so
+      neither memory nor the acquisition are held up, at the cost of disk I/O.
+
+    The GUI is not told about every frame: `frameWritten` carries the `tag` of
+    the most recently written frame and is emitted at most `max_fps` times per
+    second.  The last frame is always reported, at most ``1 / max_fps`` seconds
+    after it was written.  `statsUpdated` carries a `WriterStats` and is
+    throttled the same way.
+
+    A frame that can't be written (the store, or reading a spilled frame back,
+    raises) is counted in `frames_failed` and the first error is kept in
+    `error`; the next frames are still written.
+
+    Parameters
+    ----------
+    max_queue : int
+        Maximum number of frames held in memory, by default 64.
+    max_fps : float
+        Maximum rate at which `frameWritten` is emitted, by default 20.
+    policy : OverflowPolicy
+        What to do with frames that don't fit in memory, by default "block".
+    """
+
+    frameWritten = Signal(object)
+    statsUpdated = Signal(object)
+
+    def __init__(
+        self,
+        max_queue: int = 64,
+        max_fps: float = 20.0,
+        policy: OverflowPolicy = "block",
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        if max_fps <= 0:
+            raise ValueError("max_fps must be greater than 0")
+        self._interval = 1 / max_fps
+        self.configure(max_queue, policy)
+        # the memory bound is enforced by `put`, spilled frames don't count
+        self._queue: queue.Queue = queue.Queue()
+        self._slots = threading.Condition()
+        self._buffered = 0
+        self._spilled = 0
+        self._spill_dir: Optional[tempfile.TemporaryDirectory] = None
+        self._last_stats = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.frames_spilled = 0
+        self.frames_failed = 0
+        # the first error raised by writing a frame, see `frames_failed`
+        self.error: Optional[Exception] = None
+
+    def configure(self, max_queue: int, policy: OverflowPolicy) -> None:
+        """Set the size of the memory buffer and the overflow policy."""
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"unknown overflow policy {policy!r}, "
+                f"must be one of {OVERFLOW_POLICIES}"
+            )
+        self.max_queue = max_queue
+        self.policy = policy
+
+    @property
+    def stats(self) -> WriterStats:
+        """Current buffer fill level and frame counts."""
+        return WriterStats(
+            self._buffered,
+            self.max_queue,
+            self._spilled,
+            self.frames_written,
+            self.frames_dropped,
+            self.frames_failed,
+        )
+
+    def reset_stats(self) -> None:
+        """Reset the frame counters (e.g. when a new acquisition starts)."""
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.frames_spilled = 0
+        self.frames_failed = 0
+        self.error = None
+
+    def is_running(self) -> bool:
+        """Return whether the writer thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the writer thread (no-op if already running)."""
+        if self.is_running():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="FrameWriter", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write all queued frames and stop the writer thread."""
+        if not self.is_running():
+            return
+        self._queue.put(None)
+        self._thread.join()  # type: ignore
+        self._thread = None
+        if self._spill_dir is not None:
+            self._spill_dir.cleanup()
+            self._spill_dir = None
+
+    def put(
+        self,
+        array: Any,
+        index: tuple,
+        image: np.ndarray,
+        tag: Any = None,
+        droppable: bool = False,
+    ) -> bool:
+        """Queue ``array[index] = image``, handling a full buffer per `policy`.
+
+        Returns False if the frame was dropped.
+        """
+        self.start()
+        dropped = False
+        with self._slots:
+            overflow = self._buffered >= self.max_queue and (
+                self.policy == "spill" or (self.policy == "drop" and droppable)
+            )
+            if not overflow:
+                while self._buffered >= self.max_queue:
+                    self._slots.wait()
+                self._buffered += 1
+            elif self.policy == "drop":
+                self.frames_dropped += 1
+                dropped = True
+            else:
+                self._spilled += 1
+                self.frames_spilled += 1
+
+        if dropped:
+            self._emit_stats()
+            return False
+        item = self._spill(image) if overflow else image
+        self._queue.put((array, index, item, tag))
+        self._emit_stats()
+        return True
+
+    def flush(self) -> None:
+        """Block until every queued frame has been written."""
+        if self.is_running():
+            self._queue.join()
+        self._emit_stats(force=True)
+
+    def _spill(self, image: np.ndarray) -> _Spilled:
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.TemporaryDirectory(prefix="mda_spill_")
+        fd, path = tempfile.mkstemp(suffix=".npy", dir=self._spill_dir.name)
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, image)
+        return _Spilled(path)
+
+    def _emit_stats(self, force: bool = False) -> None:
+        now = time.perf_counter()
+        if force or now - self._last_stats >= self._interval:
+            self._last_stats = now
+            self.statsUpdated.emit(self.stats)
+
+    def _release(self, item: Any) -> Any:
+        """Return the image of a queued `item`, freeing its buffer slot."""
+        if isinstance(item, _Spilled):
+            try:
+                return np.load(item.path)
+            finally:
+                with contextlib.suppress(OSError):
+                    os.remove(item.path)
+                with self._slots:
+                    self._spilled -= 1
+        with self._slots:
+            self._buffered -= 1
+            self._slots.notify()
+        return item
+
+    def _run(self) -> None:
+        latest: Any = None
+        pending = False  # whether `latest` hasn't been emitted yet
+        last_emit = 0.0
+        while True:
+            try:
+                item = self._queue.get(timeout=self._interval if pending else None)
+            except queue.Empty:
+                # nothing new for a while: report the last frame
+                self.frameWritten.emit(latest)
+                self._emit_stats(force=True)
+                pending = False
+                last_emit = time.perf_counter()
+                continue
+
+            try:
+                if item is None:
+                    break
+                array, index, image, tag = item
+                try:
+                    array[index] = self._release(image)
+                except Exception as e:
+                    # keep writing the next frames, the MDA decides what to do
+                    self.frames_failed += 1
+                    if self.error is None:
+                        self.error = e
+                    self._emit_stats(force=True)
+                    continue
+                self.frames_written += 1
+                latest, pending = tag, True
+                now = time.perf_counter()
+                if now - last_emit >= self._interval:
+                    self.frameWritten.emit(latest)
+                    self._emit_stats()
+                    pending = False
+                    last_emit = now
+            finally:
+                self._queue.task_done()
+
+        if pending:
+            self.frameWritten.emit(latest)
+        self._emit_stats(force=True)
@@ -0,0 +1,187 @@
+"""Stitch explorer scan tiles into one canvas, blending where they overlap."""
+from __future__ import annotations
+
+import os
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import zarr
+
+from ._pyramid import downsample, pyramid_shapes
+
+__all__ = ["Mosaic", "TileCanvas"]
+
+# canvases (all levels and tiles) larger than this many bytes are kept on disk
+CANVAS_IN_MEMORY = 256 * 2**20
+# edge of the chunks of the canvases kept on disk
+CANVAS_CHUNK = 1024
+
+
+def _feather(height: int, width: int) -> np.ndarray:
+    """Return blending weights for a tile, growing linearly from its edges."""
+    wy = np.minimum(np.arange(1, height + 1), np.arange(height, 0, -1))
+    wx = np.minimum(np.arange(1, width + 1), np.arange(width, 0, -1))
+    return np.minimum.outer(wy, wx).astype(np.float32)
+
+
+class Mosaic:
+    """Tiles of one channel placed on a common canvas.
+
+    Where tiles overlap, pixels are the average of the tiles weighted by the
+    distance to each tile's edge ("feathering"), which hides the seams between
+    tiles.  Nothing is stitched up front: `render` composes any region of the
+    canvas from the tiles that cover it, so a mosaic much larger than memory
+    can be written block by block (see `blocks`).
+
+    Parameters
+    ----------
+    tiles : Sequence[Any]
+        2D array-likes of the same shape.
+    origins : Sequence[Tuple[float, float]]
+        (y, x) position in pixels of the top left corner of each tile (e.g. the
+        `TileCanvas.origins` of an explorer scan).  They are rounded to whole
+        pixels and shifted so that the canvas starts at (0, 0).
+    """
+
+    def __init__(
+        self, tiles: Sequence[Any], origins: Sequence[Tuple[float, float]]
+    ) -> None:
+        if not len(tiles) or len(tiles) != len(origins):
+            raise ValueError("a mosaic needs one origin for each of its tiles")
+        self.tiles = list(tiles)
+        self.tile_shape: Tuple[int, int] = tuple(tiles[0].shape[-2:])  # type: ignore
+        self.dtype = np.dtype(tiles[0].dtype)
+        _origins = np.round(np.asarray(origins, dtype=float)).astype(int)
+        self.origins = _origins - _origins.min(axis=0)
+        self.shape: Tuple[int, int] = tuple(  # type: ignore
+            int(n) for n in (self.origins + self.tile_shape).max(axis=0)
+        )
+        self._weight = _feather(*self.tile_shape)
+
+    def render(self, y: int, x: int, height: int, width: int) -> np.ndarray:
+        """Return the (height, width) region of the canvas starting at (y, x).
+
+        The region is clipped to the canvas; pixels no tile covers are 0.
+        """
+        y1, x1 = min(y + height, self.shape[0]), min(x + width, self.shape[1])
+        th, tw = self.tile_shape
+        oy, ox = self.origins.T
+        hits = np.flatnonzero((oy < y1) & (oy + th > y) & (ox < x1) & (ox + tw > x))
+
+        total = np.zeros((y1 - y, x1 - x), dtype=np.float32)
+        weights = np.zeros_like(total)
+        for i in hits:
+            ty, tx = self.origins[i]
+            # the part of the tile inside the region, in canvas coordinates
+            sy0, sy1 = max(y, ty), min(y1, ty + th)
+            sx0, sx1 = max(x, tx), min(x1, tx + tw)
+            tile_region = (slice(sy0 - ty, sy1 - ty), slice(sx0 - tx, sx1 - tx))
+            out_region = (slice(sy0 - y, sy1 - y), slice(sx0 - x, sx1 - x))
+            weight = self._weight[tile_region]
+            total[out_region] += np.asarray(self.tiles[i][tile_region]) * weight
+            weights[out_region] += weight
+
+        np.divide(total, weights, out=total, where=weights > 0)
+        if self.dtype.kind in "ui":
+            np.rint(total, out=total)
+        return total.astype(self.dtype)
+
+    def blocks(self, size: int) -> Iterator[Tuple[int, int]]:
+        """Yield the (y, x) origin of every `size` x `size` block of the canvas."""
+        for y in range(0, self.shape[0], size):
+            for x in range(0, self.shape[1], size):
+                yield y, x
+
+
+class TileCanvas:
+    """Canvas the tiles of one channel of an explorer scan are pasted into.
+
+    A canvas shows every tile of a channel in one napari layer (multiscale if
+    large), whatever the size of the scan.  Tiles are pasted at their position
+    as they are acquired, the last one on top where they overlap, into every
+    level of a 2x pyramid (see `pyramid_shapes`).  The tiles themselves are kept
+    in `tiles` (n_tiles, y, x), for saving them (see `Mosaic` for a blended
+    canvas).
+
+    Parameters
+    ----------
+    origins : Sequence[Tuple[float, float]]
+        (y, x) position in pixels of the top left corner of each tile, rounded
+        to whole pixels.
+    tile_shape : Tuple[int, int]
+        (y, x) shape of the tiles.
+    dtype : Any
+        Data type of the tiles.
+    directory : Optional[str]
+        If the canvas is larger than `CANVAS_IN_MEMORY`, its arrays are zarr
+        arrays created in `directory` rather than in memory.
+    """
+
+    def __init__(
+        self,
+        origins: Sequence[Tuple[float, float]],
+        tile_shape: Tuple[int, int],
+        dtype: Any,
+        directory: Optional[str] = None,
+    ) -> None:
+        if not len(origins):
+            raise ValueError("a canvas needs at least one tile")
+        _origins = np.round(np.asarray(origins, dtype=float)).astype(int)
+        # position of the top left corner of the canvas, i.e. its layer `translate`
+        self.offset: Tuple[int, int] = tuple(  # type: ignore
+            int(n) for n in _origins.min(axis=0)
+        )
+        self.origins = _origins - self.offset
+        self.tile_shape: Tuple[int, int] = tuple(tile_shape)  # type: ignore
+        self.dtype = np.dtype(dtype)
+        shape = tuple(int(n) for n in (self.origins + self.tile_shape).max(axis=0))
+        shapes = pyramid_shapes(shape)
+        tiles_shape = (len(self.origins), *self.tile_shape)
+
+        nbytes = sum(int(np.prod(s)) for s in [*shapes, tiles_shape])
+        if directory is None or nbytes * self.dtype.itemsize <= CANVAS_IN_MEMORY:
+            self.levels: List[Any] = [np.zeros(s, self.dtype) for s in shapes]
+            self.tiles: Any = np.zeros(tiles_shape, self.dtype)
+        else:
+            self.levels = [
+                zarr.open(
+                    os.path.join(directory, str(n)),
+                    mode="w",
+                    shape=s,
+                    dtype=self.dtype,
+                    chunks=(CANVAS_CHUNK, CANVAS_CHUNK),
+                )
+                for n, s in enumerate(shapes)
+            ]
+            self.tiles = zarr.open(
+                os.path.join(directory, "tiles"),
+                mode="w",
+                shape=tiles_shape,
+                dtype=self.dtype,
+                chunks=(1, *self.tile_shape),
+            )
+        # whether each tile was pasted
+        self.acquired = np.zeros(len(self.origins), dtype=bool)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Shape of the full resolution canvas."""
+        return tuple(self.levels[0].shape)  # type: ignore
+
+    def add(self, index: int, image: np.ndarray) -> None:
+        """Paste `image` as the tile `index`, in every level of the canvas."""
+        self.tiles[index] = image
+        y, x = self.origins[index]
+        for n, level in enumerate(self.levels):
+            if n:
+                image = downsample(image)
+                y, x = y // 2, x // 2
+            # binned tiles can stick out of the binned canvas by a pixel
+            h = min(image.shape[0], level.shape[0] - y)
+            w = min(image.shape[1], level.shape[1] - x)
+            level[y : y + h, x : x + w] = image[:h, :w]
+        self.acquired[index] = True
+
+    def __setitem__(self, index: int, image: np.ndarray) -> None:
+        """Same as `add`, so that tiles can be queued to a `FrameWriter`."""
+        self.add(index, image)
@@ -0,0 +1,85 @@
+"""Multiscale (2x downsampled) copies of MDA stores, for zoomed-out display."""
+from __future__ import annotations
+
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+
+__all__ = ["Pyramid", "pyramid_shapes", "downsample"]
+
+# levels are added until the largest plane edge is at most this size
+MIN_LEVEL_SIZE = 512
+
+
+def pyramid_shapes(
+    shape: Sequence[int], min_size: int = MIN_LEVEL_SIZE
+) -> List[Tuple[int, ...]]:
+    """Return the shape of each level of a 2x pyramid of `shape` (..., y, x).
+
+    The first shape is `shape` itself; each following level halves y and x
+    until neither is larger than `min_size`.  Small images get a single level.
+    """
+    shapes = [tuple(shape)]
+    while max(shapes[-1][-2:]) > min_size and min(shapes[-1][-2:]) >= 2:
+        *lead, y, x = shapes[-1]
+        shapes.append((*lead, y // 2, x // 2))
+    return shapes
+
+
+def downsample(image: np.ndarray) -> np.ndarray:
+    """Return `image` binned 2x2 (mean) along its last two axes.
+
+    An odd last row or column is dropped.
+    """
+    h = image.shape[-2] // 2 * 2
+    w = image.shape[-1] // 2 * 2
+    if image.dtype.kind in "ui" and image.dtype.itemsize <= 2:
+        # sum in 32 bit to avoid overflowing, in place to limit temporaries,
+        # then round to the nearest integer
+        acc = np.int32 if image.dtype.kind == "i" else np.uint32
+        rows = image[..., 0:h:2, :w].astype(acc)
+        rows += image[..., 1:h:2, :w]
+        total = rows[..., 0::2]
+        total += rows[..., 1::2]
+        total += 2
+        total >>= 2
+        return total.astype(image.dtype)
+    rows = image[..., 0:h:2, :w] + image[..., 1:h:2, :w]
+    return (rows[..., 0::2] + rows[..., 1::2]) / 4
+
+
+class Pyramid:
+    """Store of an MDA layer at full resolution plus 2x downsampled levels.
+
+    Setting a plane (``pyramid[index] = image``) writes `image` to the first level
+    and its successively binned versions to the others, so every level is up to
+    date as soon as the frame is written.  `levels` can be shown as a multiscale
+    napari layer.
+
+    Parameters
+    ----------
+    levels : Sequence
+        Array-likes (e.g. zarr arrays) of decreasing resolution, each half the
+        size of the previous one along the last two axes.
+    """
+
+    def __init__(self, levels: Sequence[Any]) -> None:
+        if not levels:
+            raise ValueError("a pyramid needs at least one level")
+        self.levels = list(levels)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Shape of the full resolution level."""
+        return tuple(self.levels[0].shape)
+
+    def __setitem__(self, index: Any, image: np.ndarray) -> None:
+        """Write `image` at `index` in every level."""
+        for n, level in enumerate(self.levels):
+            if n:
+                image = downsample(image)
+            level[index] = image
+
+    def __len__(self) -> int:
+        """Return the number of levels."""
+        return len(self.levels)
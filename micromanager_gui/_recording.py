@@ -0,0 +1,202 @@
+"""Stream live-mode frames to disk on a background thread."""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Sequence, Union
+
+import numpy as np
+import zarr
+
+if TYPE_CHECKING:
+    from numcodecs.abc import Codec
+
+__all__ = ["LiveRecorder"]
+
+# number of frames the image array grows by whenever it is full
+_GROW_BLOCK = 64
+
+
+class LiveRecorder:
+    """Write every frame handed to `put` into a chunked zarr store.
+
+    Frames are queued and written by a writer thread, one frame per chunk, so
+    the thread draining the camera never waits on the disk.  If the disk can't
+    keep up and the queue is full, frames are dropped (and counted in
+    `dropped_frames`) rather than letting the camera's circular buffer overflow.
+    If a frame can't be written, the store is finalized with the frames written
+    so far, later frames are dropped, and `stop` raises the error (also kept in
+    `error`).
+
+    The store is a zarr group with three arrays:
+
+    - ``images``: (n_frames, height, width) frames, in the order they arrived.
+    - ``timestamps``: (n_frames,) seconds since the start of the recording at
+      which each frame was drained from the circular buffer.
+    - ``camera_channels``: (n_frames,) index of the camera channel each frame
+      comes from (always 0 unless a multi-channel camera is used).  The names of
+      the camera channels, if given, are stored in the ``channel_names`` attribute.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        Where to create the zarr store. It must not already exist.
+    max_queue : int
+        Maximum number of frames waiting to be written, by default 256.
+    compressor : Optional[Codec]
+        numcodecs compressor for the image chunks, by default None (uncompressed).
+    channel_names : Sequence[str]
+        Names of the camera channels, by default empty.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_queue: int = 256,
+        compressor: Optional[Codec] = None,
+        channel_names: Sequence[str] = (),
+    ) -> None:
+        self.path = Path(path)
+        self._compressor = compressor
+        self.channel_names = list(channel_names)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._t0 = 0.0
+
+        self._group: Optional[zarr.Group] = None
+        self._images: Optional[zarr.Array] = None
+        self._timestamps: List[float] = []
+        self._channels: List[int] = []
+
+        self.frames_written = 0
+        self.bytes_written = 0
+        self.dropped_frames = 0
+        self.elapsed = 0.0
+        # why the writer thread stopped early, if it did
+        self.error: Optional[Exception] = None
+
+    @property
+    def mb_per_s(self) -> float:
+        """Sustained write throughput since `start`, in MB/s."""
+        elapsed = (
+            time.perf_counter() - self._t0 if self.is_recording() else self.elapsed
+        )
+        return self.bytes_written / elapsed / 1e6 if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        """Return a one-line summary of the recording."""
+        return (
+            f"recorded: {self.frames_written} frames | {self.mb_per_s:.1f} MB/s"
+            f" | dropped: {self.dropped_frames}"
+        )
+
+    def is_recording(self) -> bool:
+        """Return whether the writer thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Create the store and start the writer thread."""
+        if self.is_recording():
+            return
+        self._group = zarr.open_group(str(self.path), mode="w-")
+        self._t0 = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="LiveRecorder", daemon=True
+        )
+        self._thread.start()
+
+    def put(
+        self, frame: np.ndarray, timestamp: Optional[float] = None, channel: int = 0
+    ) -> bool:
+        """Queue `frame` for writing. Return False if it had to be dropped.
+
+        `timestamp` is a `time.perf_counter()` value, by default the current time.
+        `channel` is the index of the camera channel the frame comes from.
+        """
+        if self.error is not None:
+            # nothing writes them anymore
+            self.dropped_frames += 1
+            return False
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        try:
+            self._queue.put_nowait((frame, timestamp - self._t0, channel))
+        except queue.Full:
+            self.dropped_frames += 1
+            return False
+        return True
+
+    def stop(self) -> None:
+        """Write all queued frames, finalize the store and stop the writer thread.
+
+        Raises the error that stopped the writer thread early, if any.
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        # a full queue is only drained while the writer thread runs
+        while thread.is_alive():
+            try:
+                self._queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        thread.join()
+        self._thread = None
+        self.elapsed = time.perf_counter() - self._t0
+        if self.error is not None:
+            raise self.error
+
+    def _run(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                self._write(*item)
+        except Exception as e:
+            self.error = e
+        finally:
+            try:
+                self._finalize()
+            except Exception as e:
+                self.error = self.error or e
+
+    def _write(self, frame: np.ndarray, timestamp: float, channel: int) -> None:
+        if self._images is None:
+            self._images = self._group.create_dataset(  # type: ignore
+                "images",
+                shape=(_GROW_BLOCK,) + frame.shape,
+                chunks=(1,) + frame.shape,
+                dtype=frame.dtype,
+                compressor=self._compressor,
+            )
+        elif frame.shape != self._images.shape[1:]:
+            # e.g. camera ROI changed mid-recording: nothing sensible to do
+            self.dropped_frames += 1
+            return
+
+        idx = self.frames_written
+        if idx >= self._images.shape[0]:
+            self._images.resize((idx + _GROW_BLOCK,) + self._images.shape[1:])
+        self._images[idx] = frame
+        self._timestamps.append(timestamp)
+        self._channels.append(channel)
+        self.frames_written += 1
+        self.bytes_written += frame.nbytes
+
+    def _finalize(self) -> None:
+        if self._images is not None:
+            # trim the unused part of the last block
+            self._images.resize((self.frames_written,) + self._images.shape[1:])
+        self._group.array(  # type: ignore
+            "timestamps", np.asarray(self._timestamps, dtype="float64")
+        )
+        self._group.array(  # type: ignore
+            "camera_channels", np.asarray(self._channels, dtype="uint8")
+        )
+        self._group.attrs["dropped_frames"] = self.dropped_frames  # type: ignore
+        if self.channel_names:
+            self._group.attrs["channel_names"] = self.channel_names  # type: ignore
@@ -0,0 +1,399 @@
+"""Remote MMCore session passing frames through shared memory.
+
+`RemoteMMCore` sends every image (`getLastImage`, `snap`, `popNextImage`, MDA
+`frameReady`, ...) through pymmcore-plus' ndarray serializer, which creates,
+fills and unlinks a new shared-memory segment for each frame.  Here the server
+writes frames into a ring of preallocated slots of one long-lived segment
+(`SharedFrameRing`) and only a small descriptor travels over the RPC channel;
+the client maps the segment once and copies frames straight out of it
+(`SharedFrameReader`).
+
+Start a session with `SharedMemoryMMCore()`: it launches the server
+(``python -m micromanager_gui._remote``) if none is running on `port`.
+"""
+from __future__ import annotations
+
+import atexit
+import contextlib
+import subprocess
+import sys
+import time
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Tuple
+
+import numpy as np
+from pymmcore_plus import CMMCorePlus, RemoteMMCore
+from pymmcore_plus.core.events import CMMCoreSignaler
+from pymmcore_plus.remote._serialize import register_serializers
+from pymmcore_plus.remote._util import wrap_for_pyro
+from pymmcore_plus.remote.client._client import _get_auto_callback_class
+from pymmcore_plus.remote.server import CORE_NAME, DEFAULT_HOST
+from Pyro5 import api, core, errors
+
+if TYPE_CHECKING:
+    from pymmcore_plus import Metadata
+
+__all__ = [
+    "DEFAULT_PORT",
+    "SharedFrameReader",
+    "SharedFrameRing",
+    "SharedMemoryMMCore",
+    "is_frame_descriptor",
+    "serve",
+]
+
+# one above pymmcore-plus' server, so that both can run side by side
+DEFAULT_PORT = 54334
+# key identifying a frame descriptor, its value is the shared-memory segment name
+_FRAME_KEY = "__shared_frame__"
+# alignment of the slot headers and of every slot (bytes)
+_ALIGN = 64
+
+_SIGNAL_NAMES = {name for name in dir(CMMCoreSignaler) if not name.startswith("_")}
+
+
+def _aligned(nbytes: int) -> int:
+    return -(-nbytes // _ALIGN) * _ALIGN
+
+
+def is_frame_descriptor(obj: Any) -> bool:
+    """Return whether `obj` is a frame descriptor returned by `SharedFrameRing`."""
+    return isinstance(obj, dict) and _FRAME_KEY in obj
+
+
+class SharedFrameRing:
+    """Fixed ring of frame slots in a single shared-memory segment (server side).
+
+    The segment starts with one int64 header per slot, holding the sequence
+    number of the frame in the slot (-1 while it is being written), followed by
+    the slots themselves.  `write` copies a frame into the next slot and returns
+    a descriptor telling the reader where to find it.  The segment is allocated on
+    the first frame and only reallocated when a frame doesn't fit in a slot.
+
+    Parameters
+    ----------
+    n_slots : int
+        Number of slots, by default 4.  A slot is only overwritten `n_slots`
+        frames later, so the reader has that long to copy a frame out.
+    """
+
+    def __init__(self, n_slots: int = 4) -> None:
+        if n_slots < 1:
+            raise ValueError("n_slots must be at least 1")
+        self.n_slots = n_slots
+        self._shm: Optional[SharedMemory] = None
+        self._slot_bytes = 0
+        self._headers: Optional[np.ndarray] = None
+        self._seq = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the shared-memory segment."""
+        return self._shm.size if self._shm is not None else 0
+
+    def _allocate(self, nbytes: int) -> None:
+        self.close()
+        self._slot_bytes = _aligned(nbytes)
+        size = _aligned(8 * self.n_slots) + self._slot_bytes * self.n_slots
+        self._shm = SharedMemory(create=True, size=size)
+        self._headers = np.ndarray(
+            (self.n_slots,), dtype=np.int64, buffer=self._shm.buf
+        )
+        self._headers[:] = -1
+
+    def write(self, frame: np.ndarray) -> Dict[str, Any]:
+        """Copy `frame` into the next slot and return its descriptor."""
+        if self._shm is None or frame.nbytes > self._slot_bytes:
+            self._allocate(frame.nbytes)
+        assert self._shm is not None and self._headers is not None
+
+        seq = self._seq
+        slot = seq % self.n_slots
+        offset = _aligned(8 * self.n_slots) + slot * self._slot_bytes
+        self._headers[slot] = -1
+        dest = np.ndarray(
+            frame.shape, dtype=frame.dtype, buffer=self._shm.buf, offset=offset
+        )
+        dest[...] = frame
+        del dest
+        self._headers[slot] = seq
+        self._seq += 1
+        return {
+            _FRAME_KEY: self._shm.name,
+            "n_slots": self.n_slots,
+            "slot": slot,
+            "offset": offset,
+            "shape": frame.shape,
+            "dtype": frame.dtype.str,
+            "seq": seq,
+        }
+
+    def close(self) -> None:
+        """Release (and unlink) the shared-memory segment."""
+        if self._shm is None:
+            return
+        self._headers = None
+        self._shm.close()
+        with contextlib.suppress(FileNotFoundError):
+            self._shm.unlink()
+        self._shm = None
+
+
+class SharedFrameReader:
+    """Copy frames described by `SharedFrameRing` descriptors (client side).
+
+    The segment is mapped on the first frame and kept mapped until the server
+    moves to a new one.
+    """
+
+    def __init__(self) -> None:
+        self._shm: Optional[SharedMemory] = None
+
+    def _attach(self, name: str) -> SharedMemory:
+        if self._shm is None or self._shm.name != name:
+            self.close()
+            self._shm = SharedMemory(name=name)
+        return self._shm
+
+    def read(self, desc: Dict[str, Any]) -> np.ndarray:
+        """Return a copy of the frame described by `desc`.
+
+        Raises a RuntimeError if the slot was overwritten while it was copied.
+        """
+        shm = self._attach(desc[_FRAME_KEY])
+        frame = np.ndarray(
+            tuple(desc["shape"]),
+            dtype=desc["dtype"],
+            buffer=shm.buf,
+            offset=desc["offset"],
+        ).copy()
+        headers = np.ndarray((desc["n_slots"],), dtype=np.int64, buffer=shm.buf)
+        overwritten = headers[desc["slot"]] != desc["seq"]
+        del headers
+        if overwritten:
+            raise RuntimeError("frame was overwritten before it could be read")
+        return frame
+
+    def close(self) -> None:
+        """Unmap the current segment."""
+        if self._shm is not None:
+            with contextlib.suppress(BufferError):
+                self._shm.close()
+            self._shm = None
+
+
+@api.expose
+@api.behavior(instance_mode="single")
+@wrap_for_pyro
+class SharedFrameCore(CMMCorePlus):
+    """CMMCorePlus server returning frames as `SharedFrameRing` descriptors.
+
+    Mirrors pymmcore-plus' `pyroCMMCore`, plus ``*Shared`` variants of the image
+    getters.  Arrays passed to the remote callbacks (e.g. `frameReady`) are sent
+    as descriptors too.
+    """
+
+    _callback_handlers: Set[Any] = set()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._frames = SharedFrameRing()
+        atexit.register(self._frames.close)
+        for name in _SIGNAL_NAMES:
+            attr = getattr(self.events, name)
+            if hasattr(attr, "connect"):
+                attr.connect(partial(self.emit_signal, name))
+
+    def connect_remote_callback(self, handler) -> None:
+        self._callback_handlers.add(handler)
+
+    def disconnect_remote_callback(self, handler) -> None:
+        self._callback_handlers.discard(handler)
+
+    @api.oneway
+    def run_mda(self, sequence) -> None:  # pragma: no cover
+        return super().run_mda(sequence)
+
+    def emit_signal(self, signal_name: str, *args) -> None:
+        args = tuple(
+            self._frames.write(a) if isinstance(a, np.ndarray) else a for a in args
+        )
+        for handler in list(self._callback_handlers):
+            try:
+                handler._pyroClaimOwnership()
+                handler.receive_core_callback(signal_name, args)
+            except errors.CommunicationError:  # pragma: no cover
+                self.disconnect_remote_callback(handler)
+
+    def getLastImageShared(self) -> Dict[str, Any]:
+        return self._frames.write(self.getLastImage())
+
+    def getImageShared(self, *args) -> Dict[str, Any]:
+        return self._frames.write(self.getImage(*args))
+
+    def popNextImageShared(self) -> Dict[str, Any]:
+        return self._frames.write(self.popNextImage())
+
+    def popNextImageMDShared(self) -> Tuple[Dict[str, Any], Metadata]:
+        img, md = self.popNextImageMD()
+        return self._frames.write(img), md
+
+    def snapShared(self, *args) -> Dict[str, Any]:
+        return self._frames.write(self.snap(*args))
+
+
+class _SharedFrameCallback:
+    """Mixin for the client callback class turning descriptors back into arrays.
+
+    Frames are copied out of the ring before the call returns to the server, so
+    they can't be overwritten while queued in the (Qt) event loop.
+    """
+
+    _reader: SharedFrameReader
+
+    @api.expose
+    def receive_core_callback(self, signal_name: str, args: tuple) -> None:
+        args = tuple(
+            self._reader.read(a) if is_frame_descriptor(a) else a for a in args
+        )
+        getattr(self, signal_name).emit(*args)
+
+
+class SharedMemoryMMCore(RemoteMMCore):
+    """`RemoteMMCore` client receiving frames through shared memory.
+
+    Same interface as `RemoteMMCore`; `getLastImage`, `getImage`, `popNextImage`,
+    `popNextImageMD`, `snap` and the arrays passed to the callbacks are read from
+    the server's `SharedFrameRing` instead of being serialized.
+
+    Parameters
+    ----------
+    host : str
+        Server host, by default "127.0.0.1".
+    port : int
+        Server port, by default `DEFAULT_PORT`.
+    timeout : float
+        Seconds to wait for a new server to come up, by default 30.
+    verbose : bool
+        Whether the server should log verbosely, by default False.
+    cleanup_new : bool
+        Whether to kill a server started by this client on exit, by default True.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        timeout: float = 30,
+        verbose: bool = False,
+        cleanup_new: bool = True,
+    ):
+        ensure_server_running(host, port, timeout, verbose, cleanup_new)
+        reader = SharedFrameReader()
+        callback_class = type(
+            "SharedFrameSignaler",
+            (_SharedFrameCallback, _get_auto_callback_class()),
+            {"_reader": reader},
+        )
+        # the server is already up: `RemoteMMCore` only connects to it
+        super().__init__(
+            host=host, port=port, verbose=verbose, callback_class=callback_class
+        )
+        self._frames = reader
+
+    def __copy__(self):
+        """Return a new connection to the server, with its own frame reader."""
+        proxy = super().__copy__()
+        proxy._frames = SharedFrameReader()
+        return proxy
+
+    def __getattr__(self, name):
+        """Look up `events` and `_frames` locally, anything else on the server."""
+        if name in ("events", "_frames"):
+            return object.__getattribute__(self, name)
+        return super().__getattr__(name)
+
+    def __setattr__(self, name, value):
+        """Set `events` and `_frames` locally, anything else on the server."""
+        if name in ("events", "_frames"):
+            return object.__setattr__(self, name, value)
+        return super().__setattr__(name, value)
+
+    def getLastImage(self) -> np.ndarray:
+        return self._frames.read(self.getLastImageShared())
+
+    def getImage(self, *args) -> np.ndarray:
+        return self._frames.read(self.getImageShared(*args))
+
+    def popNextImage(self) -> np.ndarray:
+        return self._frames.read(self.popNextImageShared())
+
+    def popNextImageMD(self, md=None) -> Tuple[np.ndarray, Metadata]:
+        desc, md = self.popNextImageMDShared()
+        return self._frames.read(desc), md
+
+    def snap(self, *args) -> np.ndarray:
+        return self._frames.read(self.snapShared(*args))
+
+
+def ensure_server_running(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    timeout: float = 30,
+    verbose: bool = False,
+    cleanup_new: bool = True,
+) -> Optional[subprocess.Popen]:
+    """Start a `SharedFrameCore` server on `host:port` unless one is running."""
+    remote_daemon = api.Proxy(f"PYRO:{core.DAEMON_NAME}@{host}:{port}")
+    with contextlib.suppress(errors.CommunicationError):
+        remote_daemon.ping()
+        return None
+
+    cmd = [sys.executable, "-m", __name__, "-p", str(port), "--host", host]
+    if verbose:
+        cmd.append("--verbose")
+    proc = subprocess.Popen(cmd)
+    if cleanup_new:
+        atexit.register(proc.kill)
+
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            remote_daemon.ping()
+            return proc
+        except errors.CommunicationError:
+            if proc.poll() is not None:
+                raise RuntimeError("shared-memory MMCore server exited") from None
+            time.sleep(0.1)
+    raise TimeoutError(f"Timeout connecting to server {host}:{port}")
+
+
+def serve() -> None:
+    """Run a `SharedFrameCore` server (entry point of ``python -m``)."""
+    import argparse
+
+    from loguru import logger
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT, help="port")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--verbose", action="store_true", default=False)
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.disable("pymmcore_plus")
+
+    register_serializers()
+    api.serve(
+        {SharedFrameCore: CORE_NAME},
+        use_ns=False,
+        host=args.host,
+        port=args.port,
+        verbose=args.verbose,
+    )
+
+
+if __name__ == "__main__":
+    serve()
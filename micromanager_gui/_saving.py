@@ -1,27 +1,114 @@
 from __future__ import annotations
 
+import json
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import numpy as np
-import tifffile
+import zarr
 
-from ._util import ensure_unique
+from ._mosaic import Mosaic, TileCanvas
+from ._pyramid import downsample, pyramid_shapes
+from ._util import ensure_unique, release_unique
+from ._writers import WriteFunc, _imsave, _ome_multiscales, get_writer
 
 if TYPE_CHECKING:
     from napari.components import LayerList
     from useq import MDASequence
 
+    from micromanager_gui._frame_index import FrameIndex
     from micromanager_gui._mda import SequenceMeta
 
 
-def _imsave(file: Path, data: np.ndarray, dtype="uint16"):
-    tifffile.imwrite(str(file), data.astype(dtype), imagej=data.ndim <= 5)
+# edge of the chunks of stitched mosaics
+MOSAIC_BLOCK = 1024
 
+# called with the number of files written so far and the total number of files
+ProgressCallback = Callable[[int, int], None]
 
-def save_sequence(sequence: MDASequence, layers: LayerList, meta: SequenceMeta):
+
+class SaveCancelled(Exception):
+    """Raised by `save_sequence` when its `cancel` event is set."""
+
+
+def _layer_data(layer):
+    """Return the (full resolution) data of `layer`."""
+    return layer.data[0] if layer.multiscale else layer.data
+
+
+class _AxisSlice:
+    """Lazy ``np.take(data, index, axis)`` of an array-like (e.g. zarr) `data`."""
+
+    def __init__(self, data: Any, axis: int, index: int) -> None:
+        self.data = data
+        self.axis = axis
+        self.index = index
+        self.shape = tuple(data.shape[:axis] + data.shape[axis + 1 :])
+        self.dtype = data.dtype
+
+    def __getitem__(self, key: tuple) -> np.ndarray:
+        """Return ``data[key]``, with `index` inserted at `axis`."""
+        return self.data[(*key[: self.axis], self.index, *key[self.axis :])]
+
+
+class _Cancellable:
+    """Array-like reading `data`, until `cancel` is set (then `SaveCancelled`)."""
+
+    def __init__(self, data: Any, cancel: threading.Event) -> None:
+        self.data = data
+        self.cancel = cancel
+        self.shape = data.shape
+        self.dtype = data.dtype
+
+    def __getitem__(self, key: Any) -> Any:
+        """Return ``data[key]``."""
+        if self.cancel.is_set():
+            raise SaveCancelled
+        return self.data[key]
+
+
+class _Stack:
+    """Lazy ``np.stack(arrays)`` of equally shaped array-likes."""
+
+    def __init__(self, arrays: Sequence[Any]) -> None:
+        self.arrays = arrays
+        self.shape = (len(arrays), *arrays[0].shape)
+        self.dtype = arrays[0].dtype
+
+    def __getitem__(self, key: tuple) -> np.ndarray:
+        """Return ``arrays[key[0]][key[1:]]``."""
+        return np.asarray(self.arrays[key[0]][key[1:]])
+
+
+def save_sequence(
+    sequence: MDASequence,
+    layers: LayerList,
+    meta: SequenceMeta,
+    progress: Optional[ProgressCallback] = None,
+    cancel: Optional[threading.Event] = None,
+):
     """Save `layers` associated with an MDA `sequence` to disk.
 
+    The files are written by the writer of `meta.file_format` (see
+    `micromanager_gui._writers`), compressed with `meta.compression`.  When an
+    MDA is saved to several files (split channels or positions), up to
+    `meta.save_workers` files are written in parallel.
+
     Parameters
     ----------
     sequence : MDASequence
@@ -30,60 +117,405 @@ def save_sequence(sequence: MDASequence, layers: LayerList, meta: SequenceMeta):
         A list of layers acquired during the MDA sequence.
     meta : SequenceMeta
         Internal metadata associated with the sequence.
+    progress : Optional[Callable[[int, int], None]]
+        Called with the number of files written so far and the total number of
+        files, by default None.
+    cancel : Optional[threading.Event]
+        When set (e.g. from another thread), saving stops at the next plane and
+        `SaveCancelled` is raised, by default None.  The file being written is
+        removed, those already written are kept.
     """
     if not meta.should_save:
         return
+    # fail before writing anything
+    get_writer(meta.file_format, meta.compression)
+    if meta.saves_in_place:
+        return _finalize_mda_store(sequence, layers)
     if meta.mode == "mda":
-        return _save_mda_sequence(sequence, layers, meta)
+        return _save_mda_sequence(sequence, layers, meta, progress, cancel)
     if meta.mode == "explorer":
-        return _save_explorer_scan(sequence, layers, meta)
+        return _save_explorer_scan(sequence, layers, meta, progress, cancel)
     raise NotImplementedError(f"cannot save experiment with mode: {meta.mode}")
 
 
-def _save_mda_sequence(sequence: MDASequence, layers: LayerList, meta: SequenceMeta):
+def create_mda_store(sequence: MDASequence, meta: SequenceMeta) -> zarr.Group:
+    """Create the zarr group that an MDA is acquired into (`meta.saves_in_place`).
+
+    The group is ``<save_dir>/<file_name>_NNN.zarr`` and holds one array (or, for
+    "ome-zarr", one OME-Zarr image) per layer, see `create_mda_arrays`.
+    """
+    path = Path(meta.save_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    ext = get_writer(meta.file_format).extension
+    dest = ensure_unique(path / meta.file_name, extension=ext, folder=True)
+    root = zarr.open_group(str(dest), mode="w-")
+    root.attrs["useq_sequence"] = json.loads(sequence.json())
+    return root
+
+
+def create_mda_arrays(
+    root: zarr.Group,
+    name: str,
+    shapes: Sequence[Sequence[int]],
+    dtype: str,
+    labels: List[str],
+    meta: SequenceMeta,
+    scale: Sequence[float],
+) -> List[zarr.Array]:
+    """Create the array(s) of one MDA layer in `root`.
+
+    Only "ome-zarr" stores the downsampled levels of a multiscale layer (as the
+    other datasets of the image), so the list holds a single array otherwise.
+
+    Parameters
+    ----------
+    root : zarr.Group
+        Group created by `create_mda_store`.
+    name : str
+        Name of the array (or OME-Zarr image) in `root`.
+    shapes : Sequence[Sequence[int]]
+        Shape of each resolution level of the layer, the last two axes being
+        (y, x).  Each level is half the size of the previous one in y and x.
+    dtype : str
+        Data type of the images.
+    labels : List[str]
+        Axis labels of the layer (e.g. ["t", "c", "z", "y", "x"]).
+    meta : SequenceMeta
+        Metadata of the sequence, for the format, chunking and compression.
+    scale : Sequence[float]
+        Physical size of one step along each axis (um for z, y and x).
+    """
+
+    def _kwargs(shape: Sequence[int]) -> dict:
+        return dict(
+            shape=shape,
+            dtype=dtype,
+            chunks=meta.chunks(tuple(shape)),
+            compressor=meta.compressor(),
+        )
+
+    if meta.file_format == "ome-zarr":
+        image = root.create_group(name)
+        image.attrs["multiscales"] = [
+            _ome_multiscales(name, labels, scale, len(shapes))
+        ]
+        return [image.create(str(n), **_kwargs(s)) for n, s in enumerate(shapes)]
+    z = root.create(name, **_kwargs(shapes[0]))
+    # xarray's convention for naming the dimensions of a zarr array
+    z.attrs["_ARRAY_DIMENSIONS"] = labels
+    return [z]
+
+
+def _finalize_mda_store(sequence: MDASequence, layers: LayerList):
+    """Finish an MDA that was acquired directly into its zarr group.
+
+    The frames are already in place, only the rest of the frame index is written
+    and the metadata consolidated.
+    """
+    for lay in layers:
+        # the layer may show the array through a `LockedArray`
+        data = getattr(_layer_data(lay), "array", _layer_data(lay))
+        if lay.metadata.get("uid") == sequence.uid and isinstance(data, zarr.Array):
+            if lay.metadata.get("frame_index") is not None:
+                lay.metadata["frame_index"].flush()
+            zarr.consolidate_metadata(data.store)
+            return
+
+
+def _save_frame_index(sequence: MDASequence, layers: LayerList, dest: Path):
+    """Save the `FrameIndex` of the MDA `sequence` (if any) to `dest` (.npz)."""
+    for lay in layers:
+        if lay.metadata.get("uid") == sequence.uid and "frame_index" in lay.metadata:
+            lay.metadata["frame_index"].save(dest)
+            return
+
+
+def _save_mda_sequence(
+    sequence: MDASequence,
+    layers: LayerList,
+    meta: SequenceMeta,
+    progress: Optional[ProgressCallback] = None,
+    cancel: Optional[threading.Event] = None,
+):
+    jobs, index_path = _mda_layout(sequence, layers, meta)
+    _save_frame_index(sequence, layers, index_path)
+    _write_files(jobs, meta.save_workers, progress, _write_func(meta), cancel)
+
+
+def _mda_layout(
+    sequence: MDASequence, layers: Sequence[Any], meta: SequenceMeta
+) -> Tuple[List[Tuple[Path, Any]], Path]:
+    """Return the (destination, data) of every file of an MDA and its index path.
+
+    The index path is where the frame index is saved.  The folder holding the
+    files, if any, or else the first file, is created empty by `ensure_unique`.
+    """
     path = Path(meta.save_dir)
     file_name = meta.file_name
-    folder_name = ensure_unique(path / file_name, extension="", ndigits=3)
+    ext = get_writer(meta.file_format).extension
+    # (destination, data) of every file to write
+    jobs: List[Tuple[Path, Any]] = []
+    if meta.split_channels or meta.save_pos:
+        folder_name = ensure_unique(path / file_name, extension="", ndigits=3)
 
     # if split_channels, then create a new layer for each channel
     if meta.split_channels:
-        folder_name.mkdir(parents=True, exist_ok=True)
+        index_path = folder_name / f"{folder_name.stem}.npz"
 
         if meta.save_pos:
             # save each position/channels in a separate file.
-            _save_pos_separately(sequence, folder_name, folder_name.stem, layers)
+            jobs = _pos_separately_jobs(
+                sequence, folder_name, folder_name.stem, layers, ext
+            )
         else:
             # save each channel layer.
             for lay in layers:
                 if lay.metadata.get("uid") != sequence.uid:
                     continue
-                fname = f'{folder_name.stem}_{lay.metadata.get("ch_id")}.tif'
-                # TODO: smarter behavior w.r.t type of lay.data
-                # currently this will force the data into memory which may cause a crash
-                # long term solution is to remove this code and rely on an
-                # mda-writer either in pymmcore-plus or elsewhere.
-                _imsave(folder_name / fname, np.squeeze(lay.data))
-        return
+                fname = f'{folder_name.stem}_{lay.metadata.get("ch_id")}{ext}'
+                jobs.append((folder_name / fname, _layer_data(lay)))
+        return jobs, index_path
 
-    # not splitting channels
-    active_layer = next(x for x in layers if x.metadata.get("uid") == sequence.uid)
+    # not splitting channels: one layer per camera channel (usually just one)
+    mda_layers = [x for x in layers if x.metadata.get("uid") == sequence.uid]
 
     if meta.save_pos:
-        folder_name.mkdir(parents=True, exist_ok=True)
+        index_path = folder_name / f"{folder_name.stem}.npz"
         # save each position in a separate file
         pos_axis = sequence.axis_order.index("p")
-        for p, data in enumerate(np.rollaxis(active_layer.data, pos_axis)):
-            dest = folder_name / f"{folder_name.stem}_[p{p:03d}].tif"
-            _imsave(dest, data)
+        for layer in mda_layers:
+            cam = _camera_suffix(layer)
+            data = _layer_data(layer)
+            for p in range(data.shape[pos_axis]):
+                dest = folder_name / f"{folder_name.stem}{cam}_[p{p:03d}]{ext}"
+                jobs.append((dest, _AxisSlice(data, pos_axis, p)))
 
     else:
         # not saving each position in a separate file
-        save_path = ensure_unique(path / file_name, extension=".tif", ndigits=3)
-        # TODO: see above TODO
-        _imsave(save_path, np.squeeze(active_layer.data))
+        save_path = ensure_unique(path / file_name, extension=ext, ndigits=3)
+        # keep the counter last so that `ensure_unique` still sees it
+        stem, number = save_path.name[: -len(ext)].rsplit("_", 1)
+        index_path = path / f"{stem}_{number}.npz"
+        for layer in mda_layers:
+            dest = path / f"{stem}{_camera_suffix(layer)}_{number}{ext}"
+            jobs.append((dest, _layer_data(layer)))
+        if save_path not in (dest for dest, _ in jobs):
+            # only the files of each camera are written
+            save_path.unlink()
+    return jobs, index_path
+
+
+class _LayerStandIn(NamedTuple):
+    """What `_mda_layout` needs of an MDA layer that doesn't exist yet."""
+
+    data: Any
+    metadata: dict
+    multiscale: bool = False
+
+
+# (axis, position, array) of a file: `array` is mapped to the file and holds the
+# frames of a layer at `position` along `axis` (or all of them if `axis` is None)
+_MappedFile = Tuple[Optional[int], int, Any]
+
+
+class _Mirror:
+    """Array-like writing to `store` and to the files of `MDAFiles`."""
 
+    def __init__(self, store: Any, files: List[_MappedFile]):
+        self.store = store
+        self.files = files
 
-def _save_pos_separately(sequence, folder_name, fname, layers: LayerList):
+    def __setitem__(self, index: tuple, image: np.ndarray) -> None:
+        self.store[index] = image
+        for axis, position, mapped in self.files:
+            if axis is None:
+                mapped[index] = image
+            elif index[axis] == position:
+                mapped[index[:axis] + index[axis + 1 :]] = image
+
+
+class MDAFiles:
+    """The destination files of an MDA, written frame by frame (see `open_mda_files`).
+
+    `mirror` wraps the store of a layer so that writing a frame to it also
+    writes it to the file(s) of that layer.  `close` flushes the files and saves
+    the frame index of the MDA, `discard` removes them instead.
+    """
+
+    def __init__(
+        self,
+        files: Dict[str, List[_MappedFile]],
+        index_path: Path,
+        paths: Sequence[Path] = (),
+        folder: Optional[Path] = None,
+    ) -> None:
+        self._files = files
+        self.index_path = index_path
+        self.paths = list(paths)
+        # the folder created for the files, if any
+        self.folder = folder
+
+    def mirror(self, key: str, store: Any) -> Any:
+        """Return an array-like writing to `store` and the files of layer `key`."""
+        return _Mirror(store, self._files.get(key, []))
+
+    def close(self, frame_index: Optional[FrameIndex] = None) -> None:
+        """Flush the files to disk and save `frame_index` next to them."""
+        for files in self._files.values():
+            for *_, mapped in files:
+                mapped.flush()
+        self._files = {}
+        if frame_index is not None:
+            frame_index.save(self.index_path)
+
+    def discard(self) -> None:
+        """Remove the files (and their folder), e.g. if the MDA is incomplete."""
+        self._files = {}
+        for path in self.paths:
+            _remove(path)
+        if self.folder is not None:
+            _remove(self.folder)
+
+
+def open_mda_files(
+    sequence: MDASequence,
+    meta: SequenceMeta,
+    shape: Tuple[int, ...],
+    dtype: Any,
+    layers: Mapping[str, Tuple[str, str]],
+) -> Optional[MDAFiles]:
+    """Create the files MDA `sequence` is saved to, for writing frames as they come.
+
+    The files are the same as `save_sequence` would write at the end (same
+    names, layout and contents), but they are created empty when the MDA starts
+    and mapped to memory, so every frame goes to disk as soon as it's acquired:
+    if the acquisition crashes, only the frames not written yet are lost, and
+    there is nothing left to save at the end.
+
+    Only uncompressed formats with a `Writer.create` can be written this way
+    (see `SequenceMeta.saves_incrementally`), otherwise, or if `create` rejects
+    `dtype` (ValueError), None is returned and the MDA is saved at the end.
+
+    Parameters
+    ----------
+    sequence : MDASequence
+        The MDA about to run.
+    meta : SequenceMeta
+        Metadata of the sequence, for the file names and format.
+    shape : Tuple[int, ...]
+        Shape of each MDA layer once the MDA is done.
+    dtype : Any
+        Data type of the images.
+    layers : Mapping[str, Tuple[str, str]]
+        Key -> (``ch_id``, camera) of each layer, see `MDAFiles.mirror`.
+    """
+    if not meta.saves_incrementally:
+        return None
+    create = get_writer(meta.file_format).create
+    assert create is not None
+    stand_ins = {
+        key: _LayerStandIn(
+            np.broadcast_to(np.zeros((), dtype), shape),
+            {"uid": sequence.uid, "ch_id": ch_id, "camera": camera},
+        )
+        for key, (ch_id, camera) in layers.items()
+    }
+    jobs, index_path = _mda_layout(sequence, list(stand_ins.values()), meta)
+
+    folder = index_path.parent if meta.split_channels or meta.save_pos else None
+    mda_files = MDAFiles({}, index_path, [dest for dest, _ in jobs], folder)
+    for dest, data in jobs:
+        axis, position, source = None, 0, data
+        if isinstance(data, _AxisSlice):
+            axis, position, source = data.axis, data.index, data.data
+        key = next(k for k, layer in stand_ins.items() if layer.data is source)
+        try:
+            mapped = create(dest, tuple(data.shape), data.dtype)
+        except ValueError:
+            mda_files.discard()
+            return None
+        mda_files._files.setdefault(key, []).append((axis, position, mapped))
+    return mda_files
+
+
+def _write_func(meta: SequenceMeta) -> WriteFunc:
+    """Return a function writing one file in the format of `meta`."""
+    writer = get_writer(meta.file_format, meta.compression)
+    return partial(writer.write, codec=meta.compression)
+
+
+def _write_files(
+    jobs: Sequence[Tuple[Path, Any]],
+    workers: int = 1,
+    progress: Optional[ProgressCallback] = None,
+    write: Callable[[Path, Any], None] = _imsave,
+    cancel: Optional[threading.Event] = None,
+):
+    """Write the data of each (destination, data) of `jobs` with `write`.
+
+    Files are written by a pool of at most `workers` threads (reading, converting
+    and writing planes mostly releases the GIL).  `progress(done, total)` is
+    called on the calling thread before the first and after every file.  If a
+    file can't be written, the files not started yet are skipped and the error
+    is raised.  Setting `cancel` stops every file at its next plane, see
+    `save_sequence`.
+    """
+    if cancel is not None:
+        write = partial(_write_cancellable, write, cancel)
+    total = len(jobs)
+    if progress is not None:
+        progress(0, total)
+    if workers <= 1 or total <= 1:
+        for done, (dest, data) in enumerate(jobs, 1):
+            write(dest, data)
+            if progress is not None:
+                progress(done, total)
+        return
+
+    with ThreadPoolExecutor(min(workers, total), thread_name_prefix="save") as pool:
+        futures = [pool.submit(write, dest, data) for dest, data in jobs]
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                if progress is not None:
+                    progress(done, total)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def _write_cancellable(
+    write: Callable[[Path, Any], None], cancel: threading.Event, dest: Path, data: Any
+):
+    """Write `data` to `dest` unless `cancel` is set, removing the partial file."""
+    try:
+        write(dest, _Cancellable(data, cancel))
+    except SaveCancelled:
+        _remove(dest)
+        raise
+
+
+def _remove(dest: Path):
+    """Remove the file or directory `dest`, if it exists, freeing its name."""
+    if dest.is_dir():
+        shutil.rmtree(dest, ignore_errors=True)
+    elif dest.exists():
+        dest.unlink()
+    release_unique(dest)
+
+
+def _camera_suffix(layer) -> str:
+    """Return "_<camera>" for layers of a multi-channel camera, else ""."""
+    camera = layer.metadata.get("camera")
+    return f"_{camera}" if camera else ""
+
+
+def _pos_separately_jobs(
+    sequence, folder_name, fname, layers: LayerList, ext: str = ".tif"
+) -> List[Tuple[Path, Any]]:
+    """Return the (destination, data) of each position of each channel layer."""
+    jobs = []
     for p in range(len(sequence.stage_positions)):
 
         folder_path = Path(folder_name) / f"{fname}_Pos{p:03d}"
@@ -92,12 +524,21 @@ def _save_pos_separately(sequence, folder_name, fname, layers: LayerList):
         for i in layers:
             if "ch_id" not in i.metadata or i.metadata.get("uid") != sequence.uid:
                 continue
-            fname = f"{fname}_{i.metadata['ch_id']}_[p{p:03}]"
+            pos_fname = f"{fname}_{i.metadata['ch_id']}_[p{p:03}]"
             ax = sequence.axis_order.index("p") if len(sequence.time_plan) > 0 else 0
-            _imsave(folder_path / f"{fname}.tif", np.take(i.data, p, axis=ax))
+            jobs.append(
+                (folder_path / f"{pos_fname}{ext}", _AxisSlice(_layer_data(i), ax, p))
+            )
+    return jobs
 
 
-def _save_explorer_scan(sequence: MDASequence, layers: LayerList, meta: SequenceMeta):
+def _save_explorer_scan(
+    sequence: MDASequence,
+    layers: LayerList,
+    meta: SequenceMeta,
+    progress: Optional[ProgressCallback] = None,
+    cancel: Optional[threading.Event] = None,
+):
 
     path = Path(meta.save_dir)
     file_name = f"scan_{meta.file_name}"
@@ -105,17 +546,126 @@ def _save_explorer_scan(sequence: MDASequence, layers: LayerList, meta: Sequence
     folder_name = ensure_unique(path / file_name, extension="", ndigits=3)
     folder_name.mkdir(parents=True, exist_ok=True)
 
+    channels, pixel_size = _explorer_tiles(sequence, layers)
+
+    # one (n_tiles, y, x) file per channel, written once tile by tile
+    ext = get_writer(meta.file_format).extension
+    jobs = [
+        (folder_name / f"{ch_name}{ext}", _Stack(tiles))
+        for (_, ch_name), (tiles, _) in channels.items()
+    ]
+    _write_files(jobs, meta.save_workers, progress, _write_func(meta), cancel)
+
+    if meta.mosaic and channels:
+
+        def _data(tile) -> Any:
+            return tile if cancel is None else _Cancellable(tile, cancel)
+
+        mosaics = {
+            ch_name: Mosaic([_data(tile) for tile in tiles], origins)
+            for (_, ch_name), (tiles, origins) in channels.items()
+        }
+        dest = folder_name / "mosaic.ome.zarr"
+        try:
+            save_mosaic(dest, mosaics, pixel_size, meta)
+        except SaveCancelled:
+            _remove(dest)
+            raise
+
+
+def _explorer_tiles(
+    sequence: MDASequence, layers: LayerList
+) -> Tuple[Dict[Tuple[Any, Any], Tuple[List[Any], List[Any]]], float]:
+    """Return the tiles and their origins of each channel of an explorer scan.
+
+    Channels are keyed by (ch_id, ch_name), tiles are in acquisition order.  The
+    layers are either the `TileCanvas` of each channel, or one layer per tile
+    with its ``scan_coord`` (e.g. added by a script).  Also returns the pixel
+    size.
+    """
+    channels: Dict[Tuple[Any, Any], Tuple[List[Any], List[Any]]] = {}
+    pixel_size = 1.0
     for layer in sorted(
         (i for i in layers if i.metadata.get("uid") == sequence.uid),
         key=lambda x: x.metadata.get("ch_id"),
     ):
-        data = layer.data[np.newaxis, ...]
-
-        if layer.metadata.get("scan_position") == "Pos000":
-            scan_stack = data
+        key = (layer.metadata.get("ch_id"), layer.metadata.get("ch_name"))
+        tiles, origins = channels.setdefault(key, ([], []))
+        canvas: Optional[TileCanvas] = layer.metadata.get("explorer_canvas")
+        if canvas is not None:
+            for i in np.flatnonzero(canvas.acquired):
+                tiles.append(_AxisSlice(canvas.tiles, 0, i))
+                origins.append(canvas.origins[i])
         else:
-            scan_stack = np.concatenate((scan_stack, data))
+            tiles.append(layer.data)
+            origins.append(layer.metadata["scan_coord"])
+        pixel_size = layer.metadata.get("pixel_size", pixel_size)
+    return {k: v for k, v in channels.items() if v[0]}, pixel_size
+
+
+def save_mosaic(
+    path: Path,
+    mosaics: Mapping[str, Mosaic],
+    pixel_size: float = 1.0,
+    meta: Optional[SequenceMeta] = None,
+    block: int = MOSAIC_BLOCK,
+) -> zarr.Group:
+    """Write the stitched canvas of each channel to an OME-Zarr image at `path`.
+
+    The image has (c, y, x) axes, one channel per item of `mosaics`, and 2x
+    downsampled levels down to `MIN_LEVEL_SIZE` so that viewers can open large
+    mosaics zoomed out.  Every level is written in `block` x `block` chunks, one
+    chunk at a time, so memory use doesn't depend on the size of the mosaic.
+
+    Parameters
+    ----------
+    path : Path
+        Where to create the OME-Zarr image.  It must not already exist.
+    mosaics : Mapping[str, Mosaic]
+        Channel name -> tiles of that channel.
+    pixel_size : float
+        Size of a pixel in um, by default 1.
+    meta : Optional[SequenceMeta]
+        For the compression of the chunks, by default uncompressed.
+    block : int
+        Edge of the chunks, by default `MOSAIC_BLOCK`.
+    """
+    names = list(mosaics)
+    height = max(m.shape[0] for m in mosaics.values())
+    width = max(m.shape[1] for m in mosaics.values())
+    shapes = pyramid_shapes((len(names), height, width))
+    dtype = mosaics[names[0]].dtype
+    compressor = meta.compressor() if meta is not None else None
+
+    root = zarr.open_group(str(path), mode="w-")
+    scale = [1.0, pixel_size, pixel_size]
+    root.attrs["multiscales"] = [
+        _ome_multiscales(path.name, ["c", "y", "x"], scale, len(shapes))
+    ]
+    root.attrs["omero"] = {"channels": [{"label": name} for name in names]}
+    levels = [
+        root.create(
+            str(n),
+            shape=shape,
+            chunks=(1, block, block),
+            dtype=dtype,
+            compressor=compressor,
+        )
+        for n, shape in enumerate(shapes)
+    ]
 
-        if scan_stack.shape[0] > 1:
-            ch_name = layer.metadata.get("ch_name")
-            _imsave(folder_name / f"{ch_name}.tif", scan_stack)
+    for c, name in enumerate(names):
+        mosaic = mosaics[name]
+        for y, x in mosaic.blocks(block):
+            region = mosaic.render(y, x, block, block)
+            levels[0][c, y : y + region.shape[0], x : x + region.shape[1]] = region
+        # each level from the previous one, one output chunk at a time
+        for previous, level in zip(levels, levels[1:]):
+            for y in range(0, level.shape[1], block):
+                for x in range(0, level.shape[2], block):
+                    src = previous[c, 2 * y : 2 * (y + block), 2 * x : 2 * (x + block)]
+                    region = downsample(src)
+                    h = min(region.shape[0], level.shape[1] - y)
+                    w = min(region.shape[1], level.shape[2] - x)
+                    level[c, y : y + h, x : x + w] = region[:h, :w]
+    return root
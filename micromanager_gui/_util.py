@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import os
+import threading
 from pathlib import Path
-from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from pymmcore_plus import CMMCorePlus
 from qtpy.QtCore import Signal
@@ -22,36 +24,97 @@ if TYPE_CHECKING:
     import useq
 
 
-def ensure_unique(path: Path, extension: str = ".tif", ndigits: int = 3) -> Path:
+# next free counter of each (directory, extension) handed out by `ensure_unique`
+_COUNTERS: Dict[Tuple[Path, str], int] = {}
+_COUNTERS_LOCK = threading.Lock()
+
+
+def ensure_unique(
+    path: Path,
+    extension: str = ".tif",
+    ndigits: int = 3,
+    folder: Optional[bool] = None,
+) -> Path:
     """Get next suitable filepath (extension = ".tif") or folderpath (extension = "").
 
-    Result is appended with a counter of ndigits.
+    Result is appended with a counter of ndigits.  The counter is shared by every
+    name with `extension` in the directory, and the returned path is reserved:
+    it is created empty (a directory if `folder`, by default when there is no
+    extension) so that concurrent saves, in this process or another, never get
+    the same path.  The directory is only listed the first time it is used, or
+    again after `release_unique`; then each call costs one (atomic) file
+    creation, whatever the directory's size.
     """
-    p = path
-    stem = p.stem
+    if folder is None:
+        folder = not extension
+    stem = path.name
+    if extension and stem.endswith(extension):
+        stem = stem[: -len(extension)]
     # check if provided path already has an ndigit number in it
     cur_num = stem.rsplit("_")[-1]
     if cur_num.isdigit() and len(cur_num) == ndigits:
         stem = stem[: -ndigits - 1]
-        current_max = int(cur_num) - 1
+        start = int(cur_num)
+    else:
+        start = 0
+
+    key = (path.parent.resolve(), extension)
+    with _COUNTERS_LOCK:
+        if key not in _COUNTERS:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _COUNTERS[key] = _next_counter(path.parent, extension)
+        number = max(start, _COUNTERS[key])
+        while True:
+            new = path.parent / f"{stem}_{number:0{ndigits}d}{extension}"
+            try:
+                _reserve(new, folder)
+            except FileExistsError:
+                # made by someone else since the directory was listed
+                number += 1
+                continue
+            _COUNTERS[key] = number + 1
+            return new
+
+
+def release_unique(path: Path) -> None:
+    """Let `ensure_unique` hand out the counter of `path` again, once it's removed.
+
+    The counters of its directory are forgotten, so that the directory is listed
+    again the next time `ensure_unique` is used there.
+    """
+    directory = path.parent.resolve()
+    with _COUNTERS_LOCK:
+        for key in [k for k in _COUNTERS if k[0] == directory]:
+            del _COUNTERS[key]
+
+
+def _next_counter(directory: Path, extension: str) -> int:
+    """Return one more than the highest counter of the names in `directory`."""
+    current_max = -1
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if extension:
+                if not entry.name.endswith(extension):
+                    continue
+                # the extension can have several suffixes (e.g. ".ome.tif")
+                name = entry.name[: -len(extension)]
+            elif entry.is_dir():
+                name = Path(entry.name).stem
+            else:
+                continue
+            try:
+                current_max = max(current_max, int(name.rsplit("_")[-1]))
+            except ValueError:
+                continue
+    return current_max + 1
+
+
+def _reserve(path: Path, folder: bool) -> None:
+    """Create `path` empty, raising FileExistsError if it exists."""
+    if folder:
+        path.mkdir()
     else:
-        current_max = -1
-
-    # # find the highest existing path (if dir)
-    paths = (
-        p.parent.glob(f"*{extension}")
-        if extension
-        else (f for f in p.parent.iterdir() if f.is_dir())
-    )
-    for fn in paths:
-        try:
-            current_max = max(current_max, int(fn.stem.rsplit("_")[-1]))
-        except ValueError:
-            continue
-
-    # build new path name
-    number = f"_{current_max+1:0{ndigits}d}"
-    return path.parent / f"{stem}{number}{extension}"
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
 
 
 # move these to useq:
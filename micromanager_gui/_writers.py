@@ -0,0 +1,316 @@
+"""Registry of the file formats (and codecs) an acquisition can be saved as.
+
+Each writer saves one (..., y, x) array-like (e.g. a zarr array) to one file or
+directory, one plane at a time so that the data doesn't need to fit in RAM.
+Other formats can be added with `register_writer`:
+
+    @register_writer("my-format", extension=".my", codecs=("none",))
+    def _write_my_format(path: Path, data: Any, codec: str = "none") -> None:
+        ...
+"""
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+import tifffile
+import zarr
+
+from ._mda import COMPRESSIONS, get_compressor
+
+__all__ = ["Writer", "WRITERS", "register_writer", "get_writer"]
+
+# called with the destination, the data and the name of the codec
+WriteFunc = Callable[[Path, Any, str], None]
+# called with the destination, shape and dtype of the data: creates the
+# (uncompressed) file and returns a writable array of `shape` mapped to it
+CreateFunc = Callable[[Path, Tuple[int, ...], Any], np.ndarray]
+
+# OME-NGFF axis types of the useq axes ("p" has none)
+_OME_AXIS_TYPES = {
+    "t": "time",
+    "c": "channel",
+    "z": "space",
+    "y": "space",
+    "x": "space",
+}
+
+# files larger than this need BigTIFF
+_TIFF_LIMIT = 2**32 - 2**25
+
+# data types of ImageJ hyperstacks, others are saved as uint16
+_IMAGEJ_DTYPES = ("uint8", "uint16", "float32")
+
+# tifffile compression (and arguments) of each codec name, zstd needs imagecodecs
+_TIFF_CODECS: Dict[str, Tuple[str, dict]] = {
+    "deflate": ("zlib", {"level": 1}),
+    "zstd": ("zstd", {"level": 1}),
+}
+
+
+class Writer(NamedTuple):
+    """A registered file format."""
+
+    name: str
+    extension: str  # of the files (or directories) written, e.g. ".tif"
+    codecs: Tuple[str, ...]  # names of the supported compressions
+    write: WriteFunc
+    # whether an MDA is acquired directly into this format (see `create_mda_store`)
+    in_place: bool = False
+    # for uncompressed files written as frames arrive (see `open_mda_files`)
+    create: Optional[CreateFunc] = None
+
+
+WRITERS: Dict[str, Writer] = {}
+
+
+def register_writer(
+    name: str,
+    extension: str,
+    codecs: Sequence[str] = ("none",),
+    in_place: bool = False,
+    create: Optional[CreateFunc] = None,
+) -> Callable[[WriteFunc], WriteFunc]:
+    """Register the decorated function as the writer of the format `name`.
+
+    Formats that can lay out an uncompressed file before the data exists can
+    also give a `create` function, so that MDAs are written to it frame by
+    frame while they are acquired instead of saved at the end.
+    """
+
+    def _register(func: WriteFunc) -> WriteFunc:
+        WRITERS[name] = Writer(name, extension, tuple(codecs), func, in_place, create)
+        return func
+
+    return _register
+
+
+def get_writer(name: str, codec: str = "none") -> Writer:
+    """Return the writer of the format `name`, checking that it supports `codec`."""
+    try:
+        writer = WRITERS[name]
+    except KeyError:
+        raise ValueError(
+            f"unknown file format {name!r}, must be one of {tuple(WRITERS)}"
+        ) from None
+    if codec not in writer.codecs:
+        raise ValueError(
+            f"{name!r} files can't be compressed with {codec!r}, "
+            f"must be one of {writer.codecs}"
+        )
+    return writer
+
+
+def _tiff_codecs() -> Tuple[str, ...]:
+    try:
+        import imagecodecs  # noqa: F401
+    except ImportError:
+        return ("none", "deflate")
+    return ("none", "deflate", "zstd")
+
+
+def _planes(data: Any, dtype: Any = None) -> Iterator[np.ndarray]:
+    """Yield each (y, x) plane of `data`, converted to `dtype`."""
+    for index in np.ndindex(*data.shape[:-2]):
+        plane = np.asarray(data[index])
+        yield plane if dtype is None else plane.astype(dtype, copy=False)
+
+
+def _imsave(
+    file: Path,
+    data: Any,
+    dtype="uint16",
+    imagej: bool = True,
+    ome: bool = False,
+    bigtiff: bool = False,
+    codec: str = "none",
+):
+    """Write `data` (..., y, x) to a tif file, one plane at a time.
+
+    `data` can be any array-like indexable with a tuple of ints (e.g. a zarr
+    array): only one plane is in memory at any time, so the layer doesn't need
+    to fit in RAM.  Axes of size 1 are dropped, like `np.squeeze`.  MDA stores
+    have one chunk per plane, so each plane is read and decompressed once.
+    """
+    shape, options = _tiff_layout(data.shape, dtype, imagej, ome, bigtiff)
+    compression, compressionargs = _TIFF_CODECS.get(codec, (None, None))
+    with tifffile.TiffWriter(str(file), **options) as tif:
+        tif.write(
+            _planes(data, dtype),
+            shape=shape,
+            dtype=dtype,
+            photometric="minisblack",
+            compression=compression,
+            compressionargs=compressionargs,
+        )
+
+
+def _tiff_layout(
+    shape: Sequence[int], dtype: Any, imagej: bool, ome: bool, bigtiff: bool
+) -> Tuple[Tuple[int, ...], dict]:
+    """Return the shape in a tif file of data of `shape`, and the writer options."""
+    *lead, y, x = shape
+    shape = tuple(n for n in lead if n != 1) + (y, x)
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    # ImageJ hyperstacks have at most 5 dimensions and handle large files
+    # themselves, others need BigTIFF
+    imagej = imagej and len(shape) <= 5
+    if ome and len(shape) > 5:
+        # OME-TIFF has at most 5 dimensions (TZCYX): merge the leading ones, the
+        # planes are written in the same order
+        shape = (int(np.prod(shape[:-4])), *shape[-4:])
+    bigtiff = bigtiff or (not imagej and nbytes > _TIFF_LIMIT)
+    return shape, dict(bigtiff=bigtiff, imagej=imagej, ome=ome)
+
+
+def _tiff_memmap(
+    file: Path,
+    shape: Tuple[int, ...],
+    dtype="uint16",
+    imagej: bool = True,
+    ome: bool = False,
+    bigtiff: bool = False,
+) -> np.ndarray:
+    """Create an empty tif file laid out like `_imsave` and map it to an array.
+
+    The array has `shape` (axes of size 1 included), whatever the file's shape.
+    """
+    file_shape, options = _tiff_layout(shape, dtype, imagej, ome, bigtiff)
+    mapped = tifffile.memmap(
+        str(file),
+        shape=file_shape,
+        dtype=dtype,
+        photometric="minisblack",
+        **options,
+    )
+    return mapped.reshape(shape)
+
+
+def _create_raw(path: Path, shape: Tuple[int, ...], dtype: Any) -> np.ndarray:
+    return np.lib.format.open_memmap(str(path), mode="w+", dtype=dtype, shape=shape)
+
+
+def _imagej_dtype(dtype: Any) -> str:
+    """Return the data type an ImageJ hyperstack of `dtype` data is saved as."""
+    name = np.dtype(dtype).name
+    return name if name in _IMAGEJ_DTYPES else "uint16"
+
+
+def _create_tif(path: Path, shape: Tuple[int, ...], dtype: Any) -> np.ndarray:
+    if np.dtype(dtype).name not in _IMAGEJ_DTYPES:
+        # `_write_tif` would convert the data, frames can't be mapped as they are
+        raise ValueError(
+            f"ImageJ tif files can't hold {np.dtype(dtype)} images, "
+            f"must be one of {_IMAGEJ_DTYPES}"
+        )
+    return _tiff_memmap(path, shape, dtype)
+
+
+@register_writer("tif", extension=".tif", create=_create_tif)
+def _write_tif(path: Path, data: Any, codec: str = "none") -> None:
+    """Write an ImageJ hyperstack (uint8, uint16 or float32, else uint16)."""
+    _imsave(path, data, _imagej_dtype(data.dtype))
+
+
+@register_writer(
+    "ome-tif",
+    extension=".ome.tif",
+    codecs=_tiff_codecs(),
+    create=partial(_tiff_memmap, imagej=False, ome=True),
+)
+def _write_ome_tif(path: Path, data: Any, codec: str = "none") -> None:
+    """Write an OME-TIFF, BigTIFF if larger than 4 GB.
+
+    Axes beyond 5 (e.g. positions) are merged into the first one.
+    """
+    _imsave(path, data, data.dtype, imagej=False, ome=True, codec=codec)
+
+
+@register_writer(
+    "bigtiff",
+    extension=".tif",
+    codecs=_tiff_codecs(),
+    create=partial(_tiff_memmap, imagej=False, bigtiff=True),
+)
+def _write_bigtiff(path: Path, data: Any, codec: str = "none") -> None:
+    """Write a plain BigTIFF, one page per plane."""
+    _imsave(path, data, data.dtype, imagej=False, bigtiff=True, codec=codec)
+
+
+def _zarr_array(group: zarr.Group, name: str, data: Any, codec: str) -> zarr.Array:
+    """Create `name` in `group` like `data`, with one chunk per plane."""
+    z = group.create(
+        name,
+        shape=data.shape,
+        dtype=data.dtype,
+        chunks=(1,) * (len(data.shape) - 2) + tuple(data.shape[-2:]),
+        compressor=get_compressor(codec),
+    )
+    for index, plane in zip(np.ndindex(*data.shape[:-2]), _planes(data)):
+        z[index] = plane
+    return z
+
+
+@register_writer("zarr", extension=".zarr", codecs=COMPRESSIONS, in_place=True)
+def _write_zarr(path: Path, data: Any, codec: str = "none") -> None:
+    """Write a zarr group holding a "data" array."""
+    _zarr_array(zarr.open_group(str(path), mode="w-"), "data", data, codec)
+
+
+@register_writer("ome-zarr", extension=".zarr", codecs=COMPRESSIONS, in_place=True)
+def _write_ome_zarr(path: Path, data: Any, codec: str = "none") -> None:
+    """Write an OME-Zarr image with a single resolution level."""
+    root = zarr.open_group(str(path), mode="w-")
+    labels = [f"dim_{i}" for i in range(len(data.shape) - 2)] + ["y", "x"]
+    root.attrs["multiscales"] = [
+        _ome_multiscales(path.name, labels, [1.0] * len(labels))
+    ]
+    _zarr_array(root, "0", data, codec)
+
+
+@register_writer("raw", extension=".npy", create=_create_raw)
+def _write_raw(path: Path, data: Any, codec: str = "none") -> None:
+    """Write an uncompressed .npy file (``np.load(path, mmap_mode="r")`` maps it)."""
+    out = _create_raw(path, tuple(data.shape), data.dtype)
+    for index, plane in zip(np.ndindex(*data.shape[:-2]), _planes(data)):
+        out[index] = plane
+    out.flush()
+    del out
+
+
+def _ome_multiscales(
+    name: str, labels: List[str], scale: Sequence[float], n_levels: int = 1
+) -> dict:
+    """Return the OME-NGFF (0.4) "multiscales" metadata of an image."""
+    axes = []
+    for label in labels:
+        axis = {"name": label}
+        if label in _OME_AXIS_TYPES:
+            axis["type"] = _OME_AXIS_TYPES[label]
+        if axis.get("type") == "space":
+            axis["unit"] = "micrometer"
+        axes.append(axis)
+    datasets = []
+    for n in range(n_levels):
+        # y and x are binned 2x at each level
+        level_scale = [float(s) for s in scale[:-2]]
+        level_scale += [float(s) * 2**n for s in scale[-2:]]
+        datasets.append(
+            {
+                "path": str(n),
+                "coordinateTransformations": [{"type": "scale", "scale": level_scale}],
+            }
+        )
+    return {"version": "0.4", "name": name, "axes": axes, "datasets": datasets}
@@ -2,31 +2,50 @@ from __future__ import annotations
 
 import atexit
 import contextlib
+import dataclasses
+import os
 import tempfile
-from collections import defaultdict
+import time
+import warnings
+from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
 
 import napari
 import numpy as np
 import zarr
-from napari.experimental import link_layers
+from napari.utils.notifications import show_error, show_info, show_warning
+from pymmcore_plus import CMMCorePlus
 from pymmcore_plus._util import find_micromanager
+from pymmcore_plus.mda import MDAEngine
 from qtpy import QtWidgets as QtW
-from qtpy.QtCore import QTimer
 from qtpy.QtGui import QColor, QIcon
 from superqt.utils import create_worker, ensure_main_thread
 from useq import MDASequence
 
 from . import _core, _mda
+from ._background_save import BackgroundSaver
 from ._camera_roi import _CameraROI
 from ._core_widgets import PropertyBrowser
+from ._frame_index import FrameIndex
+from ._gui_objects._latency_panel import LatencyPanel
 from ._gui_objects._mm_widget import MicroManagerWidget
-from ._saving import save_sequence
-from ._util import event_indices
+from ._live import LiveFramePump, PreviewView, preview_view
+from ._live_filters import FILTERS
+from ._live_latency import LatencyMonitor
+from ._mda_engine import CAMERA_KEY, MultiCameraMDAEngine, is_until_stopped
+from ._mda_store import GrowingStore
+from ._mda_writer import FrameWriter
+from ._mosaic import TileCanvas
+from ._pyramid import Pyramid, pyramid_shapes
+from ._recording import LiveRecorder
+from ._saving import MDAFiles, create_mda_arrays, create_mda_store, open_mda_files
+from ._util import ensure_unique, event_indices
+from ._writers import get_writer
 
 if TYPE_CHECKING:
-    from typing import Dict
+    from typing import Dict, Set
 
     import napari.layers
     import napari.viewer
@@ -34,10 +53,19 @@ if TYPE_CHECKING:
     from pymmcore_plus.core.events import QCoreSignaler
     from pymmcore_plus.mda import PMDAEngine
 
+    from ._background_save import SaveResult
+    from ._live import LiveStats
+
+    # what MDA frames are written to, see `_create_mda_stores`
+    MDAStore = Union[zarr.Array, Pyramid, GrowingStore]
+
 ICONS = Path(__file__).parent / "icons"
 CAM_ICON = QIcon(str(ICONS / "vcam.svg"))
 CAM_STOP_ICON = QIcon(str(ICONS / "cam_stop.svg"))
 
+# seconds that quitting waits for acquisitions to be saved before cancelling
+SAVE_EXIT_TIMEOUT = 60.0
+
 
 class MainWindow(MicroManagerWidget):
     """The main napari-micromanager widget that gets added to napari."""
@@ -64,7 +92,33 @@ class MainWindow(MicroManagerWidget):
         )
         self.tab_wdg.setSizePolicy(sizepolicy)
 
-        self.streaming_timer: QTimer | None = None
+        # drains the circular buffer on a thread while live mode is running and
+        # hands the newest frame to `update_viewer` at a capped display rate.
+        self._live_pump = LiveFramePump(
+            self._mmc, max_fps=self.tab_wdg.max_fps_spinBox.value()
+        )
+        self._live_pump.frameReady.connect(self._on_live_frame)
+        self._live_pump.statsUpdated.connect(self._on_live_stats)
+        self.tab_wdg.max_fps_spinBox.valueChanged.connect(self._on_max_fps_changed)
+        self.tab_wdg.preview_mode_comboBox.currentTextChanged.connect(
+            self._update_preview_view
+        )
+
+        # times each stage of the live preview (see "Live Latency..." menu)
+        self._live_latency = LatencyMonitor()
+
+        self.tab_wdg.live_filter_comboBox.currentTextChanged.connect(
+            self._update_live_filter
+        )
+        self.tab_wdg.live_filter_frames_spinBox.valueChanged.connect(
+            self._update_live_filter
+        )
+
+        # streams every live frame to disk while the record button is checked
+        self._live_recorder: LiveRecorder | None = None
+        self._restarting_live = False
+        self.tab_wdg.record_Button.toggled.connect(self._toggle_record)
+        self.tab_wdg.record_browse_Button.clicked.connect(self._set_record_dir)
 
         # disable gui
         self._set_enabled(False)
@@ -80,6 +134,11 @@ class MainWindow(MicroManagerWidget):
         sig.imageSnapped.connect(self.update_viewer)
         sig.imageSnapped.connect(self._stop_live)
 
+        # emit every channel of multi-channel cameras during MDAs, unless the
+        # user already registered a custom engine.
+        if isinstance(self._mmc, CMMCorePlus) and type(self._mmc.mda) is MDAEngine:
+            self._mmc.register_mda_engine(MultiCameraMDAEngine(self._mmc))
+
         # mda events
         self._mmc.mda.events.frameReady.connect(self._on_mda_frame)
         self._mmc.mda.events.sequenceStarted.connect(self._on_mda_started)
@@ -95,6 +154,32 @@ class MainWindow(MicroManagerWidget):
         # mapping of str `str(sequence.uid) + channel` -> temporary directory where
         # the zarr.Array is stored
         self._mda_temp_files: Dict[str, tempfile.TemporaryDirectory] = {}
+        # mapping of explorer layer id -> canvas the tiles of a channel are
+        # pasted into (see `_create_explorer_canvases`)
+        self._explorer_canvases: Dict[str, TileCanvas] = {}
+        # canvases whose layer's contrast wasn't set from a tile yet
+        self._explorer_blank: Set[TileCanvas] = set()
+        # writes MDA frames to `_mda_temp_arrays` off the main thread
+        self._mda_writer = FrameWriter()
+        self._mda_writer.frameWritten.connect(self._on_mda_frames_written)
+        self._mda_writer.statsUpdated.connect(self.mda.show_buffer_stats)
+        # camera channel suffixes of the running MDA (see `_camera_channels`)
+        self._mda_cameras: List[str] = [""]
+        # shape of the data each MDA layer was last given (see `GrowingStore`)
+        self._mda_layer_shapes: WeakKeyDictionary = WeakKeyDictionary()
+        # metadata of every frame of the running MDA, and when it started
+        self._mda_frame_index = FrameIndex()
+        self._mda_t0 = 0.0
+        # files the running MDA is written to as it's acquired, if any
+        self._mda_files: Optional[MDAFiles] = None
+        # zarr group the running MDA is acquired into, if it's saved in place
+        self._mda_store_path: Optional[Path] = None
+        # saves finished acquisitions without blocking the GUI
+        self._saver = BackgroundSaver()
+        self._saver.jobStarted.connect(self._on_save_started)
+        self._saver.progressChanged.connect(self._on_save_progress)
+        self._saver.jobFinished.connect(self._on_save_finished)
+        self.save_cancel_Button.clicked.connect(self._saver.cancel)
 
         # TODO: consider using weakref here like in pymmc+
         # didn't implement here because this object shouldn't be del'd until
@@ -104,6 +189,16 @@ class MainWindow(MicroManagerWidget):
         @atexit.register
         def cleanup():
             """Clean up temporary files we opened."""
+            # the acquisitions being saved are read from them
+            if not self._saver.wait(SAVE_EXIT_TIMEOUT):
+                self._saver.cancel()
+                # saving stops at the next plane
+                self._saver.wait(5)
+                warnings.warn(
+                    f"Saving took more than {SAVE_EXIT_TIMEOUT} s when quitting "
+                    "and was cancelled, the last acquisition may not be saved.",
+                    stacklevel=2,
+                )
             for v in self._mda_temp_files.values():
                 with contextlib.suppress(NotADirectoryError):
                     v.cleanup()
@@ -119,6 +214,8 @@ class MainWindow(MicroManagerWidget):
         self.viewer.layers.selection.events.active.connect(self._update_max_min)
         self.viewer.dims.events.current_step.connect(self._update_max_min)
         self.viewer.mouse_drag_callbacks.append(self._get_event_explorer)
+        self.viewer.camera.events.zoom.connect(self._update_preview_view)
+        self.viewer.camera.events.center.connect(self._update_preview_view)
 
         self._add_menu()
 
@@ -129,6 +226,9 @@ class MainWindow(MicroManagerWidget):
         action = self._menu.addAction("Device Property Browser...")
         action.triggered.connect(self._show_prop_browser)
 
+        action = self._menu.addAction("Live Latency...")
+        action.triggered.connect(self._show_latency_panel)
+
         bar = w._qt_window.menuBar()
         bar.insertMenu(list(bar.actions())[-1], self._menu)
 
@@ -138,6 +238,17 @@ class MainWindow(MicroManagerWidget):
         self._prop_browser.show()
         self._prop_browser.raise_()
 
+    def _show_latency_panel(self):
+        if not hasattr(self, "_latency_panel"):
+            self._latency_panel = LatencyPanel(
+                self._live_pump, self._live_latency, self
+            )
+            w = getattr(self.viewer, "__wrapped__", self.viewer).window
+            w._qt_viewer.canvas.events.draw.connect(self._live_latency.frame_drawn)
+        self._latency_panel.refresh(self._live_pump.stats)
+        self._latency_panel.show()
+        self._latency_panel.raise_()
+
     def _on_system_cfg_loaded(self):
         if len(self._mmc.getLoadedDevices()) > 1:
             self._set_enabled(True)
@@ -164,8 +275,15 @@ class MainWindow(MicroManagerWidget):
         self.cam_wdg.setEnabled(enabled)
 
     @ensure_main_thread
-    def update_viewer(self, data=None):
-        """Update viewer with the latest image from the camera."""
+    def update_viewer(
+        self, data=None, scale=(1.0, 1.0), translate=(0.0, 0.0), name="preview"
+    ):
+        """Update viewer with the latest image from the camera.
+
+        `scale` and `translate` place a cropped/downsampled live frame on top of
+        the full-resolution camera frame.  `name` is the layer to update, one per
+        camera channel with multi-channel cameras.
+        """
         if data is None:
             try:
                 data = self._mmc.getLastImage()
@@ -173,16 +291,64 @@ class MainWindow(MicroManagerWidget):
                 # circular buffer empty
                 return
         try:
-            preview_layer = self.viewer.layers["preview"]
+            preview_layer = self.viewer.layers[name]
             preview_layer.data = data
         except KeyError:
-            preview_layer = self.viewer.add_image(data, name="preview")
+            # camera channels of a multi-channel camera are overlaid
+            blending = None if name == "preview" else "additive"
+            preview_layer = self.viewer.add_image(data, name=name, blending=blending)
+
+        if tuple(preview_layer.scale) != tuple(scale):
+            preview_layer.scale = scale
+        if tuple(preview_layer.translate) != tuple(translate):
+            preview_layer.translate = translate
 
+        self._live_latency.mark_layer()
         self._update_max_min()
 
-        if self.streaming_timer is None:
+        if not self._live_pump.is_running():
             self.viewer.reset_view()
 
+    def _on_live_frame(
+        self, data: np.ndarray, scale: tuple, translate: tuple, channel: int
+    ):
+        names = self._live_pump.channel_names
+        name = f"preview_{names[channel]}" if len(names) > 1 else "preview"
+        self._live_latency.begin_update(channel)
+        self.update_viewer(data, scale, translate, name)
+        self._live_latency.end_update()
+        self._live_pump.frame_consumed(channel)
+
+    def _on_live_stats(self, stats: LiveStats):
+        self.tab_wdg.live_fps_label.setText(str(stats))
+        if self._live_recorder is not None:
+            self.tab_wdg.record_status_label.setText(str(self._live_recorder))
+        if hasattr(self, "_latency_panel") and self._latency_panel.isVisible():
+            self._latency_panel.refresh(stats)
+
+    def _on_max_fps_changed(self, value: int):
+        self._live_pump.max_fps = value
+
+    def _update_live_filter(self):
+        """Replace the live temporal filter to match the filter widgets."""
+        filter_cls = FILTERS.get(self.tab_wdg.live_filter_comboBox.currentText())
+        n_frames = self.tab_wdg.live_filter_frames_spinBox.value()
+        self._live_pump.filter = filter_cls(n_frames) if filter_cls else None
+
+    def _update_preview_view(self, event=None):
+        """Only send the live preview what the canvas can show at the current zoom."""
+        mode = self.tab_wdg.preview_mode_comboBox.currentText()
+        if mode not in ("stride", "bin"):
+            self._live_pump.view = PreviewView()
+            return
+        self._live_pump.view = preview_view(
+            (self._mmc.getImageHeight(), self._mmc.getImageWidth()),
+            self.viewer._canvas_size,
+            self.viewer.camera.zoom,
+            self.viewer.camera.center[-2:],
+            mode=mode,
+        )
+
     def _update_max_min(self, event=None):
 
         if self.tab_wdg.tabWidget.currentIndex() != 0:
@@ -210,17 +376,76 @@ class MainWindow(MicroManagerWidget):
         create_worker(self._mmc.snap, _start_thread=True)
 
     def _start_live(self):
-        self.streaming_timer = QTimer()
-        self.streaming_timer.timeout.connect(self.update_viewer)
-        self.streaming_timer.start(int(self._mmc.getExposure()))
+        self._update_preview_view()
+        self._live_pump.start()
 
     def _stop_live(self):
-        if self.streaming_timer:
-            self.streaming_timer.stop()
-            self.streaming_timer = None
+        if self._live_pump.is_running():
+            self._live_pump.stop()
+            self._on_live_stats(self._live_pump.stats)
+        if not self._restarting_live:
+            self._stop_record()
+
+    def _set_record_dir(self):
+        save_dir = QtW.QFileDialog.getExistingDirectory(self)
+        if save_dir:
+            self.tab_wdg.record_dir_lineEdit.setText(save_dir)
+
+    def _toggle_record(self, checked: bool):
+        if checked:
+            self._start_record()
+        else:
+            self._stop_record()
+
+    def _start_record(self):
+        """Start streaming live frames to a new zarr store (and live mode if off)."""
+        save_dir = self.tab_wdg.record_dir_lineEdit.text()
+        if not save_dir or not Path(save_dir).is_dir():
+            self.tab_wdg.record_Button.setChecked(False)
+            raise ValueError("Select a valid directory to record to.")
+
+        path = ensure_unique(Path(save_dir) / "live", extension=".zarr", folder=True)
+        self._live_recorder = LiveRecorder(
+            path, channel_names=self._mmc.getCameraChannelNames()
+        )
+        self._live_recorder.start()
+        self._live_pump.recorder = self._live_recorder
+        self.tab_wdg.record_status_label.setText(f"recording to {path.name}")
+
+        if not self._mmc.isSequenceRunning():
+            self._mmc.startContinuousSequenceAcquisition()
+
+    def _stop_record(self):
+        recorder, self._live_recorder = self._live_recorder, None
+        if recorder is None:
+            return
+        self._live_pump.recorder = None
+        self.tab_wdg.record_Button.setChecked(False)
+        # flushing the queued frames may take a while: don't block the UI
+        create_worker(
+            recorder.stop,
+            _start_thread=True,
+            _connect={
+                "finished": partial(self._on_record_stopped, recorder),
+                "errored": partial(self._on_record_failed, recorder),
+            },
+        )
+
+    def _on_record_stopped(self, recorder: LiveRecorder):
+        if recorder.error is not None:
+            return
+        self.tab_wdg.record_status_label.setText(
+            f"{recorder} | saved {recorder.path.name}"
+        )
+
+    def _on_record_failed(self, recorder: LiveRecorder, error: Exception):
+        self.tab_wdg.record_status_label.setText(
+            f"{recorder} | failed, {recorder.path.name} is incomplete"
+        )
+        show_error(f"Recording to {recorder.path.name!r} failed: {error}")
 
     def _update_mda_engine(self, newEngine: PMDAEngine, oldEngine: PMDAEngine):
-        oldEngine.events.frameReady.connect(self._on_mda_frame)
+        oldEngine.events.frameReady.disconnect(self._on_mda_frame)
         oldEngine.events.sequenceStarted.disconnect(self._on_mda_started)
         oldEngine.events.sequenceFinished.disconnect(self._on_mda_finished)
 
@@ -228,28 +453,56 @@ class MainWindow(MicroManagerWidget):
         newEngine.events.sequenceStarted.connect(self._on_mda_started)
         newEngine.events.sequenceFinished.connect(self._on_mda_finished)
 
-    @ensure_main_thread
     def _on_mda_started(self, sequence: useq.MDASequence):
-        """Create temp folder and block gui when mda starts."""
-        self._set_enabled(False)
+        """Create temp folder and block gui when mda starts.
 
-        self._mda_meta = _mda.SEQUENCE_META.get(sequence, _mda.SequenceMeta())
+        This runs on the thread that started the MDA, so that the zarr stores
+        exist before the first frame arrives. Only the layers are added on the
+        main thread.
+        """
+        meta = _mda.SEQUENCE_META.get(sequence, _mda.SequenceMeta())
+        if meta.should_save:
+            try:
+                get_writer(meta.file_format, meta.compression)
+            except ValueError as e:
+                # fail before any frame is acquired rather than when saving
+                self._mmc.mda.cancel()
+                show_error(f"Cannot save {meta.file_name!r}, MDA cancelled: {e}")
+                meta = dataclasses.replace(meta, should_save=False)
+                _mda.SEQUENCE_META[sequence] = meta
+        self._mda_meta = meta
+        self._mda_files = None
+        self._mda_store_path = None
+        self._mda_writer.configure(self._mda_meta.buffer_size, self._mda_meta.overflow)
+        self._mda_writer.reset_stats()
         if self._mda_meta.mode == "explorer":
-            # shortcircuit - nothing to do
+            # one layer per channel, the tiles are pasted into it
+            canvases = self._create_explorer_canvases(sequence)
+            self._add_explorer_layers(sequence, canvases)
             return
         elif self._mda_meta.mode == "":
             # originated from user script - assume it's an mda
             self._mda_meta.mode = "mda"
 
+        self._mda_cameras = self._camera_channels()
+
         # work out what the shapes of the layers will be
         # this depends on whether the user selected Split Channels or not
         shape, channels, labels = self._interpret_split_channels(sequence)
 
-        # acutally create the viewer layers backed by zarr stores
-        self._add_mda_channel_layers(tuple(shape), channels, sequence)
-
-        # set axis_labels after adding the images to ensure that the dims exist
-        self.viewer.dims.axis_labels = labels
+        # acutally create the zarr stores, and the viewer layers they back
+        self._mda_t0 = time.perf_counter()
+        stores = self._create_mda_stores(tuple(shape), channels, sequence, labels)
+        if not is_until_stopped(sequence):
+            # frames also go straight to their files, if the format allows it
+            self._mda_files = open_mda_files(
+                sequence,
+                self._mda_meta,
+                tuple(shape),
+                f"uint{self._mmc.getImageBitDepth()}",
+                {id_: (ch_id, cam) for id_, (_, ch_id, cam) in stores.items()},
+            )
+        self._add_mda_channel_layers(sequence, stores, labels)
 
     def _interpret_split_channels(
         self, sequence: MDASequence
@@ -280,43 +533,214 @@ class MainWindow(MicroManagerWidget):
 
         return shape, channels, labels
 
-    def _add_mda_channel_layers(
-        self, shape: Tuple[int, ...], channels: List[str], sequence: MDASequence
-    ):
-        """Create Zarr stores to back MDA and display as new viewer layer(s).
+    def _camera_channels(self) -> List[str]:
+        """Return the layer suffix of each camera channel.
+
+        `[""]` with a single camera, so that layer names don't change.
+        """
+        names = self._mmc.getCameraChannelNames()
+        if len(names) <= 1:
+            return [""]
+        return [f"_{name}" for name in names]
+
+    def _create_mda_stores(
+        self,
+        shape: Tuple[int, ...],
+        channels: List[str],
+        sequence: MDASequence,
+        labels: List[str],
+    ) -> Dict[str, Tuple[MDAStore, str, str]]:
+        """Create Zarr stores to back MDA viewer layer(s).
 
         If splitting on Channels then channels will look like ["BF", "GFP",...]
         and if we do not split on channels it will look like [""] and only one
-        layer/zarr store will be created.
+        layer/zarr store will be created.  With a multi-channel camera, one
+        layer is created for each camera channel too.  Chunking and compression
+        are taken from the sequence metadata (see `SequenceMeta.chunks`), and the
+        time axis is allocated in blocks (see `GrowingStore`).
+
+        When the MDA is saved as (OME-)zarr, the stores are the arrays of the
+        destination group itself rather than temporary ones.  With
+        `SequenceMeta.multiscale`, images larger than `MIN_LEVEL_SIZE` get a
+        `Pyramid` of 2x downsampled levels, which are written along with each
+        frame and displayed as a multiscale layer.
+
+        Returns a mapping of store id -> (store, layer `ch_id`, camera channel).
         """
+        meta = self._mda_meta
         dtype = f"uint{self._mmc.getImageBitDepth()}"
+        root = create_mda_store(sequence, meta) if meta.saves_in_place else None
+        if root is not None:
+            self._mda_store_path = Path(root.store.path)
+        # per-frame metadata, stored next to the images when saving to zarr
+        self._mda_frame_index = FrameIndex(
+            root.create_group("frame_index") if root is not None else None
+        )
+
+        # the time axis starts with one block and grows as frames arrive
+        t_axis = labels.index("t") if "t" in labels else None
+        n_t: Optional[int] = None
+        if t_axis is not None:
+            n_t = None if is_until_stopped(sequence) else shape[t_axis]
+            shape = list(shape)
+            shape[t_axis] = min(meta.t_block, n_t or meta.t_block)
+            shape = tuple(shape)
+
+        # full resolution + 2x binned levels for big images (see `Pyramid`)
+        shapes = pyramid_shapes(shape) if meta.multiscale else [shape]
 
         # create a zarr store for each channel (or all channels when not splitting)
-        # to store the images to display so we don't overflow memory.
-        for i, channel in enumerate(channels):
-            id_ = str(sequence.uid) + channel
-            tmp = tempfile.TemporaryDirectory()
-
-            # keep track of temp files so we can clean them up when we quit
-            # we can't have them auto clean up because then the zarr wouldn't last
-            # till the end
-            # TODO: when the layer is deleted we should release the zarr store.
-            self._mda_temp_files[id_] = tmp
-            self._mda_temp_arrays[id_] = z = zarr.open(
-                str(tmp.name), shape=shape, dtype=dtype
+        # and camera to store the images to display so we don't overflow memory.
+        stores: Dict[str, Tuple[MDAStore, str, str]] = {}
+        layer_ids = [(c, cam) for cam in self._mda_cameras for c in channels]
+        for i, (channel, camera) in enumerate(layer_ids):
+            id_ = str(sequence.uid) + channel + camera
+            levels: List[zarr.Array] = []
+            if root is not None:
+                levels = create_mda_arrays(
+                    root,
+                    (channel + camera).lstrip("_") or "data",
+                    shapes,
+                    dtype,
+                    labels,
+                    meta,
+                    self._mda_scale(sequence, labels),
+                )
+            if len(levels) < len(shapes):
+                tmp = tempfile.TemporaryDirectory()
+
+                # keep track of temp files so we can clean them up when we quit
+                # we can't have them auto clean up because then the zarr wouldn't
+                # last till the end
+                # TODO: when the layer is deleted we should release the zarr store.
+                self._mda_temp_files[id_] = tmp
+                for n in range(len(levels), len(shapes)):
+                    levels.append(
+                        zarr.open(
+                            os.path.join(tmp.name, str(n)),
+                            shape=shapes[n],
+                            dtype=dtype,
+                            chunks=meta.chunks(shapes[n]),
+                            compressor=meta.store_compressor(),
+                        )
+                    )
+            z = levels[0] if len(levels) == 1 else Pyramid(levels)
+            if t_axis is not None:
+                z = GrowingStore(z, t_axis, meta.t_block, n_t)
+            self._mda_temp_arrays[id_] = z
+            # storing event.index in addition to channel.config because it's
+            # possible to have two of the same channel in one sequence.
+            stores[id_] = (z, f"{channel}{camera}_idx{i}", camera.lstrip("_"))
+        return stores
+
+    def _create_explorer_canvases(
+        self, sequence: MDASequence
+    ) -> Dict[str, Tuple[TileCanvas, str, int]]:
+        """Create the canvas of each channel (and camera) of an explorer scan.
+
+        Returns a mapping of layer id -> (canvas, layer `ch_name`, `ch_id`).
+        Canvases too large for memory are zarr arrays in temporary directories.
+        """
+        px = self.explorer.pixel_size
+        # top left corner of each tile, the stage y axis points up
+        origins = [(-pos.y / px, pos.x / px) for pos in sequence.stage_positions]
+        tile_shape = (self._mmc.getImageHeight(), self._mmc.getImageWidth())
+        dtype = f"uint{self._mmc.getImageBitDepth()}"
+
+        self._explorer_canvases.clear()
+        self._explorer_blank.clear()
+        canvases: Dict[str, Tuple[TileCanvas, str, int]] = {}
+        for camera in self._camera_channels():
+            for ch_id, channel in enumerate(sequence.channels):
+                ch_name = f"{channel.config}{camera}"
+                id_ = f"{sequence.uid}_{ch_name}_idx{ch_id}"
+                tmp = tempfile.TemporaryDirectory()
+                self._mda_temp_files[id_] = tmp
+                canvas = TileCanvas(origins, tile_shape, dtype, tmp.name)
+                self._explorer_canvases[id_] = canvas
+                self._explorer_blank.add(canvas)
+                canvases[id_] = (canvas, ch_name, ch_id)
+        return canvases
+
+    def _mda_scale(self, sequence: MDASequence, labels: List[str]) -> List[float]:
+        """Return the physical step (um) along each axis of an MDA layer."""
+        px = self._mmc.getPixelSizeUm() or 1.0
+        z_step = getattr(sequence.z_plan, "step", None) or 1.0
+        sizes = {"z": z_step, "y": px, "x": px}
+        return [sizes.get(label, 1.0) for label in labels]
+
+    @ensure_main_thread
+    def _add_explorer_layers(
+        self,
+        sequence: MDASequence,
+        canvases: Dict[str, Tuple[TileCanvas, str, int]],
+    ):
+        """Block the gui and display the explorer `canvases` as new viewer layers."""
+        self._set_enabled(False)
+
+        fname = self._mda_meta.file_name if self._mda_meta.should_save else "Exp"
+        for canvas, ch_name, ch_id in canvases.values():
+            self.viewer.add_image(
+                canvas.levels if len(canvas.levels) > 1 else canvas.levels[0],
+                name=f"{fname}_{ch_name}_idx{ch_id}",
+                blending="additive",
+                multiscale=len(canvas.levels) > 1,
+                translate=canvas.offset,
+                metadata=dict(
+                    useq_sequence=sequence,
+                    uid=sequence.uid,
+                    pixel_size=self.explorer.pixel_size,
+                    ch_name=ch_name,
+                    ch_id=ch_id,
+                    explorer_canvas=canvas,
+                ),
             )
-            fname = self._mda_meta.file_name if self._mda_meta.should_save else "Exp"
-            layer = self.viewer.add_image(z, name=f"{fname}_{id_}", blending="additive")
+
+        zoom_out_factor = max(self.explorer.scan_size_r, self.explorer.scan_size_c)
+        self.viewer.camera.zoom = 1 / zoom_out_factor
+        self.viewer.reset_view()
+
+    @ensure_main_thread
+    def _add_mda_channel_layers(
+        self,
+        sequence: MDASequence,
+        stores: Dict[str, Tuple[MDAStore, str, str]],
+        labels: Optional[List[str]] = None,
+    ):
+        """Block the gui and display the MDA `stores` as new viewer layer(s)."""
+        self._set_enabled(False)
+
+        fname = self._mda_meta.file_name if self._mda_meta.should_save else "Exp"
+        for id_, (z, ch_id, camera) in stores.items():
+            # a `GrowingStore` is displayed through views that don't read while
+            # it is being resized
+            levels = getattr(z, "views", getattr(z, "levels", [z]))
+            layer = self.viewer.add_image(
+                levels if len(levels) > 1 else levels[0],
+                name=f"{fname}_{id_}",
+                blending="additive",
+                multiscale=len(levels) > 1,
+            )
+
+            self._mda_layer_shapes[layer] = levels[0].shape
 
             # add metadata to layer
-            # storing event.index in addition to channel.config because it's
-            # possible to have two of the same channel in one sequence.
             layer.metadata["useq_sequence"] = sequence
             layer.metadata["uid"] = sequence.uid
-            layer.metadata["ch_id"] = f"{channel}_idx{i}"
+            layer.metadata["ch_id"] = ch_id
+            layer.metadata["camera"] = camera
+            layer.metadata["frame_index"] = self._mda_frame_index
+
+        if labels:
+            # set axis_labels after adding the images to ensure that the dims exist
+            self.viewer.dims.axis_labels = labels
 
-    @ensure_main_thread
     def _on_mda_frame(self, image: np.ndarray, event: useq.MDAEvent):
+        """Queue `image` for writing in its store (mda) or canvas (explorer).
+
+        This runs on the MDA thread: the GUI only gets a throttled notification
+        of the latest written frame (see `_on_mda_frames_written`).
+        """
         meta = self._mda_meta
         if meta.mode == "mda":
             axis_order = list(event_indices(event))
@@ -331,71 +755,169 @@ class MainWindow(MicroManagerWidget):
                     axis_order.remove("c")
 
             # get the actual index of this image into the array and
-            # add it to the zarr store
-            im_idx = tuple(event.index[k] for k in axis_order)
-            self._mda_temp_arrays[str(event.sequence.uid) + channel][im_idx] = image
-
-            # move the viewer step to the most recently added image
-            for a, v in enumerate(im_idx):
-                self.viewer.dims.set_point(a, v)
-        elif meta.mode == "explorer":
+            # add it to the zarr store (on the writer thread)
+            camera = event.metadata.get(CAMERA_KEY)
+            camera = f"_{camera}" if camera else ""
 
-            seq = event.sequence
-
-            meta = _mda.SEQUENCE_META.get(seq) or _mda.SequenceMeta()
-            if meta.mode != "explorer":
-                return
-
-            x = event.x_pos / self.explorer.pixel_size
-            y = event.y_pos / self.explorer.pixel_size * (-1)
-
-            pos_idx = event.index["p"]
-            file_name = meta.file_name if meta.should_save else "Exp"
-            ch_name = event.channel.config
-            ch_id = event.index["c"]
-            layer_name = f"Pos{pos_idx:03d}_{file_name}_{ch_name}_idx{ch_id}"
-
-            _metadata = dict(
-                useq_sequence=seq,
-                uid=seq.uid,
-                scan_coord=(y, x),
-                scan_position=f"Pos{pos_idx:03d}",
-                ch_name=ch_name,
-                ch_id=ch_id,
-            )
-            self.viewer.add_image(
+            im_idx = tuple(event.index[k] for k in axis_order)
+            received = time.perf_counter() - self._mda_t0
+            key = str(event.sequence.uid) + channel + camera
+            store = self._mda_temp_arrays[key]
+            if self._mda_files is not None:
+                store = self._mda_files.mirror(key, store)
+            # when the buffer is full, frames that are only displayed may be
+            # dropped (depending on `meta.overflow`), saved ones never are
+            queued = self._mda_writer.put(
+                store,
+                im_idx,
                 image,
-                name=layer_name,
-                blending="additive",
-                translate=(y, x),
-                metadata=_metadata,
+                (event.sequence.uid, im_idx),
+                droppable=not meta.should_save,
             )
+            # only frames that are in the store are indexed
+            if queued:
+                self._mda_frame_index.append(event, received)
+        elif meta.mode == "explorer":
+            self._add_explorer_tile(image, event)
+
+    def _on_mda_frames_written(self, tag: Tuple[str, tuple]):
+        """Move the viewer step to the most recently written image."""
+        uid, im_idx = tag
+        if im_idx is None:
+            # an explorer tile, see `_add_explorer_tile`
+            self._refresh_explorer_layers(uid)
+            return
+        self._update_mda_layer_shapes(uid)
+        step = self.viewer.dims.current_step
+        for a, v in enumerate(im_idx):
+            self.viewer.dims.set_point(a, v)
+        if self.viewer.dims.current_step == step:
+            # the displayed plane itself got new data
+            for layer in self.viewer.layers:
+                if layer.metadata.get("uid") == uid:
+                    layer.refresh()
 
-            zoom_out_factor = (
-                self.explorer.scan_size_r
-                if self.explorer.scan_size_r >= self.explorer.scan_size_c
-                else self.explorer.scan_size_c
-            )
-            self.viewer.camera.zoom = 1 / zoom_out_factor
-            self.viewer.reset_view()
+    @ensure_main_thread
+    def _update_mda_layer_shapes(self, uid: str):
+        """Let the layers of MDA `uid` know that their stores were resized."""
+        for layer in self.viewer.layers:
+            if layer.metadata.get("uid") != uid:
+                continue
+            data = layer.data[0] if layer.multiscale else layer.data
+            if self._mda_layer_shapes.get(layer) != data.shape:
+                # napari only looks at the shape when the data is set
+                layer.data = layer.data
+                self._mda_layer_shapes[layer] = data.shape
+
+    def _add_explorer_tile(self, image: np.ndarray, event: useq.MDAEvent):
+        """Queue pasting the explorer tile `image` in the canvas of its channel."""
+        ch_name = event.channel.config
+        if event.metadata.get(CAMERA_KEY):
+            ch_name += f"_{event.metadata[CAMERA_KEY]}"
+        canvas = self._explorer_canvases[
+            f"{event.sequence.uid}_{ch_name}_idx{event.index['c']}"
+        ]
+        self._mda_writer.put(
+            canvas,
+            event.index["p"],
+            image,
+            (event.sequence.uid, None),
+            droppable=not self._mda_meta.should_save,
+        )
+
+    def _refresh_explorer_layers(self, uid: str):
+        """Show the tiles pasted so far in the canvases of explorer scan `uid`."""
+        for layer in self.viewer.layers:
+            canvas = layer.metadata.get("explorer_canvas")
+            if canvas is None or layer.metadata.get("uid") != uid:
+                continue
+            if canvas in self._explorer_blank and canvas.acquired.any():
+                # the layer was created empty
+                layer.reset_contrast_limits()
+                self._explorer_blank.discard(canvas)
+            layer.refresh()
 
     def _on_mda_finished(self, sequence: useq.MDASequence):
-        """Save layer and add increment to save name."""
-        meta = _mda.SEQUENCE_META.get(sequence) or _mda.SequenceMeta()
+        """Write the last frames of the MDA and trim its stores.
+
+        This runs on the MDA thread, so the GUI isn't blocked while the writer
+        catches up.  The rest is done on the main thread by `_finish_mda`.
+        """
         seq_uid = sequence.uid
-        if meta.mode == "explorer":
-
-            layergroups = defaultdict(set)
-            for lay in self.viewer.layers:
-                if lay.metadata.get("uid") == seq_uid:
-                    key = f"{lay.metadata['ch_name']}_idx{lay.metadata['ch_id']}"
-                    layergroups[key].add(lay)
-            for group in layergroups.values():
-                link_layers(group)
         meta = _mda.SEQUENCE_META.pop(sequence, self._mda_meta)
-        save_sequence(sequence, self.viewer.layers, meta)
-        # reactivate gui when mda finishes.
+        # every frame must be in the stores before saving them
+        self._mda_writer.flush()
+        # drop the time points that were allocated but not acquired
+        for key, store in self._mda_temp_arrays.items():
+            if key.startswith(str(seq_uid)) and isinstance(store, GrowingStore):
+                store.trim()
+        # the next MDA may start before `_finish_mda` runs
+        files, self._mda_files = self._mda_files, None
+        failed = (self._mda_writer.frames_failed, self._mda_writer.error)
+        self._finish_mda(
+            sequence, meta, files, self._mda_frame_index, failed, self._mda_store_path
+        )
+
+    @ensure_main_thread
+    def _finish_mda(
+        self,
+        sequence: useq.MDASequence,
+        meta: _mda.SequenceMeta,
+        files: Optional[MDAFiles],
+        frame_index: FrameIndex,
+        failed: Tuple[int, Optional[Exception]],
+        store_path: Optional[Path] = None,
+    ):
+        """Save layer and add increment to save name.
+
+        `store_path` is the zarr group the MDA was acquired into, if it was saved
+        in place.
+        """
+        self._update_mda_layer_shapes(sequence.uid)
+        # reactivate gui when mda finishes, saving happens in the background
         self._set_enabled(True)
+        n_failed, error = failed
+        if n_failed and meta.should_save:
+            # don't save an acquisition with holes
+            if files is not None:
+                files.discard()
+            # the frames acquired in place are kept, but not finalized
+            outcome = (
+                f"the incomplete store was left at {store_path}"
+                if store_path is not None
+                else "the acquisition was not saved"
+            )
+            show_error(
+                f"{n_failed} frame(s) of {meta.file_name!r} could not be written "
+                f"({error}), {outcome}."
+            )
+        elif files is not None:
+            # the frames are already in their files
+            files.close(frame_index)
+        elif meta.should_save:
+            self._saver.submit(sequence, list(self.viewer.layers), meta)
+
+    def _on_save_started(self, name: str):
+        queued = self._saver.pending - 1
+        self.save_status_label.setText(
+            f"saving {name}" + (f" ({queued} more queued)" if queued > 0 else "")
+        )
+        self.save_progressBar.setRange(0, 0)
+        self.save_wdg.show()
+
+    def _on_save_progress(self, done: int, total: int):
+        self.save_progressBar.setRange(0, total)
+        self.save_progressBar.setValue(done)
+
+    def _on_save_finished(self, result: SaveResult):
+        if result.cancelled:
+            show_warning(f"Saving {result.name!r} was cancelled.")
+        elif result.error is not None:
+            show_error(f"Could not save {result.name!r}: {result.error}")
+        else:
+            show_info(f"Saved {result.name!r} in {result.elapsed:.1f} s.")
+        if not self._saver.is_busy():
+            self.save_wdg.hide()
 
     def _get_event_explorer(self, viewer, event):
         if not self.explorer.isVisible():
@@ -418,7 +940,11 @@ class MainWindow(MicroManagerWidget):
         self.explorer.y_lineEdit.setText(y)
 
     def _update_live_exp(self, camera: str, exposure: float):
-        if self.streaming_timer:
-            self.streaming_timer.setInterval(int(exposure))
-            self._mmc.stopSequenceAcquisition()
+        if self._live_pump.is_running():
+            # keep recording across the restart
+            self._restarting_live = True
+            try:
+                self._mmc.stopSequenceAcquisition()
+            finally:
+                self._restarting_live = False
             self._mmc.startContinuousSequenceAcquisition(exposure)
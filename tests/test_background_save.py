@@ -0,0 +1,92 @@
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import tifffile
+from useq import MDASequence
+
+from micromanager_gui._background_save import BackgroundSaver
+from micromanager_gui._mda import SequenceMeta
+from micromanager_gui._saving import SaveCancelled, save_sequence
+
+
+class _Gated:
+    """Array-like whose reads block until `gate` is set, after the first one."""
+
+    def __init__(self, data):
+        self.data = data
+        self.shape = data.shape
+        self.dtype = data.dtype
+        self.reading = threading.Event()
+        self.gate = threading.Event()
+
+    def __getitem__(self, key):
+        self.reading.set()
+        self.gate.wait()
+        return self.data[key]
+
+
+def _mda(tmp_path: Path, data, name="exp"):
+    sequence = MDASequence(time_plan={"loops": data.shape[0]})
+    layer = SimpleNamespace(data=data, multiscale=False, metadata={"uid": sequence.uid})
+    meta = SequenceMeta(
+        mode="mda", should_save=True, file_name=name, save_dir=str(tmp_path)
+    )
+    return sequence, [layer], meta
+
+
+def test_background_saver(qtbot, tmp_path: Path):
+    saver = BackgroundSaver()
+    progress, results = [], []
+    saver.progressChanged.connect(lambda *a: progress.append(a))
+    saver.jobFinished.connect(results.append)
+
+    data = np.ones((3, 1, 1, 8, 8), dtype="uint16")
+    with qtbot.waitSignal(saver.jobFinished):
+        saver.submit(*_mda(tmp_path, data))
+    assert not saver.is_busy()
+    assert [r.ok for r in results] == [True]
+    assert progress == [(0, 1), (1, 1)]
+    np.testing.assert_array_equal(tifffile.imread(tmp_path / "exp_000.tif"), 1)
+
+
+def test_background_saver_cancel(qtbot, tmp_path: Path):
+    saver = BackgroundSaver()
+    results = []
+    saver.jobFinished.connect(results.append)
+
+    gated = _Gated(np.ones((3, 1, 1, 8, 8), dtype="uint16"))
+    saver.submit(*_mda(tmp_path, gated, "first"))
+    saver.submit(*_mda(tmp_path, np.ones((2, 1, 1, 8, 8), "uint16"), "second"))
+    assert gated.reading.wait(5)
+    assert saver.pending == 2
+
+    saver.cancel()
+    gated.gate.set()
+    assert saver.wait(timeout=5)
+    qtbot.waitUntil(lambda: len(results) == 2)
+
+    assert [(r.name, r.cancelled) for r in results] == [
+        ("first", True),
+        ("second", True),
+    ]
+    # the partial file is removed and the queued acquisition is not saved
+    assert list(tmp_path.iterdir()) == []
+
+    # cancelling doesn't affect acquisitions submitted afterwards
+    with qtbot.waitSignal(saver.jobFinished) as blocker:
+        saver.submit(*_mda(tmp_path, np.ones((2, 1, 1, 8, 8), "uint16"), "third"))
+    assert blocker.args[0].ok
+    assert [p.name for p in tmp_path.iterdir()] == ["third_000.tif"]
+
+
+def test_save_sequence_cancelled(tmp_path: Path):
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(SaveCancelled):
+        save_sequence(
+            *_mda(tmp_path, np.ones((2, 1, 1, 8, 8), "uint16")), cancel=cancel
+        )
+    assert list(tmp_path.iterdir()) == []
@@ -64,22 +64,19 @@ def test_explorer(explorer_one_channel: ExplorerTuple, qtbot: QtBot):
     assert meta
     assert meta.mode == "explorer"
 
-    assert main_win.viewer.layers[-1].data.shape == (512, 512)
-    assert len(main_win.viewer.layers) == 4
+    # the 4 tiles are pasted in one layer
+    assert len(main_win.viewer.layers) == 1
 
     _layer = main_win.viewer.layers[-1]
     assert _layer.metadata["ch_name"] == "Cy5"
     assert _layer.metadata["ch_id"] == 0
     assert _layer.metadata["uid"] == sequence.uid
 
-    # checking the linking  of the layers
-    assert len(main_win.viewer.layers) == 4
-    layer_0 = main_win.viewer.layers[0]
-    layer_0.visible = False
-
-    # check that also the last layer is not visible
-    layer_1 = main_win.viewer.layers[1]
-    assert not layer_1.visible
+    canvas = _layer.metadata["explorer_canvas"]
+    assert canvas.shape == (1024, 1024)
+    assert canvas.acquired.all()
+    assert canvas.tiles.shape == (4, 512, 512)
+    assert tuple(_layer.translate) == (-256.0, -256.0)
 
 
 def test_saving_explorer(qtbot: QtBot, explorer_two_channel: ExplorerTuple):
@@ -106,9 +103,10 @@ def test_saving_explorer(qtbot: QtBot, explorer_two_channel: ExplorerTuple):
             [mmc.mda.events.sequenceStarted, mmc.mda.events.sequenceFinished]
         ):
             explorer.start_scan_Button.click()
+        assert main_win._saver.wait(timeout=10)
 
         layer_list = list(main_win.viewer.layers)
-        assert len(layer_list) == 8
+        assert len(layer_list) == 2
 
         save_sequence(sequence, layer_list, meta)
 
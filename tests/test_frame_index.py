@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+import zarr
+from useq import MDASequence
+
+from micromanager_gui._frame_index import COLUMNS, FrameIndex
+from micromanager_gui._mda_engine import camera_event
+
+MDA = MDASequence(
+    time_plan={"interval": 1, "loops": 5},
+    stage_positions=[(0, 0, 0), (10, 20, 5)],
+    channels=["DAPI", {"config": "FITC", "exposure": 20}],
+)
+
+
+def _fill(index: FrameIndex):
+    for i, event in enumerate(MDA):
+        index.append(camera_event(event, "cam", 0) if i % 2 else event, i * 0.1)
+
+
+def test_frame_index():
+    index = FrameIndex(block=4)
+    _fill(index)
+    assert len(index) == len(list(MDA)) == 20
+    assert index.channels == ["DAPI", "FITC"]
+    assert index.cameras == ["cam"]
+    assert set(index["z"]) == {-1}
+    assert np.isnan(index["exposure_ms"][0]) and index["exposure_ms"][1] == 20
+
+    rows = index.select(p=1, t=(1, 3))
+    assert len(rows["t"]) == 6
+    assert set(rows["t"]) == {1, 2, 3}
+    np.testing.assert_array_equal(rows["x_um"], 10)
+    assert set(rows["camera"]) == {-1, 0}
+    assert index.mask(channel="FITC").sum() == 10
+    assert not index.mask(channel="Cy5").any()
+    with pytest.raises(ValueError):
+        index.mask(q=1)
+
+
+def test_frame_index_storage(tmp_path):
+    group = zarr.open_group(str(tmp_path / "frames.zarr"), mode="w")
+    index = FrameIndex(group, block=8)
+    _fill(index)
+    # written in blocks, then on flush
+    assert group["t"].shape == (16,)
+    index.flush()
+    assert group["t"].shape == (20,)
+
+    index.save(tmp_path / "frames.npz")
+    for source in (tmp_path / "frames.npz", tmp_path / "frames.zarr", group):
+        loaded = FrameIndex.load(source)
+        assert len(loaded) == 20
+        assert loaded.channels == ["DAPI", "FITC"]
+        for column in COLUMNS:
+            np.testing.assert_array_equal(loaded[column], index[column])
+        # loaded indices keep growing
+        loaded.append(next(iter(MDA)), 99)
+        assert len(loaded) == 21
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from micromanager_gui._live import FrameRing, PreviewView, preview_view, reduce_frame
+
+if TYPE_CHECKING:
+    from pytestqt.qtbot import QtBot
+
+    from micromanager_gui.main_window import MainWindow
+
+
+def test_live_pump(main_window: MainWindow, qtbot: QtBot):
+    mmc = main_window._mmc
+    pump = main_window._live_pump
+    assert not pump.is_running()
+
+    main_window.tab_wdg.max_fps_spinBox.setValue(10)
+    assert pump.max_fps == 10
+
+    mmc.setExposure(5)
+    with qtbot.waitSignal(pump.frameReady, timeout=2000):
+        mmc.startContinuousSequenceAcquisition(0)
+    assert pump.is_running()
+
+    qtbot.waitUntil(lambda: pump.stats.displayed_frames > 2, timeout=2000)
+    assert main_window.viewer.layers["preview"].data.shape == (512, 512)
+
+    mmc.stopSequenceAcquisition()
+    assert not pump.is_running()
+
+    # the camera runs faster than the display cap, so frames must be dropped
+    stats = pump.stats
+    assert stats.camera_frames > stats.displayed_frames
+    assert stats.dropped_frames == stats.camera_frames - stats.displayed_frames
+    assert "dropped" in main_window.tab_wdg.live_fps_label.text()
+
+
+def test_frame_ring():
+    ring = FrameRing(n_buffers=2)
+    a = np.ones((4, 4), dtype="uint16")
+    b = ring.write(a)
+    assert b is not a
+    np.testing.assert_array_equal(a, b)
+
+    # buffers are reused in turn
+    c = ring.write(a * 2)
+    assert ring.write(a * 3) is b
+    assert ring.write(a * 4) is c
+    assert ring.nbytes == 2 * a.nbytes
+
+    # a new frame shape or dtype reallocates the ring
+    d = ring.write(np.zeros((8, 8), dtype="uint8"))
+    assert d.shape == (8, 8) and d.dtype == np.uint8
+    assert ring.nbytes == 2 * 64
+
+
+def test_preview_view():
+    # zoomed out to fit a 2048 frame in a 512 canvas: stride by 4, no crop
+    view = preview_view((2048, 2048), (512, 512), 0.25, (1024, 1024), margin=0)
+    assert view == PreviewView(4, None, "stride")
+
+    # zoomed in 2x on the center: full resolution crop of the visible region
+    view = preview_view((2048, 2048), (512, 512), 2, (1024, 1024), mode="bin")
+    assert view.factor == 1
+    assert view.mode == "bin"
+    y0, y1, x0, x1 = view.region
+    assert y0 <= 1024 - 128 and y1 >= 1024 + 128
+    assert x0 <= 1024 - 128 and x1 >= 1024 + 128
+    assert y1 - y0 < 2048
+
+
+def test_reduce_frame():
+    frame = np.arange(64, dtype="uint16").reshape(8, 8)
+
+    data, scale, translate = reduce_frame(frame, PreviewView())
+    assert data is not frame and np.shares_memory(data, frame)
+    assert data.shape == (8, 8) and scale == (1, 1) and translate == (0, 0)
+
+    data, scale, translate = reduce_frame(frame, PreviewView(2, (2, 8, 0, 4)))
+    np.testing.assert_array_equal(data, frame[2:8:2, 0:4:2])
+    assert scale == (2, 2) and translate == (2, 0)
+
+    data, scale, translate = reduce_frame(frame, PreviewView(2, mode="bin"))
+    assert data.shape == (4, 4) and data.dtype == frame.dtype
+    assert data[0, 0] == int(frame[:2, :2].mean())
+    assert translate == (0.5, 0.5)
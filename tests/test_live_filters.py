@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from micromanager_gui._live_filters import (
+    ExponentialMovingAverage,
+    RollingMax,
+    RunningMean,
+)
+
+FRAMES = [
+    np.random.default_rng(i).integers(0, 4096, (8, 6), dtype="uint16") for i in range(7)
+]
+
+
+def test_running_mean():
+    filt = RunningMean(3)
+    assert filt.result() is None
+    for i, frame in enumerate(FRAMES):
+        filt.update(frame)
+        expected = np.mean(FRAMES[max(i - 2, 0) : i + 1], axis=0)
+        np.testing.assert_allclose(filt.result(), expected, rtol=1e-6)
+    assert filt.result().dtype == np.float32
+
+
+def test_exponential_moving_average():
+    filt = ExponentialMovingAverage(4)
+    assert filt.alpha == pytest.approx(0.4)
+    expected = FRAMES[0].astype(float)
+    filt.update(FRAMES[0])
+    for frame in FRAMES[1:]:
+        filt.update(frame)
+        expected += filt.alpha * (frame - expected)
+    np.testing.assert_allclose(filt.result(), expected, rtol=1e-4)
+
+
+def test_rolling_max():
+    filt = RollingMax(2)
+    for i, frame in enumerate(FRAMES):
+        filt.update(frame)
+        expected = np.max(FRAMES[max(i - 1, 0) : i + 1], axis=0)
+        np.testing.assert_array_equal(filt.result(), expected)
+    assert filt.result().dtype == np.uint16
+
+
+def test_filter_reallocates_on_new_shape():
+    filt = RunningMean(3)
+    filt.update(FRAMES[0])
+    filt.update(FRAMES[1])
+    small = np.ones((2, 2), dtype="uint8")
+    filt.update(small)
+    assert filt.count == 1
+    np.testing.assert_array_equal(filt.result(), small)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import csv
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from micromanager_gui._live_latency import (
+    COLUMNS,
+    STAGES,
+    LatencyMonitor,
+    frame_timestamp,
+)
+
+if TYPE_CHECKING:
+    from pytestqt.qtbot import QtBot
+
+    from micromanager_gui.main_window import MainWindow
+
+
+def test_frame_timestamp():
+    now = datetime.now().isoformat()
+    t = frame_timestamp({"TimeReceivedByCore": now})
+    assert t is not None and abs(time.perf_counter() - t) < 1
+    assert frame_timestamp({}) is None
+    assert frame_timestamp({"TimeReceivedByCore": "not a time"}) is None
+
+
+def test_latency_monitor(tmp_path: Path):
+    monitor = LatencyMonitor(max_frames=3)
+    # nothing in flight: no-ops
+    monitor.begin_update(0)
+    monitor.mark_layer()
+    monitor.end_update()
+    monitor.frame_drawn()
+    assert not monitor.rows
+
+    for _ in range(5):
+        t = time.perf_counter()
+        monitor.frame_emitted(0, drained=t, camera=t - 0.01)
+        monitor.begin_update(0)
+        monitor.mark_layer()
+        monitor.end_update()
+        monitor.frame_drawn()
+    assert len(monitor.rows) == 3
+
+    summary = monitor.summary()
+    assert summary["camera"]["n"] == 3
+    camera_p50 = summary["camera"]["p50"]
+    assert 9 < camera_p50 < 11
+    assert summary["total"]["mean"] >= summary["camera"]["mean"]
+    assert summary["interval"]["n"] == 3
+    counts, _ = monitor.histogram("total", bins=5)
+    assert counts.sum() == 3
+
+    monitor.to_csv(tmp_path / "latency.csv")
+    with open(tmp_path / "latency.csv") as f:
+        rows = list(csv.reader(f))
+    assert tuple(rows[0]) == COLUMNS
+    assert len(rows) == 4
+
+    monitor.reset()
+    assert not monitor.rows
+    assert all(v["n"] == 0 for v in monitor.summary().values())
+    assert set(monitor.summary()) == {*STAGES, "interval"}
+
+
+def test_latency_panel(main_window: MainWindow, qtbot: QtBot):
+    main_window._show_latency_panel()
+    panel = main_window._latency_panel
+    assert main_window._live_pump.latency is main_window._live_latency
+
+    with qtbot.waitSignal(main_window._live_pump.statsUpdated, timeout=3000):
+        main_window._mmc.startContinuousSequenceAcquisition(10)
+    qtbot.waitUntil(lambda: len(main_window._live_latency.rows) > 2, timeout=3000)
+    main_window._mmc.stopSequenceAcquisition()
+
+    panel.refresh(main_window._live_pump.stats)
+    assert panel.table.item(0, 0).text() != "0"
+    panel.measure_checkBox.setChecked(False)
+    assert main_window._live_pump.latency is None
@@ -1,12 +1,22 @@
+import itertools
+import threading
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import numpy as np
 import pytest
+import zarr
 from pymmcore_plus.mda import MDAEngine
 from useq import MDASequence
 
 from micromanager_gui import _mda
+from micromanager_gui._frame_index import FrameIndex
+from micromanager_gui._mda_engine import (
+    UNTIL_STOPPED_KEY,
+    MultiCameraMDAEngine,
+    camera_event,
+    iter_events,
+)
 from micromanager_gui._util import event_indices
 from micromanager_gui.main_window import MainWindow
 
@@ -33,7 +43,144 @@ def test_main_window_mda(main_window: MainWindow):
     for event in mda:
         frame = np.random.rand(*img_shape)
         mmc.mda.events.frameReady.emit(frame, event)
-    assert main_window.viewer.layers[-1].data.shape == (4, 2, 4, 512, 512)
+    data = main_window.viewer.layers[-1].data
+    assert data.shape == (4, 2, 4, 512, 512)
+    # one uncompressed chunk per plane by default
+    assert data.chunks == (1, 1, 1, 512, 512)
+    assert data.compressor is None
+
+
+def test_main_window_mda_until_stopped(main_window: MainWindow, qtbot: "QtBot"):
+    mda = MDASequence(
+        time_plan={"loops": 1, "interval": 0},
+        channels=["DAPI"],
+        metadata={UNTIL_STOPPED_KEY: True},
+    )
+    _mda.SEQUENCE_META[mda] = _mda.SequenceMeta(mode="mda", t_block=4)
+    mmc = main_window._mmc
+    mmc.mda.events.sequenceStarted.emit(mda)
+    layer = main_window.viewer.layers[-1]
+    # the time axis starts with one block ...
+    assert layer.data.shape[0] == 4
+
+    img_shape = (mmc.getImageHeight(), mmc.getImageWidth())
+    for event in itertools.islice(iter_events(mda), 6):
+        frame = np.full(img_shape, event.index["t"] + 1, dtype="uint16")
+        mmc.mda.events.frameReady.emit(frame, event)
+    main_window._mda_writer.flush()
+    # ... grows by whole blocks, and the viewer follows
+    assert layer.data.shape[0] == 8
+    qtbot.waitUntil(lambda: main_window.viewer.dims.range[0][1] == 8)
+
+    # ... and is trimmed to the acquired time points at the end
+    mmc.mda.events.sequenceFinished.emit(mda)
+    assert layer.data.shape[0] == 6
+    np.testing.assert_array_equal(np.asarray(layer.data)[:, 0, 0, 0], range(1, 7))
+
+
+def test_mda_frame_index_skips_dropped_frames(
+    main_window: MainWindow, monkeypatch: pytest.MonkeyPatch
+):
+    mda = MDASequence(time_plan={"loops": 6, "interval": 0})
+    _mda.SEQUENCE_META[mda] = _mda.SequenceMeta(mode="mda", overflow="drop")
+    mmc = main_window._mmc
+    mmc.mda.events.sequenceStarted.emit(mda)
+
+    # the writer drops every odd time point
+    writer = main_window._mda_writer
+    put = writer.put
+    monkeypatch.setattr(
+        writer,
+        "put",
+        lambda store, index, *a, **k: not index[0] % 2 and put(store, index, *a, **k),
+    )
+    img_shape = (mmc.getImageHeight(), mmc.getImageWidth())
+    for event in mda:
+        mmc.mda.events.frameReady.emit(np.zeros(img_shape, "uint16"), event)
+    writer.flush()
+    np.testing.assert_array_equal(main_window._mda_frame_index["t"], [0, 2, 4])
+
+
+def test_mda_finished_on_mda_thread(
+    main_window: MainWindow, qtbot: "QtBot", monkeypatch: pytest.MonkeyPatch
+):
+    mda = MDASequence(time_plan={"loops": 2, "interval": 0})
+    _mda.SEQUENCE_META[mda] = _mda.SequenceMeta(
+        mode="mda", should_save=True, incremental=False
+    )
+    mmc = main_window._mmc
+    mmc.mda.events.sequenceStarted.emit(mda)
+    img_shape = (mmc.getImageHeight(), mmc.getImageWidth())
+    for event in mda:
+        mmc.mda.events.frameReady.emit(np.zeros(img_shape, "uint16"), event)
+
+    # the layers are read and the save submitted on the main thread
+    on_main = []
+    monkeypatch.setattr(
+        main_window._saver,
+        "submit",
+        lambda *a: on_main.append(
+            threading.current_thread() is threading.main_thread()
+        ),
+    )
+    thread = threading.Thread(target=mmc.mda.events.sequenceFinished.emit, args=(mda,))
+    thread.start()
+    thread.join()
+    qtbot.waitUntil(lambda: bool(on_main))
+    assert on_main == [True]
+
+
+def test_mda_unsupported_codec_fails_early(
+    main_window: MainWindow, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    mda = MDASequence(time_plan={"loops": 2, "interval": 0})
+    _mda.SEQUENCE_META[mda] = _mda.SequenceMeta(
+        mode="mda", should_save=True, save_dir=str(tmp_path), compression="zstd"
+    )
+    mmc = main_window._mmc
+    cancelled = []
+    monkeypatch.setattr(mmc.mda, "cancel", lambda: cancelled.append(True))
+    submitted = []
+    monkeypatch.setattr(main_window._saver, "submit", lambda *a: submitted.append(a))
+
+    # "tif" files can't be compressed: the MDA is cancelled before it starts
+    mmc.mda.events.sequenceStarted.emit(mda)
+    assert cancelled
+    mmc.mda.events.sequenceFinished.emit(mda)
+    assert not submitted
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_main_window_multi_camera_mda(main_window: MainWindow):
+    mmc = main_window._mmc
+    assert isinstance(mmc.mda, MultiCameraMDAEngine)
+
+    mmc.loadDevice("Camera2", "DemoCamera", "DCam")
+    mmc.loadDevice("Multi Camera", "Utilities", "Multi Camera")
+    mmc.initializeDevice("Camera2")
+    mmc.initializeDevice("Multi Camera")
+    mmc.setProperty("Multi Camera", "Physical Camera 1", "Camera")
+    mmc.setProperty("Multi Camera", "Physical Camera 2", "Camera2")
+    mmc.setCameraDevice("Multi Camera")
+    names = mmc.getCameraChannelNames()
+    assert len(names) == 2
+
+    mda = MDASequence(time_plan={"loops": 2, "interval": 0}, channels=["DAPI"])
+    _mda.SEQUENCE_META[mda] = _mda.SequenceMeta(mode="mda")
+    mmc.mda.events.sequenceStarted.emit(mda)
+
+    img_shape = (mmc.getImageHeight(), mmc.getImageWidth())
+    for event in mda:
+        for i, name in enumerate(names):
+            frame = np.full(img_shape, i + 1, dtype="uint16")
+            mmc.mda.events.frameReady.emit(frame, camera_event(event, name, i))
+    main_window._mda_writer.flush()
+
+    # one layer per camera channel, each holding only its own frames
+    layers = [x for x in main_window.viewer.layers if x.metadata.get("uid") == mda.uid]
+    assert [x.metadata["camera"] for x in layers] == list(names)
+    for i, layer in enumerate(layers):
+        assert np.all(np.asarray(layer.data) == i + 1)
 
 
 @pytest.mark.parametrize("Z", ["", "withZ"])
@@ -89,6 +236,9 @@ def test_saving_mda(
 
     with qtbot.waitSignal(mmc.mda.events.sequenceFinished, timeout=4000):
         _mda._on_run_clicked()
+    # the GUI is usable again right away, the files are saved in the background
+    assert _mda.save_groupBox.isEnabled()
+    assert main_window._saver.wait(timeout=10)
 
     assert mda is not None
     data_shape = main_window.viewer.layers[-1].data.shape
@@ -101,12 +251,67 @@ def test_saving_mda(
 
     assert data_shape == expected_shape
 
+    # the frame index is saved next to the images
     if splitC:
-        nfiles = len(list((tmp_path / f"{NAME}_000").iterdir()))
+        nfiles = len(list((tmp_path / f"{NAME}_000").glob("*.tif")))
         assert nfiles == 2 if C else 1
+        index_file = tmp_path / f"{NAME}_000" / f"{NAME}_000.npz"
     else:
-        assert [p.name for p in tmp_path.iterdir()] == [f"{NAME}_000.tif"]
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            f"{NAME}_000.npz",
+            f"{NAME}_000.tif",
+        ]
         assert data_shape == expected_shape
+        index_file = tmp_path / f"{NAME}_000.npz"
+    assert len(FrameIndex.load(index_file)) == len(list(mda))
+
+
+@pytest.mark.parametrize("splitC", [False, True])
+@pytest.mark.parametrize("file_format", ["zarr", "ome-zarr"])
+def test_saving_mda_zarr(
+    main_window: MainWindow, file_format: str, splitC: bool, tmp_path: Path
+):
+    mda = MDASequence(
+        time_plan={"loops": 2, "interval": 0},
+        z_plan={"range": 2, "step": 1},
+        channels=["DAPI", "FITC"],
+    )
+    _mda.SEQUENCE_META[mda] = _mda.SequenceMeta(
+        mode="mda",
+        should_save=True,
+        file_name="test_mda",
+        save_dir=str(tmp_path),
+        split_channels=splitC,
+        file_format=file_format,
+    )
+    mmc = main_window._mmc
+    mmc.mda.events.sequenceStarted.emit(mda)
+    img_shape = (mmc.getImageHeight(), mmc.getImageWidth())
+    for event in mda:
+        frame = np.full(img_shape, event.index["t"] + 1, dtype="uint16")
+        mmc.mda.events.frameReady.emit(frame, event)
+    mmc.mda.events.sequenceFinished.emit(mda)
+    assert main_window._saver.wait(timeout=10)
+
+    # the frames were acquired into the destination store, nothing else is saved
+    assert [p.name for p in tmp_path.iterdir()] == ["test_mda_000.zarr"]
+    root = zarr.open_consolidated(str(tmp_path / "test_mda_000.zarr"), mode="r")
+    assert root.attrs["useq_sequence"]["uid"] == str(mda.uid)
+    names = ["DAPI", "FITC"] if splitC else ["data"]
+    assert sorted(root) == names + ["frame_index"]
+    index = FrameIndex.load(root["frame_index"])
+    assert len(index) == len(list(mda))
+    assert index.channels == ["DAPI", "FITC"]
+    for name in names:
+        if file_format == "ome-zarr":
+            multiscales = root[name].attrs["multiscales"][0]
+            labels = [axis["name"] for axis in multiscales["axes"]]
+            data = root[name]["0"]
+        else:
+            data = root[name]
+            labels = data.attrs["_ARRAY_DIMENSIONS"]
+        assert labels == (["t", "z"] if splitC else ["t", "c", "z"]) + ["y", "x"]
+        assert np.all(data[0] == 1) and np.all(data[1] == 2)
 
 
 def test_script_initiated_mda(main_window: MainWindow, qtbot: "QtBot"):
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+import zarr
+
+from micromanager_gui import _mda
+
+
+@pytest.mark.parametrize("compression", _mda.COMPRESSIONS)
+def test_sequence_meta_storage(compression):
+    meta = _mda.SequenceMeta(store_compression=compression)
+    assert meta.chunks((3, 2, 64, 128)) == (1, 1, 64, 128)
+    meta.chunk_tile = (32, 256)
+    assert meta.chunks((3, 2, 64, 128)) == (1, 1, 32, 128)
+
+    z = zarr.zeros(
+        (3, 64, 128),
+        chunks=meta.chunks((3, 64, 128)),
+        dtype="uint16",
+        compressor=meta.store_compressor(),
+    )
+    frame = np.arange(64 * 128, dtype="uint16").reshape(64, 128)
+    z[1] = frame
+    np.testing.assert_array_equal(z[1], frame)
+    assert (compression == "none") == (z.compressor is None)
+    # the saved files are compressed separately
+    assert meta.compressor() is None
+
+    with pytest.raises(ValueError):
+        _mda.SequenceMeta(compression="gzip").compressor()  # type: ignore
+    with pytest.raises(ValueError):
+        _mda.SequenceMeta(store_compression="gzip").store_compressor()  # type: ignore
+    with pytest.raises(ValueError):
+        _mda.SequenceMeta(chunk_tile=(0, 16)).chunks((4, 4))
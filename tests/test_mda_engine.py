@@ -0,0 +1,62 @@
+import itertools
+from types import SimpleNamespace
+
+import numpy as np
+from loguru import logger
+from useq import MDASequence
+
+from micromanager_gui._mda_engine import (
+    CAMERA_INDEX_KEY,
+    CAMERA_KEY,
+    UNTIL_STOPPED_KEY,
+    MultiCameraMDAEngine,
+    camera_event,
+    iter_events,
+)
+
+
+def test_camera_event():
+    event = next(MDASequence(channels=["DAPI"]).iter_events())
+    cam_event = camera_event(event, "Camera2", 1)
+    assert cam_event.metadata[CAMERA_KEY] == "Camera2"
+    assert cam_event.metadata[CAMERA_INDEX_KEY] == 1
+    assert cam_event.index == event.index
+    assert CAMERA_KEY not in event.metadata
+
+
+def test_multi_camera_engine_logs_events():
+    mmc = SimpleNamespace(
+        snapImage=lambda: None,
+        getImage=lambda *_: np.zeros((4, 4), "uint16"),
+        getNumberOfCameraChannels=lambda: 1,
+        waitForSystem=lambda: None,
+    )
+    engine = MultiCameraMDAEngine(mmc)
+    frames = []
+    engine.events.frameReady.connect(lambda img, event: frames.append(event))
+    logged = []
+    sink = logger.add(lambda msg: logged.append(msg.record["message"]), level="INFO")
+    try:
+        engine.run(MDASequence(time_plan={"interval": 0, "loops": 3}))
+    finally:
+        logger.remove(sink)
+    assert [e.index["t"] for e in frames] == [0, 1, 2]
+    # one log record per event, like `MDAEngine.run`
+    assert all(str(e) in logged for e in frames)
+
+
+def test_iter_events_until_stopped():
+    mda = MDASequence(
+        time_plan={"interval": 0.5, "loops": 2},
+        channels=["DAPI", "FITC"],
+        metadata={UNTIL_STOPPED_KEY: True},
+    )
+    events = list(itertools.islice(iter_events(mda), 10))
+    assert [e.index["t"] for e in events] == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+    assert [e.min_start_time for e in events[::2]] == [0, 0.5, 1, 1.5, 2]
+    assert [e.channel.config for e in events[:4]] == ["DAPI", "FITC"] * 2
+
+    # without the flag (or a time plan) the sequence is iterated once
+    assert len(list(iter_events(mda.replace(metadata={})))) == 4
+    no_t = MDASequence(channels=["DAPI"], metadata={UNTIL_STOPPED_KEY: True})
+    assert len(list(iter_events(no_t))) == 1
@@ -0,0 +1,110 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+import zarr
+
+from micromanager_gui._mda_store import GrowingStore
+from micromanager_gui._pyramid import Pyramid, pyramid_shapes
+
+
+def test_growing_store():
+    z = zarr.zeros((2, 3, 8, 8), chunks=(1, 1, 8, 8), dtype="uint16")
+    store = GrowingStore(z, axis=0, block=2)
+    assert store.levels == [z]
+    assert store.views[0].array is z and store.views[0].chunks == z.chunks
+
+    store[1, 2] = np.full((8, 8), 1)
+    assert store.shape == (2, 3, 8, 8)
+    # beyond the end: grows by whole blocks
+    store[4, 0] = np.full((8, 8), 4)
+    assert z.shape == (6, 3, 8, 8)
+    assert store.size == 5
+    assert z[4, 0].min() == 4 and z[1, 2].min() == 1
+
+    store.trim()
+    assert z.shape == (5, 3, 8, 8)
+
+
+def test_growing_store_limits():
+    z = zarr.zeros((4, 8, 8), chunks=(1, 8, 8), dtype="uint16")
+    store = GrowingStore(z, axis=0, block=4, max_size=6)
+    store[5] = np.ones((8, 8))
+    assert z.shape == (6, 8, 8)
+    with pytest.raises(IndexError):
+        store[6] = np.ones((8, 8))
+    with pytest.raises(ValueError):
+        GrowingStore(z, axis=0, block=0)
+
+    # nothing written: nothing to trim
+    empty = GrowingStore(zarr.zeros((4, 8, 8)), axis=0, block=4)
+    empty.trim()
+    assert empty.shape == (4, 8, 8)
+
+
+def test_growing_pyramid():
+    shapes = pyramid_shapes((1, 2, 32, 32), min_size=8)
+    levels = [zarr.zeros(s, dtype="uint16") for s in shapes]
+    store = GrowingStore(Pyramid(levels), axis=0, block=3)
+    store[2, 1] = np.full((32, 32), 7)
+    assert [a.shape[:2] for a in levels] == [(3, 2)] * len(levels)
+    assert all(a[2, 1].min() == 7 for a in levels)
+
+
+class _SlowResize:
+    """Array whose `resize` takes a while, recording reads made meanwhile."""
+
+    def __init__(self, shape):
+        self.data = np.zeros(shape, dtype="uint16")
+        self.resizing = False
+        self.torn_reads = 0
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    def resize(self, *shape):
+        self.resizing = True
+        time.sleep(0.001)
+        data = np.zeros(shape, dtype=self.data.dtype)
+        n = min(shape[0], self.data.shape[0])
+        data[:n] = self.data[:n]
+        self.data = data
+        self.resizing = False
+
+    def __getitem__(self, key):
+        self.torn_reads += self.resizing
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+
+
+def test_growing_store_read_while_growing():
+    array = _SlowResize((1, 4, 4))
+    store = GrowingStore(array, axis=0, block=1)
+    view = store.views[0]
+    done = threading.Event()
+    reads = []
+
+    def _read():
+        while not done.is_set():
+            reads.append(view[-1, 0, 0])
+
+    reader = threading.Thread(target=_read)
+    reader.start()
+    for t in range(100):
+        store[t] = np.full((4, 4), t + 1)
+    store.resize(120)
+    store.trim()
+    done.set()
+    reader.join()
+
+    assert reads and array.torn_reads == 0
+    assert view.shape == (100, 4, 4) and view.ndim == 3
+    np.testing.assert_array_equal(np.asarray(view)[:, 0, 0], np.arange(1, 101))
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+from micromanager_gui._mda_writer import FrameWriter
+
+if TYPE_CHECKING:
+    from pytestqt.qtbot import QtBot
+
+
+def test_frame_writer(qtbot: QtBot):
+    writer = FrameWriter(max_queue=4, max_fps=5)
+    store = np.zeros((100, 4, 4), dtype="uint16")
+    tags = []
+    writer.frameWritten.connect(tags.append)
+
+    for i in range(100):
+        writer.put(store, (i,), np.full((4, 4), i, dtype="uint16"), tag=i)
+    writer.flush()
+    assert writer.frames_written == 100
+    np.testing.assert_array_equal(store[:, 0, 0], np.arange(100))
+
+    # updates are coalesced, but the last frame is always reported
+    qtbot.waitUntil(lambda: bool(tags) and tags[-1] == 99, timeout=1000)
+    assert len(tags) < 100
+    writer.stop()
+    assert not writer.is_running()
+
+
+class _StalledStore:
+    """Array whose writes wait until `release` is set."""
+
+    def __init__(self, shape):
+        self.data = np.zeros(shape, dtype="uint16")
+        self.release = threading.Event()
+
+    def __setitem__(self, index, image):
+        self.release.wait(5)
+        self.data[index] = image
+
+
+@pytest.mark.parametrize("policy", ["drop", "spill"])
+def test_frame_writer_overflow(qtbot: QtBot, policy: str):
+    writer = FrameWriter(max_queue=2, policy=policy)
+    store = _StalledStore((10, 4, 4))
+    stats = []
+    writer.statsUpdated.connect(stats.append)
+
+    # the writer is stuck on the first frame: the buffer fills up and `put`
+    # must not block
+    queued = [writer.put(store, (0,), np.zeros((4, 4), "uint16"), droppable=True)]
+    qtbot.waitUntil(lambda: writer.stats.buffered == 0, timeout=1000)
+    queued += [
+        writer.put(store, (i,), np.full((4, 4), i, "uint16"), droppable=True)
+        for i in range(1, 10)
+    ]
+    assert writer.stats.fill == 1
+    store.release.set()
+    writer.flush()
+
+    if policy == "drop":
+        assert not all(queued)
+        assert writer.frames_dropped == queued.count(False) > 0
+        assert writer.frames_written == queued.count(True)
+    else:
+        assert all(queued)
+        assert writer.frames_spilled > 0
+        assert writer.frames_written == 10
+        np.testing.assert_array_equal(store.data[:, 0, 0], np.arange(10))
+    qtbot.waitUntil(lambda: bool(stats) and stats[-1].buffered == 0, timeout=1000)
+    assert stats[-1].dropped == writer.frames_dropped
+    writer.stop()
+
+
+def test_frame_writer_never_drops_saved_frames():
+    writer = FrameWriter(max_queue=2, policy="drop")
+    store = _StalledStore((10, 4, 4))
+    threading.Timer(0.2, store.release.set).start()
+    for i in range(10):
+        # blocks instead of dropping
+        assert writer.put(store, (i,), np.full((4, 4), i, "uint16"))
+    writer.flush()
+    assert writer.frames_dropped == 0
+    np.testing.assert_array_equal(store.data[:, 0, 0], np.arange(10))
+    writer.stop()
+
+    with pytest.raises(ValueError):
+        writer.configure(2, "nope")
+
+
+class _FailingStore:
+    """Array whose writes at `bad` indices raise."""
+
+    def __init__(self, shape, bad):
+        self.data = np.zeros(shape, dtype="uint16")
+        self.bad = bad
+
+    def __setitem__(self, index, image):
+        if index[0] in self.bad:
+            raise OSError(f"can't write {index}")
+        self.data[index] = image
+
+
+def test_frame_writer_write_errors(qtbot: QtBot):
+    writer = FrameWriter(max_queue=4)
+    store = _FailingStore((10, 4, 4), bad=(3, 7))
+    stats = []
+    writer.statsUpdated.connect(stats.append)
+    for i in range(10):
+        writer.put(store, (i,), np.full((4, 4), i, "uint16"))
+    writer.flush()
+
+    # the other frames are written, failures are counted and the first kept
+    assert writer.frames_written == 8
+    assert writer.frames_failed == 2
+    assert "(3,)" in str(writer.error)
+    assert writer.stats.failed == 2
+    qtbot.waitUntil(lambda: bool(stats) and stats[-1].failed == 2, timeout=1000)
+
+    writer.reset_stats()
+    assert writer.frames_failed == 0 and writer.error is None
+    writer.stop()
+
+
+def test_frame_writer_spilled_read_error():
+    writer = FrameWriter(max_queue=1, policy="spill")
+    store = _StalledStore((4, 4, 4))
+    for i in range(4):
+        writer.put(store, (i,), np.full((4, 4), i, "uint16"))
+    spilled = writer.stats.spilled
+    assert spilled >= 2
+    # the spilled frames can't be read back
+    for path in Path(writer._spill_dir.name).iterdir():  # type: ignore
+        path.write_bytes(b"")
+    store.release.set()
+    writer.flush()
+
+    assert writer.frames_written == 4 - spilled
+    assert writer.frames_failed == spilled
+    assert writer.stats.spilled == 0
+    writer.stop()
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import zarr
+
+from micromanager_gui import _mosaic
+from micromanager_gui._mosaic import Mosaic, TileCanvas
+from micromanager_gui._saving import save_mosaic
+
+
+def test_mosaic_blending():
+    a = np.full((10, 20), 100, dtype="uint16")
+    b = np.full((10, 20), 200, dtype="uint16")
+    # b overlaps the last 5 columns of a, origins are shifted to start at 0
+    mosaic = Mosaic([a, b], [(-3.2, 50), (-3, 65)])
+    assert mosaic.shape == (10, 35)
+    canvas = mosaic.render(0, 0, 100, 100)
+    assert canvas.shape == mosaic.shape
+    assert canvas.dtype == np.uint16
+    assert np.all(canvas[:, :15] == 100)
+    assert np.all(canvas[:, 20:] == 200)
+    # the overlap goes smoothly from one tile to the other
+    row = canvas[5, 15:20]
+    assert np.all((row > 100) & (row < 200))
+    assert np.all(np.diff(row.astype(int)) > 0)
+
+    # rendering block by block gives the same canvas
+    blocks = np.zeros_like(canvas)
+    for y, x in mosaic.blocks(4):
+        region = mosaic.render(y, x, 4, 4)
+        blocks[y : y + region.shape[0], x : x + region.shape[1]] = region
+    np.testing.assert_array_equal(blocks, canvas)
+
+    with pytest.raises(ValueError):
+        Mosaic([a], [])
+
+
+@pytest.mark.parametrize("on_disk", [False, True])
+def test_tile_canvas(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, on_disk: bool):
+    if on_disk:
+        monkeypatch.setattr(_mosaic, "CANVAS_IN_MEMORY", 0)
+    # a 3x3 grid of 300x400 tiles overlapping by 40 pixels, like an explorer scan
+    origins = [(-260.0 * r, 360.0 * c - 100) for r in range(3) for c in range(3)]
+    canvas = TileCanvas(origins, (300, 400), "uint16", str(tmp_path))
+    assert canvas.offset == (-520, -100)
+    assert canvas.shape == (820, 1120)
+    assert [lvl.shape for lvl in canvas.levels] == [(820, 1120), (410, 560), (205, 280)]
+    assert isinstance(canvas.levels[0], zarr.Array) == on_disk
+
+    for i in (0, 4, 8):
+        canvas.add(i, np.full((300, 400), i + 1, dtype="uint16"))
+    assert list(np.flatnonzero(canvas.acquired)) == [0, 4, 8]
+    full, half, _ = (np.asarray(lvl) for lvl in canvas.levels)
+    # tile 0 is at the bottom left: the y axis of the origins points up
+    assert full[-1, 0] == 1 and full[0, -1] == 9
+    assert full[400, 500] == 5 and half[200, 250] == 5
+    # tiles not acquired yet are blank
+    assert full[0, 0] == 0
+    np.testing.assert_array_equal(canvas.tiles[4], 5)
+    np.testing.assert_array_equal(canvas.tiles[1], 0)
+
+    with pytest.raises(ValueError):
+        TileCanvas([], (10, 10), "uint16")
+
+
+def test_save_mosaic(tmp_path: Path):
+    rng = np.random.default_rng(0)
+    tiles = [rng.integers(0, 4000, (300, 400), dtype="uint16") for _ in range(4)]
+    origins = [(0, 0), (0, 360), (270, 0), (270, 360)]
+    mosaics = {
+        "Cy5": Mosaic(tiles, origins),
+        "FITC": Mosaic([t // 2 for t in tiles], origins),
+    }
+    root = save_mosaic(tmp_path / "m.ome.zarr", mosaics, pixel_size=0.5, block=256)
+
+    assert root["0"].shape == (2, 570, 760)
+    assert root["1"].shape == (2, 285, 380)
+    assert root["0"].chunks == (1, 256, 256)
+    np.testing.assert_array_equal(root["0"][0, :270, :360], tiles[0][:270, :360])
+    np.testing.assert_array_equal(root["0"][1], mosaics["FITC"].render(0, 0, 570, 760))
+    assert abs(int(root["1"][0, 0, 0]) - tiles[0][:2, :2].mean()) <= 0.5
+
+    ms = zarr.open_group(str(tmp_path / "m.ome.zarr"), mode="r").attrs["multiscales"]
+    assert [a["name"] for a in ms[0]["axes"]] == ["c", "y", "x"]
+    assert ms[0]["datasets"][1]["coordinateTransformations"][0]["scale"] == [
+        1.0,
+        1.0,
+        1.0,
+    ]
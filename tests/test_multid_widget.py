@@ -1,6 +1,7 @@
 from useq import MDASequence
 
 from micromanager_gui._gui_objects._mda_widget._mda_widget import MMMultiDWidget
+from micromanager_gui._mda_writer import WriterStats
 
 
 def test_multid_load_state(qtbot, global_mmcore):
@@ -26,3 +27,13 @@ def test_multid_load_state(qtbot, global_mmcore):
 
     # round trip
     assert wdg.get_state() == sequence
+
+
+def test_multid_buffer_stats(qtbot, global_mmcore):
+    wdg = MMMultiDWidget()
+    qtbot.addWidget(wdg)
+    wdg.show_buffer_stats(WriterStats(48, 64, 0, 100, 3))
+    assert wdg.buffer_progressBar.value() == 75
+    assert wdg.dropped_label.text() == "dropped: 3"
+    wdg.show_buffer_stats(WriterStats(0, 64, 0, 100, 3, 2))
+    assert wdg.dropped_label.text() == "dropped: 3  failed: 2"
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+import zarr
+
+from micromanager_gui._pyramid import Pyramid, downsample, pyramid_shapes
+
+
+def test_pyramid_shapes():
+    assert pyramid_shapes((3, 512, 512)) == [(3, 512, 512)]
+    assert pyramid_shapes((3, 2048, 1500)) == [
+        (3, 2048, 1500),
+        (3, 1024, 750),
+        (3, 512, 375),
+    ]
+    assert pyramid_shapes((5, 1), min_size=1) == [(5, 1)]
+
+
+def test_downsample():
+    image = np.array([[0, 2, 4, 9], [2, 4, 6, 9], [9, 9, 9, 9]], dtype="uint16")
+    # 2x2 means, rounded, the odd last row is dropped
+    np.testing.assert_array_equal(downsample(image), [[2, 7]])
+    assert downsample(image).dtype == np.uint16
+    big = np.full((4, 4), 65535, dtype="uint16")
+    np.testing.assert_array_equal(downsample(big), np.full((2, 2), 65535))
+    np.testing.assert_allclose(downsample(np.eye(2)), [[0.5]])
+
+
+def test_pyramid():
+    shapes = pyramid_shapes((2, 64, 48), min_size=16)
+    levels = [zarr.zeros(s, chunks=(1, *s[1:]), dtype="uint16") for s in shapes]
+    pyramid = Pyramid(levels)
+    assert len(pyramid) == 3
+    assert pyramid.shape == (2, 64, 48)
+
+    image = np.random.default_rng(0).integers(0, 4096, (64, 48), dtype="uint16")
+    pyramid[1] = image
+    np.testing.assert_array_equal(levels[0][1], image)
+    np.testing.assert_array_equal(levels[1][1], downsample(image))
+    np.testing.assert_array_equal(levels[2][1], downsample(downsample(image)))
+    assert not levels[2][0].any()
+
+    with pytest.raises(ValueError):
+        Pyramid([])
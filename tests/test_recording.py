@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+import zarr
+
+from micromanager_gui._recording import LiveRecorder
+
+if TYPE_CHECKING:
+    from pytestqt.qtbot import QtBot
+
+    from micromanager_gui.main_window import MainWindow
+
+
+def test_live_recorder(tmp_path: Path):
+    rec = LiveRecorder(tmp_path / "rec.zarr", max_queue=1000)
+    rec.start()
+    assert rec.is_recording()
+    frames = [np.full((16, 8), i, dtype="uint16") for i in range(100)]
+    for f in frames:
+        assert rec.put(f)
+    rec.stop()
+    assert not rec.is_recording()
+
+    assert rec.frames_written == 100
+    assert rec.bytes_written == 100 * frames[0].nbytes
+    assert rec.mb_per_s > 0
+
+    store = zarr.open_group(str(tmp_path / "rec.zarr"), mode="r")
+    assert store["images"].shape == (100, 16, 8)
+    assert store["images"].chunks == (1, 16, 8)
+    np.testing.assert_array_equal(store["images"][42], frames[42])
+    ts = store["timestamps"][:]
+    assert ts.shape == (100,)
+    assert np.all(np.diff(ts) >= 0)
+    assert store.attrs["dropped_frames"] == 0
+
+
+def test_live_recorder_drops_when_full(tmp_path: Path):
+    rec = LiveRecorder(tmp_path / "rec.zarr", max_queue=2)
+    # not started: nothing consumes the queue
+    frame = np.zeros((4, 4), dtype="uint8")
+    assert rec.put(frame) and rec.put(frame)
+    assert not rec.put(frame)
+    assert rec.dropped_frames == 1
+
+
+def test_live_recorder_write_error(tmp_path: Path):
+    rec = LiveRecorder(tmp_path / "rec.zarr", max_queue=2)
+    write = rec._write
+
+    def _write(frame, *args):
+        if frame[0, 0] == 3:
+            raise OSError("disk full")
+        write(frame, *args)
+
+    rec._write = _write  # type: ignore
+    rec.start()
+    for i in range(10):
+        rec.put(np.full((4, 4), i, dtype="uint8"))
+        time.sleep(0.01)
+    # the writer thread is gone: `stop` doesn't wait for the full queue
+    with pytest.raises(OSError, match="disk full"):
+        rec.stop()
+    assert not rec.is_recording()
+    assert not rec.put(np.zeros((4, 4), dtype="uint8"))
+
+    # the frames written before the error are kept
+    store = zarr.open_group(str(tmp_path / "rec.zarr"), mode="r")
+    assert store["images"].shape == (3, 4, 4)
+    assert store["timestamps"].shape == (3,)
+
+
+def test_live_recorder_camera_channels(tmp_path: Path):
+    rec = LiveRecorder(tmp_path / "rec.zarr", channel_names=["Cam1", "Cam2"])
+    rec.start()
+    for i in range(10):
+        rec.put(np.full((4, 4), i, dtype="uint8"), channel=i % 2)
+    rec.stop()
+
+    store = zarr.open_group(str(tmp_path / "rec.zarr"), mode="r")
+    assert list(store["camera_channels"][:]) == [0, 1] * 5
+    assert store.attrs["channel_names"] == ["Cam1", "Cam2"]
+
+
+def test_record_live(main_window: MainWindow, qtbot: QtBot, tmp_path: Path):
+    mmc = main_window._mmc
+    tab = main_window.tab_wdg
+    tab.record_dir_lineEdit.setText(str(tmp_path))
+
+    with qtbot.waitSignal(mmc.events.startContinuousSequenceAcquisition):
+        tab.record_Button.setChecked(True)
+    recorder = main_window._live_recorder
+    assert recorder is not None
+    qtbot.waitUntil(lambda: recorder.frames_written > 5, timeout=3000)
+
+    tab.record_Button.setChecked(False)
+    assert main_window._live_recorder is None
+    qtbot.waitUntil(lambda: not recorder.is_recording(), timeout=3000)
+    mmc.stopSequenceAcquisition()
+
+    store = zarr.open_group(str(tmp_path / "live_000.zarr"), mode="r")
+    assert store["images"].shape[1:] == (512, 512)
+    assert store["images"].shape[0] == store["timestamps"].shape[0] > 5
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("Pyro5")
+
+from micromanager_gui._remote import (  # noqa: E402
+    SharedFrameReader,
+    SharedFrameRing,
+    is_frame_descriptor,
+)
+
+
+def test_shared_frame_ring():
+    ring = SharedFrameRing(n_slots=2)
+    reader = SharedFrameReader()
+    try:
+        frames = [np.full((16, 8), i, dtype="uint16") for i in range(3)]
+        descs = [ring.write(f) for f in frames[:2]]
+        assert all(is_frame_descriptor(d) for d in descs)
+        assert not is_frame_descriptor({"shape": (16, 8)})
+        size = ring.nbytes
+
+        out = reader.read(descs[1])
+        np.testing.assert_array_equal(out, frames[1])
+        # frames are copied out of the ring
+        ring.write(frames[2])
+        np.testing.assert_array_equal(out, frames[1])
+        # ... and the reader notices when a slot was reused
+        with pytest.raises(RuntimeError, match="overwritten"):
+            reader.read(descs[0])
+
+        # smaller frames reuse the segment, bigger ones reallocate it
+        desc = ring.write(np.ones((4, 4), dtype="uint8"))
+        assert ring.nbytes == size
+        np.testing.assert_array_equal(reader.read(desc), np.ones((4, 4)))
+        big = np.arange(64 * 64, dtype="float64").reshape(64, 64)
+        desc = ring.write(big)
+        assert ring.nbytes > size
+        np.testing.assert_array_equal(reader.read(desc), big)
+    finally:
+        reader.close()
+        ring.close()
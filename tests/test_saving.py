@@ -0,0 +1,302 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import tifffile
+import zarr
+from useq import MDASequence
+
+from micromanager_gui._mda import SequenceMeta
+from micromanager_gui._mosaic import TileCanvas
+from micromanager_gui._saving import (
+    _AxisSlice,
+    _write_files,
+    open_mda_files,
+    save_sequence,
+)
+from micromanager_gui._writers import _imsave
+
+
+class _PlaneCounter:
+    """Array-like recording the size of the largest read."""
+
+    def __init__(self, data):
+        self.data = data
+        self.shape = data.shape
+        self.largest = 0
+
+    def __getitem__(self, key):
+        out = self.data[key]
+        self.largest = max(self.largest, out.size)
+        return out
+
+
+@pytest.mark.parametrize("shape", [(16, 8), (3, 1, 2, 16, 8), (2, 2, 2, 2, 2, 16, 8)])
+def test_imsave_streams_planes(tmp_path: Path, shape):
+    data = zarr.array(
+        np.arange(np.prod(shape), dtype="uint16").reshape(shape),
+        chunks=(1,) * (len(shape) - 2) + shape[-2:],
+    )
+    source = _PlaneCounter(data)
+    _imsave(tmp_path / "t.tif", source)
+
+    assert source.largest == 16 * 8
+    written = tifffile.imread(tmp_path / "t.tif")
+    np.testing.assert_array_equal(written, np.squeeze(data[:]))
+
+
+def test_imsave_axis_slice(tmp_path: Path):
+    data = zarr.array(np.random.randint(0, 999, (3, 4, 5, 6)).astype("uint16"))
+    view = _AxisSlice(data, 1, 2)
+    assert view.shape == (3, 5, 6)
+    _imsave(tmp_path / "p.tif", view, dtype="uint8")
+    written = tifffile.imread(tmp_path / "p.tif")
+    assert written.dtype == np.uint8
+    np.testing.assert_array_equal(written, np.take(data[:], 2, axis=1).astype("uint8"))
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_save_pos_split_channels_parallel(tmp_path: Path, workers: int):
+    sequence = MDASequence(
+        channels=["DAPI", "FITC"],
+        stage_positions=[(0, 0, 0), (1, 1, 1), (2, 2, 2)],
+        z_plan={"range": 2, "step": 1},
+        axis_order="tpcz",
+    )
+    layers = [
+        SimpleNamespace(
+            data=zarr.array(np.full((3, 3, 16, 8), c + 1, dtype="uint16")),
+            multiscale=False,
+            metadata={"uid": sequence.uid, "ch_id": f"_{ch}_idx{c}"},
+        )
+        for c, ch in enumerate(["DAPI", "FITC"])
+    ]
+    meta = SequenceMeta(
+        mode="mda",
+        should_save=True,
+        split_channels=True,
+        save_pos=True,
+        file_name="t",
+        save_dir=str(tmp_path),
+        save_workers=workers,
+    )
+    progress = []
+    save_sequence(sequence, layers, meta, lambda *a: progress.append(a))
+
+    assert progress[0] == (0, 6) and progress[-1] == (6, 6)
+    assert [done for done, _ in progress] == list(range(7))
+    files = sorted(tmp_path.glob("t_000/t_000_Pos*/*.tif"))
+    assert [f.name for f in files] == [
+        f"t_000__{ch}_idx{c}_[p{p:03}].tif"
+        for p in range(3)
+        for c, ch in enumerate(["DAPI", "FITC"])
+    ]
+    assert tifffile.imread(files[-1]).shape == (3, 16, 8)
+    assert np.all(tifffile.imread(files[-1]) == 2)
+
+
+def test_write_files_error(tmp_path: Path):
+    jobs = [(tmp_path / f"{n}.tif", np.zeros((4, 4))) for n in range(4)]
+    jobs.insert(1, (tmp_path / "missing" / "x.tif", np.zeros((4, 4))))
+    with pytest.raises(FileNotFoundError):
+        _write_files(jobs, workers=2)
+
+
+def test_save_explorer_scan(tmp_path: Path):
+    sequence = MDASequence(channels=["Cy5", "FITC"])
+    layers = [
+        SimpleNamespace(
+            data=np.full((16, 8), 10 * c + p, dtype="uint16"),
+            multiscale=False,
+            metadata={
+                "uid": sequence.uid,
+                "ch_id": c,
+                "ch_name": ch,
+                "scan_position": f"Pos{p:03d}",
+                "scan_coord": (16 * (p // 3), 8 * (p % 3)),
+            },
+        )
+        for p in range(9)
+        for c, ch in enumerate(["Cy5", "FITC"])
+    ]
+    meta = SequenceMeta(
+        mode="explorer",
+        should_save=True,
+        file_name="e",
+        save_dir=str(tmp_path),
+        mosaic=True,
+    )
+    save_sequence(sequence, layers, meta)
+
+    folder = tmp_path / "scan_e_000"
+    assert sorted(f.name for f in folder.iterdir()) == [
+        "Cy5.tif",
+        "FITC.tif",
+        "mosaic.ome.zarr",
+    ]
+    mosaic = zarr.open_group(str(folder / "mosaic.ome.zarr"), mode="r")["0"]
+    assert mosaic.shape == (2, 48, 24)
+    assert mosaic[1, 20, 10] == 14
+    fitc = tifffile.imread(folder / "FITC.tif")
+    assert fitc.shape == (9, 16, 8)
+    np.testing.assert_array_equal(fitc[:, 0, 0], np.arange(10, 19))
+
+
+def test_save_explorer_canvases(tmp_path: Path):
+    sequence = MDASequence(channels=["Cy5", "FITC"])
+    origins = [(16 * (p // 3), 8 * (p % 3)) for p in range(9)]
+    layers = []
+    for c, ch in enumerate(["Cy5", "FITC"]):
+        canvas = TileCanvas(origins, (16, 8), "uint16")
+        # the scan was stopped before the last tile
+        for p in range(8):
+            canvas.add(p, np.full((16, 8), 10 * c + p, dtype="uint16"))
+        layers.append(
+            SimpleNamespace(
+                data=canvas.levels[0],
+                multiscale=False,
+                metadata={
+                    "uid": sequence.uid,
+                    "ch_id": c,
+                    "ch_name": ch,
+                    "explorer_canvas": canvas,
+                },
+            )
+        )
+    meta = SequenceMeta(
+        mode="explorer",
+        should_save=True,
+        file_name="e",
+        save_dir=str(tmp_path),
+        mosaic=True,
+    )
+    save_sequence(sequence, layers, meta)
+
+    folder = tmp_path / "scan_e_000"
+    fitc = tifffile.imread(folder / "FITC.tif")
+    assert fitc.shape == (8, 16, 8)
+    np.testing.assert_array_equal(fitc[:, 0, 0], np.arange(10, 18))
+    mosaic = zarr.open_group(str(folder / "mosaic.ome.zarr"), mode="r")["0"]
+    assert mosaic.shape == (2, 48, 24)
+    assert mosaic[1, 20, 10] == 14
+    assert mosaic[1, 40, 20] == 0
+
+
+@pytest.mark.parametrize("file_format", ["tif", "ome-tif", "raw"])
+@pytest.mark.parametrize(
+    "split, save_pos", [(False, False), (True, False), (True, True), (False, True)]
+)
+def test_open_mda_files_matches_save_sequence(
+    tmp_path: Path, file_format: str, split: bool, save_pos: bool
+):
+    sequence = MDASequence(
+        channels=["DAPI", "FITC"],
+        stage_positions=[(0, 0, 0), (1, 1, 1)],
+        time_plan={"interval": 0, "loops": 2},
+        axis_order="tpcz",
+    )
+    shape = (2, 2, 16, 8) if split else (2, 2, 2, 16, 8)
+    channels = [f"_{ch}_idx{c}" for c, ch in enumerate(["DAPI", "FITC"])]
+    layer_ids = {f"k{c}": (ch_id, "") for c, ch_id in enumerate(channels)}
+    if not split:
+        layer_ids = {"k0": ("_idx0", "")}
+    rng = np.random.default_rng(0)
+    data = {k: rng.integers(0, 999, shape).astype("uint16") for k in layer_ids}
+
+    def _meta(folder):
+        (tmp_path / folder).mkdir()
+        return SequenceMeta(
+            mode="mda",
+            should_save=True,
+            split_channels=split,
+            save_pos=save_pos,
+            file_name="exp",
+            save_dir=str(tmp_path / folder),
+            file_format=file_format,
+            incremental=True,
+        )
+
+    # frames written one by one as they would be acquired
+    meta = _meta("live")
+    assert meta.saves_incrementally
+    files = open_mda_files(sequence, meta, shape, "uint16", layer_ids)
+    for key, frames in data.items():
+        store = files.mirror(key, np.zeros(shape, "uint16"))
+        for index in np.ndindex(*shape[:-2]):
+            store[index] = frames[index]
+    files.close()
+
+    layers = [
+        SimpleNamespace(
+            data=frames,
+            multiscale=False,
+            metadata={"uid": sequence.uid, "ch_id": layer_ids[key][0]},
+        )
+        for key, frames in data.items()
+    ]
+    save_sequence(sequence, layers, _meta("end"))
+
+    live = sorted(p for p in (tmp_path / "live").rglob("*") if p.is_file())
+    end = sorted(p for p in (tmp_path / "end").rglob("*") if p.is_file())
+    assert len(live) == (1 + split) * (1 + save_pos)
+    assert [p.relative_to(tmp_path / "live") for p in live] == [
+        p.relative_to(tmp_path / "end") for p in end
+    ]
+    for a, b in zip(live, end):
+        read = np.load if file_format == "raw" else tifffile.imread
+        np.testing.assert_array_equal(read(a), read(b))
+
+
+@pytest.mark.parametrize("split, save_pos", [(False, False), (True, True)])
+def test_mda_files_discard(tmp_path: Path, split: bool, save_pos: bool):
+    sequence = MDASequence(
+        channels=["DAPI", "FITC"],
+        stage_positions=[(0, 0, 0), (1, 1, 1)],
+        axis_order="pcz",
+    )
+    meta = SequenceMeta(
+        mode="mda",
+        should_save=True,
+        split_channels=split,
+        save_pos=save_pos,
+        file_name="exp",
+        save_dir=str(tmp_path),
+        incremental=True,
+    )
+    files = open_mda_files(sequence, meta, (2, 2, 16, 8), "uint16", {"k0": ("", "")})
+    assert any(tmp_path.iterdir())
+    files.discard()
+    assert not any(tmp_path.iterdir())
+
+
+def test_open_mda_files_unsupported_dtype(tmp_path: Path):
+    sequence = MDASequence(time_plan={"interval": 0, "loops": 2})
+    meta = SequenceMeta(
+        mode="mda",
+        should_save=True,
+        file_name="exp",
+        save_dir=str(tmp_path),
+        incremental=True,
+    )
+    # saved at the end instead, nothing is left behind
+    assert (
+        open_mda_files(sequence, meta, (2, 16, 8), "uint32", {"k0": ("", "")}) is None
+    )
+    assert not any(tmp_path.iterdir())
+
+
+def test_saves_incrementally():
+    meta = SequenceMeta(mode="mda", should_save=True, incremental=True)
+    assert meta.saves_incrementally
+    # opt-in: aborted MDAs would leave full size files with empty frames
+    assert not SequenceMeta(mode="mda", should_save=True).saves_incrementally
+    assert not SequenceMeta(mode="mda").saves_incrementally
+    assert not SequenceMeta(mode="explorer", should_save=True).saves_incrementally
+    for file_format in ("zarr", "ome-zarr"):
+        meta = SequenceMeta(mode="mda", should_save=True, file_format=file_format)
+        assert meta.saves_in_place and not meta.saves_incrementally
+    meta = SequenceMeta(
+        mode="mda", should_save=True, file_format="ome-tif", compression="deflate"
+    )
+    assert not meta.saves_incrementally
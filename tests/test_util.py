@@ -0,0 +1,57 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from micromanager_gui import _util
+from micromanager_gui._util import ensure_unique
+
+
+def test_ensure_unique(tmp_path: Path):
+    (tmp_path / "other_004.tif").touch()
+    (tmp_path / "exp_001.ome.tif").touch()
+    (tmp_path / "exp_007").mkdir()
+
+    # the counter is shared by every name with the extension
+    first = ensure_unique(tmp_path / "exp", extension=".tif")
+    assert first == tmp_path / "exp_005.tif"
+    assert first.is_file() and first.stat().st_size == 0
+    assert ensure_unique(tmp_path / "exp.tif") == tmp_path / "exp_006.tif"
+    assert ensure_unique(tmp_path / "exp", ".ome.tif") == tmp_path / "exp_002.ome.tif"
+    # a counter in the name is a minimum
+    assert ensure_unique(tmp_path / "exp_010") == tmp_path / "exp_010.tif"
+
+    folder = ensure_unique(tmp_path / "exp", extension="")
+    assert folder == tmp_path / "exp_008" and folder.is_dir()
+    store = ensure_unique(tmp_path / "live", extension=".zarr", folder=True)
+    assert store == tmp_path / "live_000.zarr" and store.is_dir()
+
+
+def test_ensure_unique_lists_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(_util.os, "scandir", lambda p: scans.append(p) or scandir(p))
+
+    names = [ensure_unique(tmp_path / "exp").name for _ in range(3)]
+    assert names == ["exp_000.tif", "exp_001.tif", "exp_002.tif"]
+    assert len(scans) == 1
+
+    # names made behind its back are skipped
+    (tmp_path / "exp_003.tif").touch()
+    (tmp_path / "exp_004.tif").touch()
+    assert ensure_unique(tmp_path / "exp").name == "exp_005.tif"
+    assert len(scans) == 1
+
+    # the counter of a released name is handed out again
+    (tmp_path / "exp_005.tif").unlink()
+    _util.release_unique(tmp_path / "exp_005.tif")
+    assert ensure_unique(tmp_path / "exp").name == "exp_005.tif"
+    assert len(scans) == 2
+
+
+def test_ensure_unique_concurrent(tmp_path: Path):
+    with ThreadPoolExecutor(8) as pool:
+        paths = list(pool.map(lambda _: ensure_unique(tmp_path / "exp"), range(64)))
+    assert len(set(paths)) == 64
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(p.name for p in paths)
@@ -0,0 +1,143 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import tifffile
+import zarr
+from useq import MDASequence
+
+from micromanager_gui._mda import SequenceMeta
+from micromanager_gui._saving import save_sequence
+from micromanager_gui._writers import WRITERS, get_writer, register_writer
+
+
+def _read(path: Path, name: str) -> np.ndarray:
+    if name == "raw":
+        return np.load(path)
+    if name == "zarr":
+        return zarr.open_group(str(path), mode="r")["data"][:]
+    if name == "ome-zarr":
+        root = zarr.open_group(str(path), mode="r")
+        assert root.attrs["multiscales"][0]["datasets"][0]["path"] == "0"
+        return root["0"][:]
+    return tifffile.imread(path)
+
+
+@pytest.mark.parametrize(
+    "name, codec", [(w.name, c) for w in WRITERS.values() for c in w.codecs]
+)
+def test_writers_roundtrip(tmp_path: Path, name: str, codec: str):
+    shape = (2, 3, 4, 16, 8)
+    data = zarr.array(np.arange(np.prod(shape), dtype="uint16").reshape(shape))
+    writer = get_writer(name, codec)
+    dest = tmp_path / f"out{writer.extension}"
+    writer.write(dest, data, codec)
+
+    written = _read(dest, name)
+    np.testing.assert_array_equal(written.reshape(shape), data[:])
+    if name in ("ome-tif", "bigtiff") and codec != "none":
+        with tifffile.TiffFile(dest) as tif:
+            assert tif.pages[0].compression != 1
+
+
+def test_ome_tif_merges_extra_axes(tmp_path: Path):
+    data = np.random.randint(0, 999, (2, 3, 2, 2, 2, 8, 8)).astype("uint16")
+    WRITERS["ome-tif"].write(tmp_path / "t.ome.tif", data, "none")
+    with tifffile.TiffFile(tmp_path / "t.ome.tif") as tif:
+        assert tif.is_ome
+        written = tif.asarray()
+    assert written.shape == (12, 2, 2, 8, 8)
+    np.testing.assert_array_equal(written.reshape(data.shape), data)
+
+
+@pytest.mark.parametrize("dtype", ["uint8", "uint16", "float32", "uint32"])
+def test_tif_dtypes(tmp_path: Path, dtype: str):
+    data = np.arange(2 * 16 * 8).reshape(2, 16, 8).astype(dtype)
+    writer = get_writer("tif")
+    writer.write(tmp_path / "end.tif", data, "none")
+    if dtype == "uint32":
+        # saved as uint16, so frames can't be written as they come
+        assert tifffile.imread(tmp_path / "end.tif").dtype == "uint16"
+        with pytest.raises(ValueError, match="can't hold uint32"):
+            writer.create(tmp_path / "live.tif", data.shape, dtype)
+        return
+    mapped = writer.create(tmp_path / "live.tif", data.shape, dtype)
+    mapped[:] = data
+    mapped.flush()
+    del mapped
+    live = tifffile.imread(tmp_path / "live.tif")
+    end = tifffile.imread(tmp_path / "end.tif")
+    assert live.dtype == end.dtype == dtype
+    np.testing.assert_array_equal(live, end)
+
+
+def test_get_writer_errors():
+    with pytest.raises(ValueError, match="unknown file format"):
+        get_writer("jpeg")
+    with pytest.raises(ValueError, match="can't be compressed"):
+        get_writer("tif", "zstd")
+
+
+def test_register_writer_used_by_save_sequence(tmp_path: Path):
+    written = []
+
+    @register_writer("test-fmt", extension=".test", codecs=("none", "fast"))
+    def _write(path: Path, data, codec: str = "none"):
+        written.append((path.name, codec, data.shape))
+        path.touch()
+
+    try:
+        sequence = MDASequence(channels=["DAPI", "FITC"], time_plan={"loops": 2})
+        layer = SimpleNamespace(
+            data=np.zeros((2, 2, 1, 8, 8), dtype="uint16"),
+            multiscale=False,
+            metadata={"uid": sequence.uid},
+        )
+        meta = SequenceMeta(
+            mode="mda",
+            should_save=True,
+            file_name="exp",
+            save_dir=str(tmp_path),
+            file_format="test-fmt",
+            compression="fast",
+        )
+        assert not meta.saves_in_place
+        save_sequence(sequence, [layer], meta)
+        save_sequence(sequence, [layer], meta)
+        assert written == [
+            ("exp_000.test", "fast", (2, 2, 1, 8, 8)),
+            ("exp_001.test", "fast", (2, 2, 1, 8, 8)),
+        ]
+
+        # "tif" has no "fast" codec: nothing is written
+        meta.file_format = "tif"
+        with pytest.raises(ValueError, match="can't be compressed"):
+            save_sequence(sequence, [layer], meta)
+        assert len(list(tmp_path.iterdir())) == 2
+    finally:
+        del WRITERS["test-fmt"]
+
+
+def test_save_sequence_ome_tif_counter(tmp_path: Path):
+    sequence = MDASequence(time_plan={"loops": 3})
+    layer = SimpleNamespace(
+        data=zarr.array(np.ones((3, 1, 1, 8, 8), dtype="uint16")),
+        multiscale=False,
+        metadata={"uid": sequence.uid},
+    )
+    meta = SequenceMeta(
+        mode="mda",
+        should_save=True,
+        file_name="exp",
+        save_dir=str(tmp_path),
+        file_format="ome-tif",
+        compression="deflate",
+    )
+    for _ in range(2):
+        save_sequence(sequence, [layer], meta)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "exp_000.ome.tif",
+        "exp_001.ome.tif",
+    ]
+    np.testing.assert_array_equal(tifffile.imread(tmp_path / "exp_001.ome.tif"), 1)